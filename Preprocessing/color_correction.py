@@ -1,48 +1,154 @@
 # =====================================================
 # 🚗 Parking Lot Preprocessing (Tanpa ROI)
 #    Ideal untuk labeling terisi/kosong otomatis
+#    Paralel (1 CLAHE per worker) + inkremental (manifest mtime/hash)
 # =====================================================
 
-import cv2
 import os
+import sys
+import time
+from multiprocessing import Pool
+
+import cv2
+
+# Root repo → agar package `src` bisa di-import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.preprocess import IMAGE_SUFFIXES, ClaheProcessor  # noqa: E402
+from src.utils.fileops import BuildManifest, file_digest       # noqa: E402
+
+PROGRESS_INTERVAL = 2.0   # Detik antar laporan progress
+
+# Processor milik proses worker (diisi oleh _init_worker)
+_processor = None
+
+
+# === Worker ===
+def _init_worker(params):
+    """Satu objek CLAHE per worker; OpenCV single-thread agar tidak rebutan core"""
+    global _processor
+    cv2.setNumThreads(1)
+    _processor = ClaheProcessor(**params)
+
+
+def _process_one(task):
+    """
+    Proses satu gambar: decode grayscale (tereduksi jika bisa) → CLAHE →
+    blur → resize → simpan.
+
+    Returns:
+        (nama, mtime_ns, size, digest, status) — status 'written',
+        'unchanged' (hash sama, tidak ditulis ulang) atau 'failed'
+    """
+    in_path, out_path, mtime_ns, size, known_digest, use_hash = task
+    name = os.path.basename(in_path)
+    digest = file_digest(in_path) if use_hash else None
+    if known_digest is not None and digest == known_digest and os.path.exists(out_path):
+        return name, mtime_ns, size, digest, 'unchanged'
+
+    image = _processor.read(in_path)
+    if image is None:
+        return name, mtime_ns, size, digest, 'failed'
+    if not cv2.imwrite(out_path, _processor(image)):
+        return name, mtime_ns, size, digest, 'failed'
+    return name, mtime_ns, size, digest, 'written'
+
+
+# === Fungsi utama ===
+def preprocess_directory(input_dir, output_dir=None, size=(640, 640), clip_limit=2.0,
+                         tile_grid=(8, 8), blur_ksize=3, workers=None, chunksize=16,
+                         use_hash=True, force=False):
+    """
+    Preprocess semua gambar di folder (paralel, hanya file yang berubah).
 
-# === Path Dataset (ubah sesuai direktori kamu) ===
-INPUT_DIR = r"D:\Quant_ML_Project\ML.py\EasyPark\Dataset\parking_lot_final\train\images"
-OUTPUT_DIR = os.path.join(os.path.dirname(INPUT_DIR), "images_preprocessed")
+    Args:
+        input_dir: Folder gambar sumber
+        output_dir: Folder hasil (default: <induk input>/images_preprocessed)
+        size: Ukuran output (lebar, tinggi); JPEG besar di-decode langsung
+              di 1/2, 1/4 atau 1/8 resolusi jika masih ≥ ukuran ini
+        clip_limit, tile_grid: Parameter CLAHE
+        blur_ksize: Kernel Gaussian blur (0 = tanpa blur)
+        workers: Jumlah proses worker (None = semua core, 1 = tanpa pool)
+        chunksize: Jumlah gambar per task yang dikirim ke worker
+        use_hash: Simpan sha256 input; file yang mtime-nya berubah tapi
+                  isinya sama tidak diproses ulang
+        force: Proses ulang semua file
 
-# Buat folder output jika belum ada
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+    Returns:
+        dict ringkasan (total, written, unchanged, skipped, failed, seconds)
+    """
+    output_dir = output_dir or os.path.join(os.path.dirname(input_dir), "images_preprocessed")
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
 
-# === Inisialisasi CLAHE ===
-clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    params = ClaheProcessor(size, clip_limit, tile_grid, blur_ksize).params()
+    manifest = BuildManifest(output_dir, params={**params, 'use_hash': use_hash})
 
-# === Fungsi Processing ===
-def preprocess_image(image_path, save_path):
-    img = cv2.imread(image_path)
-    if img is None:
-        print(f"❌ Gagal membaca: {image_path}")
-        return
+    # Scan dengan os.scandir (stat ikut dari DirEntry). Daftar task dibuat
+    # penuh di thread utama: generator yang dikonsumsi thread feeder Pool
+    # akan membaca manifest bersamaan dengan manifest.record() di bawah
+    names = []
+    summary = {'total': 0, 'written': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0}
+    tasks = []
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.lower().endswith(IMAGE_SUFFIXES):
+                continue
+            names.append(entry.name)
+            summary['total'] += 1
+            stat = entry.stat()
+            out_path = os.path.join(output_dir, entry.name)
+            status = 'stale' if force else manifest.status(entry.name, stat)
+            if status == 'fresh' and os.path.exists(out_path):
+                summary['skipped'] += 1
+                continue
+            known = manifest.digest(entry.name) if status == 'check' else None
+            tasks.append((entry.path, out_path, stat.st_mtime_ns, stat.st_size, known, use_hash))
 
-    # Convert ke grayscale
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    init_args = ({'size': size, 'clip_limit': clip_limit, 'tile_grid': tile_grid,
+                  'blur_ksize': blur_ksize},)
+    if workers > 1:
+        pool = Pool(processes=workers, initializer=_init_worker, initargs=init_args)
+        results = pool.imap_unordered(_process_one, tasks, chunksize)
+    else:
+        pool = None
+        _init_worker(*init_args)
+        results = map(_process_one, tasks)
 
-    # Terapkan CLAHE untuk peningkatan kontras
-    enhanced = clahe.apply(gray)
+    start = last_report = time.perf_counter()
+    done = 0
+    try:
+        for name, mtime_ns, file_size, digest, status in results:
+            done += 1
+            summary[status] += 1
+            if status == 'failed':
+                print(f"❌ Gagal membaca/menulis: {name}")
+            else:
+                manifest.record(name, mtime_ns, file_size, digest)
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL:
+                print(f"  {done} diproses | {done / (now - start):.1f} img/s", flush=True)
+                last_report = now
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
-    # Denoise ringan
-    blur = cv2.GaussianBlur(enhanced, (3, 3), 0)
+    manifest.prune(names)
+    manifest.save()
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+    return summary
 
-    # Resize ke 640x640 agar seragam untuk YOLO
-    resized = cv2.resize(blur, (640, 640))
 
-    # Simpan hasilnya
-    cv2.imwrite(save_path, resized)
+# === Eksekusi utama ===
+if __name__ == '__main__':
+    # === Path Dataset (ubah sesuai direktori kamu) ===
+    INPUT_DIR = r"D:\Quant_ML_Project\ML.py\EasyPark\Dataset\parking_lot_final\train\images"
+    OUTPUT_DIR = os.path.join(os.path.dirname(INPUT_DIR), "images_preprocessed")
 
-# === Proses semua gambar ===
-for filename in os.listdir(INPUT_DIR):
-    if filename.lower().endswith(('.jpg', '.jpeg', '.png')):
-        in_path = os.path.join(INPUT_DIR, filename)
-        out_path = os.path.join(OUTPUT_DIR, filename)
-        preprocess_image(in_path, out_path)
+    summary = preprocess_directory(INPUT_DIR, OUTPUT_DIR, size=(640, 640),
+                                   clip_limit=2.0, tile_grid=(8, 8), blur_ksize=3)
 
-print(f"\n✅ Selesai! Semua gambar tersimpan di: {OUTPUT_DIR}")
+    print(f"\n✅ Selesai! Semua gambar tersimpan di: {OUTPUT_DIR}")
+    print(f"   {summary['total']} gambar | ditulis {summary['written']} | "
+          f"tidak berubah {summary['skipped'] + summary['unchanged']} | "
+          f"gagal {summary['failed']} | {summary['seconds']} s")
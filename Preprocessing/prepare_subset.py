@@ -1,49 +1,66 @@
+# =====================================================
+# 🎯 Subset / split dataset terstratifikasi (seeded)
+#    Label dibaca sekali → index histogram kelas per gambar,
+#    split di-link (symlink/hardlink) + subset.json
+# =====================================================
+
 import os
-import shutil
-import random
+import sys
+
+# Root repo → agar package `src` bisa di-import
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+from src.utils.subset import LabelIndex, materialize, stratified_split  # noqa: E402
 
-# === Path asal (pakai path relatif dari file script ini) ===
-BASE_DIR = os.path.dirname(__file__)  # folder tempat file prepare_subset.py berada
-SRC_BASE = os.path.join(BASE_DIR, "Dataset", "parking_lot")
+# === Path asal ===
+SRC_BASE = os.path.join(ROOT_DIR, "Dataset", "parking_lot_final")
 SRC_IMAGES = os.path.join(SRC_BASE, "train", "images")
 SRC_LABELS = os.path.join(SRC_BASE, "train", "labels")
 
 # === Path tujuan (subset) ===
-DST_BASE = os.path.join(BASE_DIR, "Dataset", "parking_lot_subset")
+DST_BASE = os.path.join(ROOT_DIR, "Dataset", "parking_lot_subset")
+
+# Jumlah per split (int) atau rasio (float, mis. {"train": 0.7, "valid": 0.2, "test": 0.1})
 SPLITS = {
     "train": 50,
     "valid": 10,
     "test": 10
 }
+# Total subset jika SPLITS berupa rasio: int (jumlah), float ≤ 1 (fraksi), None = semua
+SIZE = None
+
+SEED = 0                 # Seed sampling → subset sama persis tiap run
+NUM_CLASSES = 2          # 0 = terisi, 1 = kosong
+STRATA_BINS = 4          # Resolusi strata komposisi terisi/kosong per gambar
 
-# === Buat folder subset ===
-for split in SPLITS.keys():
-    os.makedirs(os.path.join(DST_BASE, split, "images"), exist_ok=True)
-    os.makedirs(os.path.join(DST_BASE, split, "labels"), exist_ok=True)
+# True = baca label dari <split>/labels.npz (src.core.label_store, butuh numpy);
+# False = index JSON per file label (stdlib saja)
+USE_LABEL_STORE = True
 
-# === Ambil semua file image ===
-all_images = [f for f in os.listdir(SRC_IMAGES) if f.endswith(('.jpg', '.png', '.jpeg'))]
-random.shuffle(all_images)
+# 'symlink', 'hardlink', 'reflink', 'copy', atau 'auto' (hardlink → reflink → copy)
+LINK_MODE = "symlink"
 
-# === Bagi sesuai split ===
-start = 0
-for split, count in SPLITS.items():
-    subset_images = all_images[start:start + count]
-    start += count
+# =====================================================
 
-    for img_name in subset_images:
-        label_name = os.path.splitext(img_name)[0] + ".txt"
+if __name__ == "__main__":
+    if USE_LABEL_STORE:
+        from src.core.label_store import LabelStore
 
-        src_img = os.path.join(SRC_IMAGES, img_name)
-        src_lbl = os.path.join(SRC_LABELS, label_name)
-        dst_img = os.path.join(DST_BASE, split, "images", img_name)
-        dst_lbl = os.path.join(DST_BASE, split, "labels", label_name)
+        store, read = LabelStore.load_or_build(SRC_LABELS, SRC_IMAGES)
+        index = LabelIndex.from_store(store, SRC_IMAGES, SRC_LABELS, num_classes=NUM_CLASSES)
+    else:
+        index = LabelIndex(SRC_IMAGES, SRC_LABELS, num_classes=NUM_CLASSES).build()
+        read = index.read
+    print(f"📚 {len(index)} gambar terindeks ({read} label dibaca, sisanya dari cache)")
+    print(f"   Box per kelas: {index.totals()}")
 
-        if os.path.exists(src_img):
-            shutil.copy2(src_img, dst_img)
-        if os.path.exists(src_lbl):
-            shutil.copy2(src_lbl, dst_lbl)
+    assignment = stratified_split(index, SPLITS, size=SIZE, seed=SEED, bins=STRATA_BINS)
+    manifest = materialize(index, assignment, DST_BASE, mode=LINK_MODE,
+                           params={'splits': SPLITS, 'size': SIZE, 'seed': SEED,
+                                   'bins': STRATA_BINS})
 
-    print(f"✅ {split} set selesai: {len(subset_images)} file disalin.")
+    for split, info in manifest['splits'].items():
+        print(f"✅ {split} set selesai: {len(info['images'])} gambar, "
+              f"box per kelas {info['class_counts']} ({LINK_MODE}).")
 
-print("\n🎉 Semua subset selesai dibuat di folder 'Dataset/parking_lot_subset/'")
+    print(f"\n🎉 Semua subset selesai dibuat di folder '{DST_BASE}' (lihat subset.json)")
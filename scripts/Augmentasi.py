@@ -7,182 +7,243 @@
 import cv2            # OpenCV untuk manipulasi gambar
 import numpy as np     # Numpy untuk operasi numerik (matriks)
 from pathlib import Path   # Untuk manajemen path file/folder yang cross-platform
-import random          # Untuk membuat efek acak (bayangan, noise, dsb)
-import shutil          # Untuk menyalin file (gambar dan label)
+import random          # Untuk memilih tipe augmentasi per variasi
+import os              # Untuk cek mtime file (resume)
+import time            # Untuk menghitung throughput
+import zlib            # Untuk seed deterministik per gambar
+import sys             # Untuk menambahkan root repo ke sys.path
+from multiprocessing import Pool   # Untuk augmentasi paralel di semua core
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 # =========================================================
-# 🔹 Fungsi: apply_shadow()
-# Menambahkan bayangan acak pada gambar untuk simulasi kondisi real
+# 🔹 Kernel augmentasi (bayangan, gelap, noise)
+# Implementasi ada di src/core/augment.py: mask 1 channel di resolusi
+# rendah, LUT uint8 untuk brightness, dan scratch buffer yang dipakai ulang
 # =========================================================
-def apply_shadow(image):
-    """Tambahkan bayangan acak pada gambar"""
-    h, w = image.shape[:2]  # Ambil tinggi dan lebar gambar
-    
-    # Pilih jenis bayangan secara acak
-    shadow_type = random.choice(['vertical', 'horizontal', 'diagonal', 'random'])
-    
-    # Bayangan vertikal seperti tiang atau pohon
-    if shadow_type == 'vertical':
-        shadow_width = random.randint(w//8, w//3)   # Lebar bayangan
-        shadow_pos = random.randint(0, w - shadow_width)  # Posisi mulai bayangan
-        mask = np.ones_like(image, dtype=np.float32)
-        mask[:, shadow_pos:shadow_pos+shadow_width] = random.uniform(0.3, 0.6)  # Gelapkan area
-    
-    # Bayangan horizontal seperti atap
-    elif shadow_type == 'horizontal':
-        shadow_height = random.randint(h//8, h//2)
-        shadow_pos = random.randint(0, h - shadow_height)
-        mask = np.ones_like(image, dtype=np.float32)
-        mask[shadow_pos:shadow_pos+shadow_height, :] = random.uniform(0.3, 0.6)
-    
-    # Bayangan diagonal seperti dari arah miring
-    elif shadow_type == 'diagonal':
-        mask = np.ones_like(image, dtype=np.float32)
-        # Buat poligon acak diagonal
-        pts = np.array([
-            [random.randint(0, w//2), 0],
-            [random.randint(w//2, w), 0],
-            [random.randint(w//2, w), h],
-            [random.randint(0, w//2), h]
-        ])
-        cv2.fillPoly(mask, [pts], (random.uniform(0.3, 0.6),) * 3)
-    
-    # Bayangan acak (irregular) seperti awan atau bayangan orang
-    else:
-        mask = np.ones_like(image, dtype=np.float32)
-        num_shadows = random.randint(1, 3)  # Jumlah bayangan acak
-        for _ in range(num_shadows):
-            x = random.randint(0, w)
-            y = random.randint(0, h)
-            radius = random.randint(min(h, w)//8, min(h, w)//3)
-            cv2.circle(mask, (x, y), radius, 
-                      (random.uniform(0.3, 0.6),) * 3, -1)  # Tambahkan area gelap
-    
-    # Blur agar transisi bayangan halus (tidak kaku)
-    mask = cv2.GaussianBlur(mask, (21, 21), 0)
-    
-    # Terapkan mask ke gambar (bayangan = hasil kali)
-    result = (image * mask).astype(np.uint8)
-    
-    return result
+from src.core.augment import AUG_TYPES, get_kernel   # noqa: E402
+from src.utils.fileops import DedupManifest, file_digest   # noqa: E402
+
+PROGRESS_INTERVAL = 2.0   # Detik antar laporan progress
+
+# Manifest content-hash milik proses worker (diisi oleh _init_worker)
+_store = None
 
 # =========================================================
-# 🔹 Fungsi: adjust_brightness()
-# Mengubah tingkat kecerahan gambar untuk simulasi siang/malam
+# 🔹 Helper: seed deterministik & cek output
 # =========================================================
-def adjust_brightness(image, factor=None):
-    """Ubah brightness gambar"""
-    if factor is None:
-        factor = random.uniform(0.4, 1.5)  # 0.4 = gelap, 1.5 = terang
-    
-    # Ubah ke HSV agar mudah ubah "Value" (kecerahan)
-    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-    hsv[:, :, 2] = np.clip(hsv[:, :, 2] * factor, 0, 255).astype(np.uint8)
-    result = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
-    
-    return result
+def _image_seed(base_seed, split, name):
+    """Seed stabil per gambar (tidak bergantung urutan proses/worker)"""
+    key = f"{split}/{name}".encode('utf-8')
+    return (base_seed * 1_000_003 + zlib.crc32(key)) & 0xFFFFFFFF
+
+def _plan_variations(seed, num_variations):
+    """Tentukan tipe augmentasi tiap variasi dari seed gambar"""
+    rng = random.Random(seed)
+    return [rng.choice(AUG_TYPES) for _ in range(num_variations)]
+
+def _is_up_to_date(output_path, source_paths):
+    """True jika output ada dan tidak lebih tua dari semua sumbernya"""
+    try:
+        out_mtime = os.stat(output_path).st_mtime
+    except FileNotFoundError:
+        return False
+    return all(out_mtime >= os.stat(src).st_mtime for src in source_paths)
+
+def _augment_variation(image, aug_type, seed, out=None):
+    """Terapkan satu kombinasi augmentasi (deterministik dari seed)"""
+    rng = np.random.default_rng(seed)
+    return get_kernel(image.shape).apply(image, aug_type, rng, out=out)
 
 # =========================================================
-# 🔹 Fungsi: add_noise()
-# Menambahkan noise untuk meniru kondisi kamera gelap atau buram
+# 🔹 Worker: proses satu gambar (dipanggil di proses terpisah)
 # =========================================================
-def add_noise(image):
-    """Tambahkan noise untuk simulasi low-light"""
-    noise = np.random.normal(0, random.randint(10, 25), image.shape)  # Gaussian noise
-    noisy = np.clip(image + noise, 0, 255).astype(np.uint8)
-    return noisy
+def _init_worker(target_dir, link_mode):
+    """Load snapshot manifest sekali per worker"""
+    global _store
+    _store = DedupManifest(target_dir, mode=link_mode)
+
+def _augment_one(task):
+    """
+    Augmentasi satu gambar beserta labelnya.
+
+    File dengan isi yang sama (gambar asli, label tiap variasi) hanya
+    disimpan sekali; sisanya di-link lewat manifest (_store).
+
+    Returns:
+        (jumlah ditulis, jumlah dilewati, entri manifest [(relpath, sha256)])
+    """
+    img_path, label_path, out_images, out_labels, num_variations, seed = task
+    img_path = Path(img_path)
+    label_path = Path(label_path) if label_path else None
+    out_images = Path(out_images)
+    out_labels = Path(out_labels)
+
+    written = skipped = 0
+    entries = []
+
+    # Link/copy gambar & label asli (mtime ikut sumber untuk cek resume)
+    dst_img = out_images / img_path.name
+    if _is_up_to_date(dst_img, [img_path]):
+        skipped += 1
+    else:
+        _store.put_file(img_path, dst_img)
+        entries.append(_store.entry(dst_img))
+        written += 1
+
+    label_digest = None
+    if label_path:
+        dst_lbl = out_labels / label_path.name
+        if _is_up_to_date(dst_lbl, [label_path]):
+            skipped += 1
+        else:
+            _store.put_file(label_path, dst_lbl)
+            entries.append(_store.entry(dst_lbl))
+            written += 1
+
+    # Cari variasi yang belum ada / sudah basi
+    pending = []
+    for i, aug_type in enumerate(_plan_variations(seed, num_variations)):
+        new_stem = f"{img_path.stem}_aug{i}_{aug_type}"
+        out_img = out_images / f"{new_stem}{img_path.suffix}"
+        out_lbl = out_labels / f"{new_stem}.txt"
+        # Gambar variasi hanya bergantung pada gambar sumber, label variasi
+        # (link ke label sumber, mtime ikut sumber) hanya pada label sumber
+        done = _is_up_to_date(out_img, [img_path])
+        if label_path:
+            done = done and _is_up_to_date(out_lbl, [label_path])
+        if done:
+            skipped += 1
+        else:
+            pending.append((i, aug_type, out_img, out_lbl))
+
+    if not pending:
+        return written, skipped, entries
+
+    # Decode gambar & hash label cukup sekali untuk semua variasi
+    image = cv2.imread(str(img_path))
+    if image is None:
+        return written, skipped, entries
+    if label_path:
+        label_digest = file_digest(label_path)
+
+    # Satu buffer output dipakai ulang untuk semua variasi gambar ini
+    aug_image = np.empty_like(image)
+    for i, aug_type, out_img, out_lbl in pending:
+        # Seed per variasi → hasil sama persis walau dijalankan ulang
+        _augment_variation(image, aug_type, (seed, i), out=aug_image)
+        ok, buffer = cv2.imencode(img_path.suffix, aug_image)
+        if not ok:
+            continue
+        _store.put_bytes(buffer.tobytes(), out_img)
+        entries.append(_store.entry(out_img))
+
+        # Label variasi identik dengan label asli → cukup di-link
+        if label_digest is not None:
+            _store.put_file(label_path, out_lbl, digest=label_digest)
+            entries.append(_store.entry(out_lbl))
+        written += 1
+
+    return written, skipped, entries
 
 # =========================================================
 # 🔹 Fungsi utama: augment_dataset()
 # Men-generate dataset baru dengan variasi kondisi realistik
 # =========================================================
-def augment_dataset(source_dir, target_dir, num_variations=3):
+def augment_dataset(source_dir, target_dir, num_variations=3, workers=None,
+                    chunksize=8, seed=0, link_mode='copy'):
     """
-    Augmentasi dataset untuk kondisi gelap/bayangan
-    
+    Augmentasi dataset untuk kondisi gelap/bayangan (paralel & bisa resume)
+
     Args:
         source_dir: Folder dataset asli (harus ada train/images & train/labels)
         target_dir: Folder hasil augmentasi
         num_variations: Jumlah variasi augmentasi per gambar
+        workers: Jumlah proses worker (None = semua core, 1 = tanpa pool)
+        chunksize: Jumlah gambar per task yang dikirim ke worker
+        seed: Seed dasar; seed tiap gambar diturunkan dari seed + nama file
+        link_mode: 'copy', 'hardlink', 'reflink', atau 'auto'; file dengan
+                   isi identik hanya disimpan sekali (lihat manifest.json)
     """
     source_dir = Path(source_dir)
     target_dir = Path(target_dir)
-    
+    workers = workers or os.cpu_count() or 1
+
     # Buat struktur folder (train & val)
     for split in ['train', 'val']:
         (target_dir / split / 'images').mkdir(parents=True, exist_ok=True)
         (target_dir / split / 'labels').mkdir(parents=True, exist_ok=True)
-    
-    # Loop untuk dua folder: train dan val
-    for split in ['train', 'val']:
-        image_dir = source_dir / split / 'images'
-        label_dir = source_dir / split / 'labels'
-        
-        # Kalau folder tidak ada → skip
-        if not image_dir.exists():
-            print(f"Warning: {image_dir} tidak ditemukan!")
-            continue
-        
-        # Ambil semua file gambar (jpg/png)
-        image_files = list(image_dir.glob('*.[jp][pn]g'))
-        print(f"\nMemproses {len(image_files)} gambar dari {split}...")
-        
-        # Proses tiap gambar satu per satu
-        for img_path in image_files:
-            # Copy gambar asli dulu ke folder baru
-            shutil.copy(img_path, target_dir / split / 'images' / img_path.name)
-            
-            # Copy label (jika ada)
-            label_path = label_dir / f"{img_path.stem}.txt"
-            if label_path.exists():
-                shutil.copy(label_path, target_dir / split / 'labels' / label_path.name)
-            
-            # Load gambar pakai OpenCV
-            image = cv2.imread(str(img_path))
-            if image is None:
+
+    # Manifest content-hash di root target (digabung dari semua worker)
+    manifest = DedupManifest(target_dir, mode=link_mode)
+
+    if workers > 1:
+        pool = Pool(processes=workers, initializer=_init_worker,
+                    initargs=(str(target_dir), link_mode))
+    else:
+        pool = None
+        _init_worker(str(target_dir), link_mode)
+    try:
+        # Loop untuk dua folder: train dan val
+        for split in ['train', 'val']:
+            image_dir = source_dir / split / 'images'
+            label_dir = source_dir / split / 'labels'
+
+            # Kalau folder tidak ada → skip
+            if not image_dir.exists():
+                print(f"Warning: {image_dir} tidak ditemukan!")
                 continue
-            
-            # Buat beberapa variasi augmentasi
-            for i in range(num_variations):
-                # Pilih tipe augmentasi secara acak
-                aug_type = random.choice([
-                    'shadow_only',
-                    'dark_only', 
-                    'shadow_dark',
-                    'dark_noise',
-                    'shadow_dark_noise'
-                ])
-                
-                aug_image = image.copy()
-                
-                # Terapkan bayangan jika tipe-nya mengandung "shadow"
-                if 'shadow' in aug_type:
-                    aug_image = apply_shadow(aug_image)
-                
-                # Ubah brightness jika tipe-nya mengandung "dark"
-                if 'dark' in aug_type:
-                    aug_image = adjust_brightness(aug_image, 
-                                                 random.uniform(0.4, 0.8))
-                
-                # Tambahkan noise jika tipe-nya mengandung "noise"
-                if 'noise' in aug_type:
-                    aug_image = add_noise(aug_image)
-                
-                # Simpan hasil augmentasi ke folder output
-                new_name = f"{img_path.stem}_aug{i}_{aug_type}{img_path.suffix}"
-                cv2.imwrite(str(target_dir / split / 'images' / new_name), aug_image)
-                
-                # Copy file label dengan nama yang sama
-                if label_path.exists():
-                    new_label = f"{img_path.stem}_aug{i}_{aug_type}.txt"
-                    shutil.copy(label_path, target_dir / split / 'labels' / new_label)
-        
-        print(f"Selesai memproses {split}!")
-    
+
+            # Ambil semua file gambar (jpg/png), urut agar hasil stabil
+            image_files = sorted(image_dir.glob('*.[jp][pn]g'))
+            total = len(image_files)
+            print(f"\nMemproses {total} gambar dari {split} "
+                  f"({workers} worker, chunk {chunksize})...")
+
+            def tasks():
+                for img_path in image_files:
+                    label_path = label_dir / f"{img_path.stem}.txt"
+                    yield (str(img_path),
+                           str(label_path) if label_path.exists() else None,
+                           str(target_dir / split / 'images'),
+                           str(target_dir / split / 'labels'),
+                           num_variations,
+                           _image_seed(seed, split, img_path.name))
+
+            if pool is not None:
+                results = pool.imap_unordered(_augment_one, tasks(), chunksize)
+            else:
+                results = map(_augment_one, tasks())
+
+            # Kumpulkan hasil + laporan progress & throughput
+            start = last_report = time.perf_counter()
+            done = written = skipped = 0
+            for n_written, n_skipped, entries in results:
+                manifest.update(entries)
+                done += 1
+                written += n_written
+                skipped += n_skipped
+                now = time.perf_counter()
+                if now - last_report >= PROGRESS_INTERVAL or done == total:
+                    rate = done / max(now - start, 1e-9)
+                    print(f"  [{split}] {done}/{total} gambar | {rate:.1f} img/s | "
+                          f"ditulis {written}, dilewati {skipped}", flush=True)
+                    last_report = now
+
+            manifest.save()
+            print(f"Selesai memproses {split}!")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
     # Notifikasi akhir
     print("\n" + "="*50)
     print("✅ Augmentasi selesai!")
     print(f"📁 Dataset baru tersimpan di: {target_dir}")
+    stats = manifest.stats()
+    print(f"🔗 {stats['files']} file, {stats['unique']} isi unik ({link_mode})")
     print("="*50)
 
 # =========================================================
@@ -193,11 +254,15 @@ if __name__ == '__main__':
     source_dataset = "D:\\Quant_ML_Project\\ML.py\\EasyPark\\Dataset\\parking_lot_final"
     target_dataset = "D:\\Quant_ML_Project\\ML.py\\EasyPark\\Dataset\\parking_lot_aug"
     
-    # Jalankan augmentasi (3 variasi per gambar)
+    # Jalankan augmentasi (3 variasi per gambar, pakai semua core)
     augment_dataset(
         source_dir=source_dataset,
         target_dir=target_dataset,
-        num_variations=3
+        num_variations=3,
+        workers=None,
+        chunksize=8,
+        seed=0,
+        link_mode='auto'   # Hardlink/reflink file identik, fallback copy
     )
     
     # Pengingat agar update path YAML YOLO ke dataset baru
@@ -0,0 +1,88 @@
+# =========================================================
+# ⏱ Benchmark inference offline (tanpa kamera)
+# Sweep backend / imgsz / batch / thread / conf memakai gambar
+# Dataset/ atau video rekaman; latency p50/p95/p99 per tahap
+# (decode, preprocess, inference, NMS, plot, JPEG encode) → JSON
+# =========================================================
+
+import json
+import sys
+import time
+from pathlib import Path
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.backend.benchmark import (  # noqa: E402
+    STAGES,
+    build_report,
+    compare_reports,
+    load_frames,
+    save_report,
+    sweep,
+)
+from src.backend.registry import resolve_model  # noqa: E402
+
+# ========== KONFIGURASI - SESUAIKAN DI SINI ==========
+
+# Model/production/best.pt jika sudah di-promote, selain itu hasil training lokal
+WEIGHTS = Path(resolve_model(ROOT_DIR / "Model" / "parking_detection2" / "weights" / "best.pt"))
+
+# Folder gambar atau file video rekaman (.mp4)
+SOURCE = ROOT_DIR / "Dataset" / "parking_lot_final" / "val" / "images"
+NUM_FRAMES = 200
+SEED = 0
+
+# Parameter sweep (semua kombinasi dijalankan)
+BACKENDS = ['pytorch', 'onnx']      # + 'onnx_int8', 'openvino' jika tersedia
+IMGSZ = [320, 480, 640]
+BATCH = [1, 4]
+THREADS = [1, 2, None]              # None = semua core
+CONF = [0.25, 0.5]
+DEVICE = 'cpu'                      # Benchmark CPU-only
+WARMUP = 3
+
+# Hasil disimpan per run; BASELINE (opsional) untuk cek regresi throughput
+OUTPUT_DIR = ROOT_DIR / "benchmarks"
+BASELINE = None                     # mis. OUTPUT_DIR / "baseline.json"
+REGRESSION_TOLERANCE = 0.10         # Turun > 10% dianggap regresi
+
+# =====================================================
+
+if __name__ == "__main__":
+    print("Inference Benchmark")
+    print("="*50)
+
+    if not WEIGHTS.exists():
+        print(f"❌ Weight tidak ditemukan: {WEIGHTS}")
+        sys.exit(1)
+
+    frames = load_frames(SOURCE, NUM_FRAMES, seed=SEED)
+    if not frames:
+        print(f"❌ Tidak ada frame di: {SOURCE}")
+        sys.exit(1)
+    print(f"Frame   : {len(frames)} dari {SOURCE}\n")
+
+    cases = sweep(WEIGHTS, frames, backends=BACKENDS, imgsz=IMGSZ, batch=BATCH,
+                  threads=THREADS, conf=CONF, device=DEVICE, warmup=WARMUP)
+    report = build_report(cases, SOURCE, len(frames))
+    output = save_report(report, OUTPUT_DIR / f"inference_{time.strftime('%Y%m%d_%H%M%S')}.json")
+
+    # Ringkasan p50 per tahap untuk kasus tercepat
+    if cases:
+        best = max(cases, key=lambda c: c['total']['throughput'] or 0)
+        print(f"\nTercepat: {best['params']}")
+        for stage in STAGES:
+            s = best['stages'][stage]
+            print(f"  {stage:10} p50 {s['p50_ms']:>8.2f} ms   p99 {s['p99_ms']:>8.2f} ms")
+
+    if BASELINE is not None and Path(BASELINE).exists():
+        with open(BASELINE, 'r', encoding='utf-8') as f:
+            regressions = compare_reports(json.load(f), report, REGRESSION_TOLERANCE)
+        print(f"\nRegresi vs {Path(BASELINE).name}: {len(regressions)}")
+        for params, before, after, ratio in regressions:
+            print(f"  {params}: {before} → {after} img/s ({ratio}x)")
+
+    print(f"\nHasil : {output}")
+    print("="*50)
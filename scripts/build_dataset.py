@@ -0,0 +1,43 @@
+# =========================================================
+# 🏗️ Build dataset dalam satu pass
+# Preprocessing (CLAHE/resize) + augmentasi (bayangan, gelap,
+# noise) dari configs/build.yaml: tiap gambar di-decode sekali,
+# semua variasi ditulis dari hasil decode yang sama
+# =========================================================
+
+import sys
+from pathlib import Path
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.core.build_pipeline import build_dataset, load_build_config  # noqa: E402
+
+# ========== KONFIGURASI ==========
+
+CONFIG_PATH = ROOT_DIR / "configs" / "build.yaml"
+
+# True = abaikan manifest build, proses ulang semua gambar
+FORCE = False
+
+# =================================
+
+if __name__ == "__main__":
+    print("Dataset Build Pipeline")
+    print("="*50)
+
+    config = load_build_config(CONFIG_PATH)
+    print(f"Sumber  : {config['source']}")
+    print(f"Target  : {config['target']}")
+    print(f"Variant : {', '.join(config['variants'])}")
+
+    summary = build_dataset(config, force=FORCE)
+
+    print()
+    for split, counts in summary.items():
+        print(f"[{split}] {counts['images']} gambar | ditulis {counts['written']} file | "
+              f"dilewati {counts['skipped']} | gagal {counts['failed']} | {counts['seconds']} s")
+    if config.get('data_yaml'):
+        print(f"\n📄 data.yaml: {config['data_yaml']}")
+    print("="*50)
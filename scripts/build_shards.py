@@ -0,0 +1,55 @@
+# =========================================================
+# 🧱 Build shard gambar ter-decode (memory-mapped)
+# JPEG tiap split di-decode + di-resize SEKALI ke file shard
+# .bin berukuran tetap + index.json (offset per gambar).
+# Training (SHARD_DIR di train_yolo.py) lalu membaca gambar
+# zero-copy dari shard, tanpa decode JPEG tiap epoch.
+# =========================================================
+
+import sys
+from pathlib import Path
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.core.shards import build_shards  # noqa: E402
+
+# ========== KONFIGURASI ==========
+
+DATASET_DIR = ROOT_DIR / "Dataset" / "parking_lot_final"
+SPLITS = ["train", "val"]
+
+# Output: <SHARD_DIR>/<split>/shard_0000.bin ... + index.json
+SHARD_DIR = ROOT_DIR / "Dataset" / ".shards" / "parking_lot_final"
+
+IMGSZ = 640           # Harus sama dengan imgsz training
+MODE = "resize"       # 'resize' (untuk training Ultralytics) / 'letterbox' (siap inference)
+SHARD_MB = 512        # Ukuran maksimal satu file shard
+DECODE = "exact"      # 'exact' = piksel sama dengan training tanpa shard (decode penuh,
+                      # INTER_LINEAR); 'fast' = decode JPEG tereduksi + INTER_AREA (lebih
+                      # cepat, piksel sedikit berbeda)
+WORKERS = None        # None = semua core
+
+# True = abaikan index, decode ulang semua gambar
+FORCE = False
+
+# =================================
+
+if __name__ == "__main__":
+    print("Decoded Image Shards")
+    print("="*50)
+
+    for split in SPLITS:
+        images_dir = DATASET_DIR / split / "images"
+        if not images_dir.exists():
+            print(f"Warning: {images_dir} tidak ditemukan!")
+            continue
+        summary = build_shards(images_dir, SHARD_DIR / split, imgsz=IMGSZ, mode=MODE,
+                               shard_mb=SHARD_MB, decode=DECODE, workers=WORKERS, force=FORCE)
+        print(f"[{split}] {summary['images']} gambar | decode {summary['decoded']} | "
+              f"dilewati {summary['skipped']} | dihapus {summary['removed']} | "
+              f"gagal {summary['failed']} | {summary['shards']} shard | {summary['seconds']} s")
+
+    print(f"\n📦 Shard: {SHARD_DIR}")
+    print("="*50)
@@ -0,0 +1,44 @@
+# =========================================================
+# 🔗 Deduplikasi folder Dataset/
+# Ganti file gambar/label yang isinya identik dengan hardlink
+# (atau reflink) ke satu salinan, lalu tulis manifest.json
+# =========================================================
+
+import sys
+from pathlib import Path
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.fileops import dedup_tree  # noqa: E402
+
+# ========== KONFIGURASI - SESUAIKAN PATH DI SINI ==========
+
+# Folder yang akan dideduplikasi (semua subfolder ikut diproses)
+DATASET_DIRECTORY = Path(__file__).resolve().parents[1] / "Dataset"
+
+# 'hardlink', 'reflink', 'auto' (hardlink → reflink → copy)
+LINK_MODE = "auto"
+
+# Hanya file dengan ekstensi ini yang diproses
+EXTENSIONS = {'.jpg', '.jpeg', '.png', '.txt'}
+
+# True = hanya hitung penghematan, tidak mengubah file
+DRY_RUN = False
+
+# ===========================================================
+
+if __name__ == "__main__":
+    print("Dataset Deduplication")
+    print("="*50)
+
+    summary = dedup_tree(DATASET_DIRECTORY, mode=LINK_MODE,
+                         extensions=EXTENSIONS, dry_run=DRY_RUN)
+
+    print(f"File diproses : {summary['files']}")
+    print(f"Isi unik      : {summary['unique']}")
+    print(f"Di-link       : {summary['linked']}")
+    print(f"Hemat         : {summary['bytes_saved'] / 1e6:.1f} MB")
+    if DRY_RUN:
+        print("\n(dry run - tidak ada file yang diubah)")
+    print("="*50)
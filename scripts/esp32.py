@@ -1,77 +1,80 @@
 import cv2
-from ultralytics import YOLO
 import time
-import threading
-import numpy as np
+import sys
+from pathlib import Path
 
-url = "http://192.168.1.11:4747/video" 
-model = YOLO("yolov8n.pt").to("cuda")
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+from src.core.motion import MotionGate  # noqa: E402
+from src.utils.camera import CameraSource  # noqa: E402
+from src.backend.inference import backend_from_config, load_inference_config  # noqa: E402
+from src.backend.tiling import TiledDetector, tiled_from_config  # noqa: E402
+from src.backend.registry import resolve_model  # noqa: E402
 
-# Warmup GPU dengan format yang benar
-print("🔥 Warming up GPU...")
-dummy_frame = np.zeros((640, 640, 3), dtype=np.uint8)
-model.predict(source=dummy_frame, imgsz=640, verbose=False)
-print("✓ GPU ready!\n")
+url = "http://192.168.1.11:4747/video" 
+model_path = resolve_model("yolov8n.pt")   # Model/production/best.pt jika sudah di-promote
 
-class FrameReader:
-    """Thread terpisah untuk baca frame - mencegah blocking"""
-    def __init__(self, url):
-        self.cap = cv2.VideoCapture(url)
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        self.frame = None
-        self.ret = False
-        self.stopped = False
-        
-    def start(self):
-        threading.Thread(target=self.update, daemon=True).start()
-        return self
-        
-    def update(self):
-        while not self.stopped:
-            if self.cap.isOpened():
-                self.ret, self.frame = self.cap.read()
-            time.sleep(0.01)  # Prevent CPU spike
-                
-    def read(self):
-        return self.ret, self.frame
-        
-    def stop(self):
-        self.stopped = True
-        self.cap.release()
+# Load backend (PyTorch GPU / ONNX Runtime CPU) + warmup dari config
+print("🔥 Loading & warming up model...")
+inference_config = load_inference_config(ROOT_DIR / "configs" / "inference.yaml")
+inference_config.setdefault('weights', model_path)
+model = tiled_from_config(backend_from_config(inference_config), inference_config)
+tiled = isinstance(model, TiledDetector)
+print(f"✓ Model ready ({model.name})!\n")
 
-# Inisialisasi
-reader = FrameReader(url).start()
-time.sleep(2)  # Tunggu buffer pertama
+# Inisialisasi: thread baca kamera bersama (reconnect otomatis, frame
+# terbaru diserahkan lewat condition variable + nomor urut)
+reader = CameraSource(url, name="esp32").start()
+reader.wait_ready(timeout=5)  # Tunggu frame pertama
 
 fps_time = time.time()
 fps_counter = 0
 
+# Inference hanya jika frame berubah (atau hasil sudah > 5 detik)
+gate = MotionGate(threshold=0.01, max_staleness=5.0)
+results = None
+seq = 0
+
 print("🚀 Tekan ESC untuk keluar\n")
 
 while True:
-    ret, frame = reader.read()
-    
-    if not ret or frame is None:
-        print("⚠ Frame hilang, skip...")
-        time.sleep(0.1)
+    # Blok sampai ada frame baru (maks 1 detik); frame basi tidak dikembalikan
+    seq, frame = reader.read(seq, timeout=1.0)
+
+    if frame is None:
+        print(f"⚠ Frame hilang, menunggu kamera... {reader.stats()}")
+        # Tetap proses event window agar tidak freeze dan ESC tetap bisa keluar
+        if cv2.waitKey(1) & 0xFF == 27:
+            break
         continue
     
-    # Resize untuk proses lebih cepat (opsional)
-    frame = cv2.resize(frame, (640, 480))
+    # Resize untuk proses lebih cepat (opsional); mode tile memakai resolusi penuh
+    if not tiled:
+        frame = cv2.resize(frame, (640, 480))
     
     # Deteksi dengan conf threshold lebih tinggi (kurangi objek yang diproses)
-    results = model(frame, conf=0.5, verbose=False)
+    if gate.should_infer(frame) or results is None:
+        results = model(frame, conf=0.5, verbose=False)
+        gate.mark_inferred()
+        annotated = results[0].plot()
+    else:
+        # Tidak ada perubahan → box terakhir digambar di frame terbaru
+        annotated = results[0].plot(img=frame)
     
     # Hitung FPS
     fps_counter += 1
     if time.time() - fps_time > 1:
         fps = fps_counter / (time.time() - fps_time)
-        print(f"📊 FPS: {fps:.1f}")
+        stats = reader.stats()
+        tiles = f" | tile {model.last_tiles}" if tiled else ""
+        print(f"📊 FPS: {fps:.1f} | skip inference: {gate.skip_ratio:.0%}{tiles} | "
+              f"kamera {stats['fps']} fps, drop {stats['dropped']}, "
+              f"reconnect {stats['reconnects']}")
         fps_counter = 0
         fps_time = time.time()
     
     # Tampilkan hasil
-    annotated = results[0].plot()
     cv2.imshow("YOLOv8 + ESP32-CAM", annotated)
 
     if cv2.waitKey(1) & 0xFF == 27:
@@ -2,11 +2,23 @@
 # 🧠 SISTEM DETEKSI PARKIR BERBASIS YOLOv8 + FLASK STREAMING
 # ===============================================================
 
-import cv2                           # Library untuk pengolahan citra dan video
-from ultralytics import YOLO         # Library YOLOv8 untuk deteksi objek
-import time                          # Untuk menghitung FPS (frame per second)
 import os                            # Untuk pengecekan file model
-from flask import Flask, Response    # Flask untuk web server dan streaming
+from flask import Flask, Response, jsonify, request   # Flask untuk web server dan streaming
+import sys                           # Untuk menambahkan root repo ke sys.path
+from pathlib import Path             # Untuk path yang cross-platform
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+from src.backend.pipeline import StreamPipeline  # noqa: E402
+from src.backend.render import DEFAULT_TIERS     # noqa: E402
+from src.core.motion import MotionGate           # noqa: E402
+from src.core.tracker import SlotTracker         # noqa: E402
+from src.backend.events import EventBus          # noqa: E402
+from src.utils.camera import CameraSource        # noqa: E402
+from src.backend.inference import backend_from_config, load_inference_config  # noqa: E402
+from src.backend.registry import resolve_model   # noqa: E402
+from src.utils.metrics import CONTENT_TYPE, Registry  # noqa: E402
 
 # ======================
 # 🔧 INISIALISASI FLASK
@@ -17,7 +29,12 @@ app = Flask(__name__)                # Membuat instance aplikasi Flask
 # ⚙️ KONFIGURASI DASAR
 # ======================
 url = "http://192.168.1.11:4747/video"   # URL stream dari kamera HP (IP Webcam)
-model_path = r"D:\Quant_ML_Project\ML.py\EasyPark\Model\parking_detection2\weights\best.pt"
+# 'flask'   = Werkzeug threaded (satu thread OS per penonton)
+# 'aiohttp' = satu event loop asyncio untuk semua client + WebSocket /ws
+SERVER = 'aiohttp'
+# Model produksi hasil scripts/model_registry.py (Model/production/best.pt);
+# path di bawah hanya dipakai jika belum ada model yang di-promote
+model_path = resolve_model(r"D:\Quant_ML_Project\ML.py\EasyPark\Model\parking_detection2\weights\best.pt")
 
 # Pastikan model YOLO tersedia di path yang ditentukan
 if not os.path.exists(model_path):
@@ -27,94 +44,78 @@ if not os.path.exists(model_path):
 # 🚀 LOAD MODEL YOLO
 # ======================
 print("🔥 Loading model...")
-try:
-    # Coba load model ke GPU (CUDA)
-    model = YOLO(model_path).to("cuda")
-    print("✅ Model di GPU\n")
-except:
-    # Jika tidak ada GPU, gunakan CPU
-    model = YOLO(model_path)
-    print("✅ Model di CPU\n")
+# Backend dipilih dari configs/inference.yaml: PyTorch (GPU) atau
+# ONNX Runtime / OpenVINO di CPU (export sekali, cache per hash weight)
+inference_config = load_inference_config(ROOT_DIR / "configs" / "inference.yaml")
+inference_config.setdefault('weights', model_path)
+model = backend_from_config(inference_config)
+print(f"✅ Model siap ({model.name})\n")
 
 # ======================
 # 🎥 KONEKSI KAMERA
 # ======================
 print("📸 Connecting to camera...")
-cap = cv2.VideoCapture(url)  # Membuka koneksi video stream dari IP camera
+# Thread baca kamera dengan reconnect otomatis (exponential backoff),
+# resolusi diminta 640x480
+camera = CameraSource(url, name="hp", width=640, height=480).start()
+
+if not camera.wait_ready(timeout=10):
+    print("⚠ Kamera belum mengirim frame, tetap mencoba reconnect di background...")
+
+# ======================
+# 🧵 PIPELINE CAPTURE → INFERENCE → ENCODE
+# ======================
+# Satu thread baca kamera, satu thread YOLO, satu thread plot + JPEG.
+# Antar-stage memakai slot "latest-frame-wins", jadi latency tetap ~1 frame
+# dan semua browser berbagi hasil encode yang sama.
+# Motion gate: YOLO hanya dijalankan jika >1% piksel berubah, atau paling
+# lambat tiap 5 detik; di antaranya box terakhir dipakai ulang
+gate = MotionGate(threshold=0.01, max_staleness=5.0)
+
+# ======================
+# 🅿️ TRACKER SLOT + EVENT
+# ======================
+# Deteksi dicocokkan antar frame (IoU) dan status terisi/kosong di-debounce;
+# hanya perubahan status yang dikirim ke /events (SSE) dan events.jsonl.
+# Selama ada kandidat status yang belum terkonfirmasi, motion gate dilewati
+# agar konfirmasi butuh ~min_hold detik, bukan confirm_frames × max_staleness
+tracker = SlotTracker(camera="hp", confirm_frames=3, min_hold=2.0)
+events = EventBus(log_path="events.jsonl")
 
-if not cap.isOpened():       # Jika gagal membuka kamera
-    raise Exception("❌ Cannot connect to camera")
+def track_slots(frame, results):
+    for event in tracker.update_result(results[0]):
+        events.publish(event)
 
-# Set resolusi video
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+# Tier stream /video?tier=full|medium|low (resolusi + kualitas JPEG);
+# tiap frame di-encode sekali per tier yang sedang ditonton saja.
+# JPEG pakai simplejpeg / TurboJPEG jika terpasang, selain itu OpenCV
+pipeline = StreamPipeline(camera, model, conf=0.5, gate=gate, listeners=[track_slots],
+                          force_infer=lambda: tracker.pending,
+                          tiers=DEFAULT_TIERS, jpeg_backend='auto').start()
+
+# ======================
+# 📈 METRIK (/metrics, format Prometheus)
+# ======================
+# Histogram durasi capture / inference / annotate / encode, kedalaman
+# antrian, frame yang di-drop, skip motion gate, dan jumlah client
+metrics = Registry()
+pipeline.register_metrics(metrics, labels={'camera': 'hp'})
+metrics.gauge('event_subscribers', 'Client /events yang terhubung',
+              lambda: events.subscribers, {'camera': 'hp'})
+metrics.counter('slot_events_total', 'Event perubahan status slot',
+                lambda: events.published, {'camera': 'hp'})
 
 # ======================
 # 🎬 GENERATOR FRAME STREAM
 # ======================
-def generate():
-    prev_time = time.time()     # Waktu awal untuk perhitungan FPS
-    fps_counter = 0             # Hitungan frame sementara
-    fps_display = 0             # FPS yang akan ditampilkan
-
-    while True:
-        ret, frame = cap.read()  # Baca satu frame dari kamera
-        if not ret:              # Jika gagal baca frame, tunggu sebentar
-            time.sleep(0.1)
-            continue
-        
-        # ======================
-        # 🔍 DETEKSI OBJEK YOLO
-        # ======================
-        results = model(frame, conf=0.5, verbose=False)  # Jalankan deteksi YOLO
-        annotated_frame = results[0].plot()              # Gambar bounding box ke frame
-
-        # ======================
-        # ⏱️ HITUNG FPS
-        # ======================
-        fps_counter += 1
-        current_time = time.time()
-        if current_time - prev_time >= 1:                # Update tiap 1 detik
-            fps_display = fps_counter / (current_time - prev_time)
-            fps_counter = 0
-            prev_time = current_time
-        
-        # ======================
-        # 🧾 TAMBAHKAN INFO KE FRAME
-        # ======================
-        # Menampilkan FPS di kiri atas
-        cv2.putText(annotated_frame, f"FPS: {fps_display:.1f}", 
-                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Hitung jumlah objek yang terdeteksi
-        num_detections = len(results[0].boxes)
-        
-        # Tampilkan jumlah objek
-        cv2.putText(annotated_frame, f"Objects: {num_detections}", 
-                    (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
-        
-        # ======================
-        # 🧩 ENKODE KE JPEG
-        # ======================
-        # Konversi frame ke format JPEG agar bisa dikirim lewat HTTP
-        ret, buffer = cv2.imencode('.jpg', annotated_frame, 
-                                   [cv2.IMWRITE_JPEG_QUALITY, 85])
-        frame_bytes = buffer.tobytes()   # Ubah hasil encode ke bytes
-
-        # ======================
-        # 🌐 STREAM DATA FRAME
-        # ======================
-        # Kirim frame ke browser dengan format multipart (streaming berkelanjutan)
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+def generate(tier='full'):
+    # Kirim frame JPEG terbaru ke browser (multipart, streaming berkelanjutan)
+    yield from pipeline.stream(tier)
 
 # ======================
-# 🌍 ROUTE FLASK - HALAMAN UTAMA
+# 🖥️ HALAMAN DASHBOARD (dipakai Flask & mode async)
 # ======================
-@app.route('/')
-def index():
-    # HTML tampilan utama dengan gaya modern (UI streaming)
-    return """
+INDEX_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -208,16 +209,52 @@ def index():
     </html>
     """
 
+# ======================
+# 🌍 ROUTE FLASK - HALAMAN UTAMA
+# ======================
+@app.route('/')
+def index():
+    # HTML tampilan utama dengan gaya modern (UI streaming)
+    return INDEX_HTML
+
 # ======================
 # 🎥 ROUTE FLASK - STREAM VIDEO
 # ======================
 @app.route('/video')
 def video():
-    # Mengirim hasil deteksi secara real-time
-    return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    # Mengirim hasil deteksi secara real-time; /video?tier=low untuk koneksi lambat
+    tier = request.args.get('tier', 'full')
+    if tier not in pipeline.tiers:
+        return jsonify({'error': f"tier harus salah satu dari {list(pipeline.tiers)}"}), 400
+    return Response(generate(tier), mimetype='multipart/x-mixed-replace; boundary=frame')
 
 # ======================
-# 🚀 MENJALANKAN SERVER FLASK
+# 📨 ROUTE FLASK - EVENT PERUBAHAN SLOT
+# ======================
+@app.route('/events')
+def slot_events():
+    # SSE (default) atau JSON-lines: /events?format=jsonl
+    fmt = request.args.get('format', 'sse')
+    mimetype = 'text/event-stream' if fmt == 'sse' else 'application/x-ndjson'
+    snapshot = [{'camera': tracker.camera, 'slot': slot, 'from': None, 'to': state}
+                for slot, state in tracker.snapshot().items()]
+    return Response(events.subscribe(fmt, snapshot), mimetype=mimetype)
+
+@app.route('/slots')
+def slots():
+    # Status terkini semua slot + ringkasan jumlah
+    return jsonify({'slots': tracker.snapshot(), 'counts': tracker.counts()})
+
+# ======================
+# 📈 ROUTE FLASK - METRIK PROMETHEUS
+# ======================
+@app.route('/metrics')
+def prometheus_metrics():
+    # Dibaca oleh Prometheus (scrape_configs → targets: ['<ip>:5000'])
+    return Response(metrics.render(), mimetype=CONTENT_TYPE)
+
+# ======================
+# 🚀 MENJALANKAN SERVER (FLASK / AIOHTTP)
 # ======================
 if __name__ == '__main__':
     print("\n" + "="*50)
@@ -227,6 +264,13 @@ if __name__ == '__main__':
     print("   http://localhost:5000")
     print("\n⌨️  Press Ctrl+C to stop")
     print("="*50 + "\n")
-    
-    # Jalankan Flask di semua IP (agar bisa diakses dari HP/laptop lain dalam 1 jaringan)
-    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+
+    # Jalankan di semua IP (agar bisa diakses dari HP/laptop lain dalam 1 jaringan)
+    if SERVER == 'aiohttp':
+        # MJPEG /video, SSE /events, dan WebSocket /ws (JSON deteksi, tanpa piksel)
+        # dilayani satu event loop; client lambat hanya kehilangan frame
+        from src.backend.async_server import AsyncStreamServer
+        AsyncStreamServer(pipeline, tracker=tracker, events=events, metrics=metrics,
+                          index_html=INDEX_HTML, camera='hp').run(host='0.0.0.0', port=5000)
+    else:
+        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
@@ -0,0 +1,60 @@
+# =========================================================
+# 📊 Inspeksi label dataset (label store kolumnar)
+# Semua label YOLO satu split dibaca sekali ke <split>/labels.npz
+# (float32: image, class, x, y, w, h); run berikutnya cukup
+# satu file + label yang berubah saja. Bisa export balik ke .txt.
+# =========================================================
+
+import sys
+from pathlib import Path
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.core.label_store import LabelStore  # noqa: E402
+
+# ========== KONFIGURASI ==========
+
+DATASET_DIR = ROOT_DIR / "Dataset" / "parking_lot_final"
+SPLITS = ["train", "val", "test"]
+CLASS_NAMES = {0: 'terisi', 1: 'kosong'}
+
+IMGSZ = 640           # Histogram ukuran box dalam piksel input model
+SIZE_BINS = 8
+
+# Folder tujuan export label .txt dari store (None = tidak export)
+EXPORT_DIR = None
+
+# =================================
+
+if __name__ == "__main__":
+    print("Label Inspection")
+    print("="*50)
+
+    for split in SPLITS:
+        images_dir = DATASET_DIR / split / "images"
+        labels_dir = DATASET_DIR / split / "labels"
+        if not images_dir.exists():
+            print(f"Warning: {images_dir} tidak ditemukan!")
+            continue
+
+        store, read = LabelStore.load_or_build(labels_dir, images_dir)
+        summary = store.summary(CLASS_NAMES, num_classes=len(CLASS_NAMES))
+        print(f"\n[{split}] {summary['images']} gambar | {summary['boxes']} box | "
+              f"tanpa box {summary['empty_images']} | ({read} label dibaca)")
+        print(f"  Box per kelas    : {summary['per_class']}")
+        print(f"  Gambar per kelas : {summary['images_per_class']}")
+        if summary['out_of_range']:
+            print(f"  ⚠ {summary['out_of_range']} box dengan koordinat di luar 0-1")
+
+        for cls, name in CLASS_NAMES.items():
+            counts, edges = store.box_size_histogram(SIZE_BINS, imgsz=IMGSZ, cls=cls)
+            bars = " ".join(f"{int(lo)}-{int(hi)}:{n}" for lo, hi, n in zip(edges, edges[1:], counts))
+            print(f"  Ukuran box {name:<7}: {bars}")
+
+        if EXPORT_DIR is not None:
+            n = store.export(Path(EXPORT_DIR) / split / "labels")
+            print(f"  📝 Export {n} file label → {Path(EXPORT_DIR) / split / 'labels'}")
+
+    print("="*50)
@@ -0,0 +1,96 @@
+# =========================================================
+# 🏷️ Registry model + promote ke produksi
+# Index run training (results.csv), benchmark latency tiap
+# best.pt di backend target, lalu promote model paling akurat
+# yang masih memenuhi budget latency (frame rate) ke
+# Model/production/best.pt — dipakai server saat startup.
+# =========================================================
+
+import sys
+from pathlib import Path
+
+import yaml
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.backend.registry import (  # noqa: E402
+    PRODUCTION_DIR,
+    benchmark_runs,
+    index_runs,
+    load_registry,
+    production_info,
+    promote,
+    save_registry,
+    select_best,
+)
+
+# ========== KONFIGURASI ==========
+
+CONFIG_PATH = ROOT_DIR / "configs" / "registry.yaml"
+
+# =================================
+
+if __name__ == "__main__":
+    print("Model Registry")
+    print("="*50)
+
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    runs_root = ROOT_DIR / config.get('runs_root', 'Model')
+    metric = config.get('metric', 'mAP50-95')
+    stage = config.get('latency_stage', 'total')
+    stat = config.get('latency_stat', 'p95_ms')
+    budget = config.get('latency_budget_ms') or 1000.0 / config.get('target_fps', 10)
+
+    runs = index_runs(runs_root)
+    print(f"📚 {len(runs)} run ditemukan di {runs_root}")
+    for run in runs:
+        m = run['metrics']
+        weights = "✓" if run['weights'] else "✗ tanpa weights/best.pt"
+        print(f"  {run['name']:<32} {metric} {m[metric]:.4f} | mAP50 {m['mAP50']:.4f} | "
+              f"epoch terbaik {m['best_epoch']}/{m['epochs']} | {weights}")
+
+    candidates = [r for r in runs if r['weights']]
+    if not candidates:
+        print("\n❌ Tidak ada run dengan weights/best.pt, tidak ada yang bisa di-promote")
+        sys.exit(1)
+
+    from src.backend.benchmark import load_frames
+
+    source = ROOT_DIR / config.get('source', 'Dataset/parking_lot_final/val/images')
+    frames = load_frames(source, n=config.get('num_frames', 100))
+    if not frames:
+        print(f"\n❌ Tidak ada frame di: {source} (cek `source` di {CONFIG_PATH.name})")
+        sys.exit(1)
+    print(f"\n⏱ Benchmark {config.get('backend', 'onnx')} ({config.get('device', 'cpu')}), "
+          f"{len(frames)} frame, budget {stat} {stage} ≤ {budget:.1f} ms")
+
+    registry = load_registry(runs_root / 'registry.json')
+    benchmark_runs(candidates, frames, backend=config.get('backend', 'onnx'),
+                   imgsz=config.get('imgsz'), device=config.get('device', 'cpu'),
+                   threads=config.get('threads'), warmup=config.get('warmup', 3),
+                   cache=registry.setdefault('benchmarks', {}))
+    registry['runs'] = runs
+    save_registry(registry, runs_root / 'registry.json')
+
+    best = select_best(candidates, budget, metric=metric, stat=stat, stage=stage)
+    if best is None:
+        print(f"\n❌ Tidak ada model dengan latency ≤ {budget:.1f} ms; produksi tidak diubah")
+        sys.exit(1)
+
+    current = production_info() or {}
+    latency = best['latency'][stage][stat]
+    print(f"\n🏆 Terbaik dalam budget: {best['name']} ({metric} {best['metrics'][metric]:.4f}, "
+          f"{stat} {latency:.1f} ms)")
+    if current.get('digest') == best['digest']:
+        print("   Sudah menjadi model produksi, tidak ada perubahan")
+    elif config.get('dry_run'):
+        print("   dry_run: tidak di-promote")
+    else:
+        reason = f"{metric} tertinggi dengan {stage} {stat} ≤ {budget:.1f} ms"
+        path = promote(best, PRODUCTION_DIR, budget_ms=budget, reason=reason)
+        print(f"   ✅ Di-promote → {path}"
+              + (f" (sebelumnya {current['run']})" if current.get('run') else ""))
+    print("="*50)
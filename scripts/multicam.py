@@ -0,0 +1,103 @@
+# ===============================================================
+# 🧠 SERVER DETEKSI PARKIR MULTI-KAMERA (BATCHED INFERENCE)
+# Satu model untuk semua kamera di configs/cameras.yaml
+# ===============================================================
+
+import sys                           # Untuk menambahkan root repo ke sys.path
+from pathlib import Path             # Untuk path yang cross-platform
+from flask import Flask, Response, abort, jsonify   # Web server & streaming
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+from src.backend.multicam import MultiCameraServer, load_camera_config  # noqa: E402
+from src.backend.inference import load_backend  # noqa: E402
+from src.backend.registry import resolve_model  # noqa: E402
+
+# ======================
+# ⚙️ KONFIGURASI
+# ======================
+CONFIG_PATH = ROOT_DIR / "configs" / "cameras.yaml"
+config = load_camera_config(CONFIG_PATH)
+
+# 'production' = model hasil scripts/model_registry.py (Model/production/best.pt)
+model_path = config['model']
+if model_path == 'production':
+    model_path = resolve_model()
+    if model_path is None:
+        raise FileNotFoundError("❌ Belum ada model produksi (jalankan scripts/model_registry.py)")
+if not Path(model_path).exists():
+    raise FileNotFoundError(f"❌ Model tidak ditemukan: {model_path}")
+
+# ======================
+# 🚀 LOAD MODEL + SERVER
+# ======================
+print("🔥 Loading model...")
+model = load_backend(model_path, backend=config.get('backend', 'auto'),
+                     imgsz=config.get('imgsz', 640), threads=config.get('threads'),
+                     device=config.get('device'))
+
+server = MultiCameraServer(
+    config['cameras'],
+    model,
+    conf=config.get('conf', 0.5),
+    imgsz=config.get('imgsz', 640),
+    device=config.get('device'),
+    max_batch=config.get('max_batch', 16),
+    max_wait=config.get('max_wait_ms', 50) / 1000,
+    jpeg_quality=config.get('jpeg_quality', 85),
+).start()
+print(f"✅ {len(server.feeds)} kamera terdaftar\n")
+
+app = Flask(__name__)
+
+# ======================
+# 🌍 ROUTE FLASK
+# ======================
+@app.route('/')
+def index():
+    # Grid sederhana: satu stream per kamera
+    tiles = "".join(
+        f'<div class="tile"><h3>{name}</h3><img src="/video/{name}"></div>'
+        for name in server.feeds
+    )
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Parking Detection - Multi Camera</title>
+        <style>
+            body {{ background: #0f0f0f; color: #fff; font-family: 'Segoe UI', sans-serif; }}
+            h1 {{ color: #00ff88; text-align: center; }}
+            .grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(320px, 1fr)); gap: 15px; }}
+            .tile {{ border: 1px solid #00ff88; border-radius: 10px; overflow: hidden; }}
+            .tile h3 {{ margin: 0; padding: 8px; background: rgba(0, 255, 136, 0.1); }}
+            img {{ width: 100%; display: block; }}
+        </style>
+    </head>
+    <body>
+        <h1>🚗 Parking Detection - {len(server.feeds)} Kamera</h1>
+        <div class="grid">{tiles}</div>
+    </body>
+    </html>
+    """
+
+@app.route('/video/<name>')
+def video(name):
+    if name not in server.feeds:
+        abort(404)
+    return Response(server.stream(name), mimetype='multipart/x-mixed-replace; boundary=frame')
+
+@app.route('/status')
+def status():
+    # Jumlah objek & FPS per kamera dalam JSON
+    return jsonify(server.status())
+
+# ======================
+# 🚀 MENJALANKAN SERVER FLASK
+# ======================
+if __name__ == '__main__':
+    print("="*50)
+    print("🌐 Multi-camera server: http://localhost:5000")
+    print("="*50 + "\n")
+    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
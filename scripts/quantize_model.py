@@ -0,0 +1,65 @@
+# =========================================================
+# 🧮 Quantization INT8 (post-training) untuk inference CPU
+# Kalibrasi memakai gambar val parking_lot_final, lalu bandingkan
+# mAP dan latency FP32 vs INT8 → quant_report.json
+# =========================================================
+
+import sys
+from pathlib import Path
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.backend.quantize import compare_report, quantize_int8, save_report  # noqa: E402
+from src.backend.registry import resolve_model                                # noqa: E402
+from src.core.train_plan import resolve_data_yaml                             # noqa: E402
+
+# ========== KONFIGURASI - SESUAIKAN PATH DI SINI ==========
+
+# Checkpoint: Model/production/best.pt jika sudah di-promote, selain itu hasil training lokal
+WEIGHTS = Path(resolve_model(ROOT_DIR / "Model" / "parking_detection2" / "weights" / "best.pt"))
+
+# Gambar kalibrasi + data val untuk mAP
+CALIB_DIRECTORY = ROOT_DIR / "Dataset" / "parking_lot_final" / "val" / "images"
+DATA_YAML = ROOT_DIR / "configs" / "data_final.yaml"
+
+IMGSZ = 640
+NUM_CALIB = 200            # Gambar kalibrasi (sampel seeded)
+CALIB_METHOD = "minmax"    # 'minmax', 'entropy', 'percentile'
+SEED = 0
+THREADS = None             # Thread CPU saat ukur latency (None = semua core)
+
+# Laporan perbandingan disimpan di samping weight
+REPORT_PATH = WEIGHTS.parent / "quant_report.json"
+
+# ===========================================================
+
+if __name__ == "__main__":
+    print("INT8 Post-Training Quantization")
+    print("="*50)
+
+    if not WEIGHTS.exists():
+        print(f"❌ Weight tidak ditemukan: {WEIGHTS}")
+        sys.exit(1)
+
+    fp32_path, int8_path = quantize_int8(WEIGHTS, CALIB_DIRECTORY, imgsz=IMGSZ,
+                                         num_calib=NUM_CALIB, seed=SEED, method=CALIB_METHOD)
+    print(f"✓ Model INT8: {int8_path}")
+
+    data_yaml = resolve_data_yaml(DATA_YAML)   # path dataset relatif → absolut lokal
+    report = compare_report(WEIGHTS, fp32_path, int8_path, data_yaml, CALIB_DIRECTORY,
+                            imgsz=IMGSZ, threads=THREADS, seed=SEED)
+    report['calibration'] = {'images': NUM_CALIB, 'method': CALIB_METHOD, 'seed': SEED}
+    save_report(report, REPORT_PATH)
+
+    print(f"\n{'':6}{'size MB':>9}{'mAP50':>9}{'mAP50-95':>10}{'mean ms':>9}{'p95 ms':>9}")
+    for label, m in report['models'].items():
+        print(f"{label:6}{m['size_mb']:>9.2f}{m['map50']:>9.4f}{m['map50_95']:>10.4f}"
+              f"{m['mean_ms']:>9.2f}{m['p95_ms']:>9.2f}")
+    delta = report['delta']
+    print(f"\nΔ mAP50 : {delta['map50']:+.4f}   Δ mAP50-95 : {delta['map50_95']:+.4f}")
+    print(f"Speedup : {delta['speedup']}x   Ukuran : {delta['size_ratio']}x")
+    print(f"\nLaporan : {REPORT_PATH}")
+    print("Pakai dengan backend: onnx_int8 di configs/inference.yaml")
+    print("="*50)
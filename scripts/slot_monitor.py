@@ -0,0 +1,100 @@
+# ===============================================================
+# 🅿️ MONITOR SLOT PARKIR (ROI TETAP)
+# Slot didaftarkan sekali per kamera (file JSON / kalibrasi deteksi),
+# lalu tiap frame cukup klasifikasi crop slot dalam satu batch kecil
+# ===============================================================
+
+import cv2
+import sys
+import time
+from pathlib import Path
+from ultralytics import YOLO
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+from src.utils.camera import CameraSource  # noqa: E402
+from src.backend.registry import resolve_model  # noqa: E402
+from src.core.slots import (   # noqa: E402
+    CROP_SIZE,
+    SlotClassifier,
+    SlotMap,
+    draw_slots,
+    occupancy_summary,
+)
+
+# ========== KONFIGURASI - SESUAIKAN PATH DI SINI ==========
+
+CAMERA_NAME = "lot_a"
+url = "http://192.168.1.11:4747/video"
+
+# Detector untuk kalibrasi (dan klasifikasi crop jika CLASSIFIER_PATH None):
+# Model/production/best.pt jika sudah di-promote, selain itu hasil training lokal
+DETECTOR_PATH = resolve_model(ROOT_DIR / "Model" / "parking_detection2" / "weights" / "best.pt")
+
+# Model YOLO classify (kelas terisi/kosong) — None = pakai ulang detector di crop
+CLASSIFIER_PATH = None
+
+# File poligon slot; dibuat otomatis dari kalibrasi jika belum ada
+SLOTS_FILE = ROOT_DIR / "configs" / "slots" / f"{CAMERA_NAME}.json"
+CALIBRATION_CONF = 0.5
+
+SHOW_WINDOW = True
+
+# ===========================================================
+
+
+def calibrate(camera, detector):
+    """Seed poligon slot dari satu frame deteksi penuh"""
+    print("🎯 Kalibrasi slot dari deteksi...")
+    frame = None
+    while frame is None:
+        _, frame = camera.read(timeout=1.0)
+    results = detector(frame, conf=CALIBRATION_CONF, verbose=False)
+    slots = SlotMap.from_detections(results[0], min_conf=CALIBRATION_CONF,
+                                    camera=CAMERA_NAME)
+    slots.save(SLOTS_FILE)
+    print(f"✓ {len(slots)} slot disimpan di {SLOTS_FILE}")
+    return slots
+
+
+if __name__ == "__main__":
+    detector = YOLO(DETECTOR_PATH)
+    camera = CameraSource(url, name=CAMERA_NAME).start()
+
+    slots = SlotMap.load(SLOTS_FILE) if SLOTS_FILE.exists() else calibrate(camera, detector)
+    model = YOLO(CLASSIFIER_PATH) if CLASSIFIER_PATH else detector
+    classifier = SlotClassifier(model, imgsz=CROP_SIZE)
+
+    print(f"🚀 Monitoring {len(slots)} slot — tekan ESC untuk keluar\n")
+    fps_time = time.time()
+    fps_counter = 0
+    seq = 0
+
+    while True:
+        seq, frame = camera.read(seq, timeout=1.0)
+        if frame is None:
+            # Kamera putus: window tetap diproses agar ESC bisa keluar
+            if SHOW_WINDOW and cv2.waitKey(1) & 0xFF == 27:
+                break
+            continue
+
+        # State kompak: uint8 per slot (0 = terisi, 1 = kosong, 255 = unknown)
+        state, _ = classifier.classify([(slots, frame)])[0]
+
+        fps_counter += 1
+        if time.time() - fps_time > 1:
+            fps = fps_counter / (time.time() - fps_time)
+            summary = occupancy_summary(state)
+            print(f"📊 FPS: {fps:.1f} | terisi {summary['terisi']} | "
+                  f"kosong {summary['kosong']} | unknown {summary['unknown']}")
+            fps_counter = 0
+            fps_time = time.time()
+
+        if SHOW_WINDOW:
+            cv2.imshow("Slot Monitor", draw_slots(frame, slots, state))
+            if cv2.waitKey(1) & 0xFF == 27:
+                break
+
+    camera.stop()
+    cv2.destroyAllWindows()
@@ -3,40 +3,80 @@
 # =====================================================
 from ultralytics import YOLO   # Import class YOLO dari library ultralytics (untuk deteksi & training)
 import torch                   # Library PyTorch, digunakan YOLO untuk komputasi GPU/CPU
+import platform                # Untuk cek OS (workaround khusus Windows)
+import sys                     # Untuk menambahkan root repo ke sys.path
+from pathlib import Path       # Untuk path yang cross-platform
+
+# Root repo → agar package `src` bisa di-import dari folder scripts/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+from src.core.online_augment import online_trainer  # noqa: E402
+from src.core.shards import sharded_trainer         # noqa: E402
+from src.core.train_plan import (                   # noqa: E402
+    ThroughputLogger, detect_hardware, load_train_config, plan_training)
+
+
+# =====================================================
+# ⚙️ KONFIGURASI
+# =====================================================
+# Semua pengaturan ada di configs/train.yaml. Nilai `auto` (device,
+# workers, batch, cache, amp) dipilih dari hardware yang terdeteksi:
+# GPU/CPU/RAM, jadi script yang sama jalan di laptop Windows, node
+# Linux multi-GPU, maupun runner CPU saja.
+CONFIG_PATH = ROOT_DIR / "configs" / "train.yaml"
 
 
 # =====================================================
 # 🚀 MAIN PROGRAM
 # =====================================================
 if __name__ == '__main__':     # Pastikan kode hanya berjalan jika file ini dijalankan langsung (bukan di-import)
-    
+
     # 🧩 Set multiprocessing method (khusus Windows)
-    # 'spawn' digunakan agar proses parallel PyTorch bisa berjalan tanpa error di OS Windows
-    torch.multiprocessing.set_start_method('spawn', force=True)
-    
+    # 'spawn' hanya dipaksa di Windows; Linux tetap memakai fork (worker start cepat)
+    if platform.system() == 'Windows':
+        torch.multiprocessing.set_start_method('spawn', force=True)
+
+    # =================================================
+    # 🖥️ DETEKSI HARDWARE + RENCANA TRAINING
+    # =================================================
+    config = load_train_config(CONFIG_PATH)
+    hardware = detect_hardware()
+    train_args, notes = plan_training(config, hardware)
+
+    gpus = ", ".join(f"{g['name']} ({g['memory_gb']} GB)" for g in hardware['gpus']) or "-"
+    print(f"🖥️ {hardware['os']} | {hardware['cpus']} core | RAM {hardware['memory_gb']} GB "
+          f"(tersedia {hardware['memory_available_gb']} GB) | GPU: {gpus}")
+    for key in ('device', 'workers', 'batch', 'cache', 'amp'):
+        print(f"   {key:<8}= {train_args[key]!r:<8} ({notes[key]})")
+
     # =================================================
     # 📂 LOAD MODEL
     # =================================================
-    model = YOLO('yolov8n.pt')   # Memuat model YOLOv8 versi nano (model pre-trained kecil & cepat)
-    
-    
+    model = YOLO(config.get('model', 'yolov8n.pt'))   # Default YOLOv8 nano (pre-trained kecil & cepat)
+    if config.get('throughput_log', True):
+        ThroughputLogger().attach(model)               # Log img/s tiap epoch → throughput.csv
+
     # =================================================
     # 🏋️‍♂️ TRAINING MODEL
     # =================================================
-    results = model.train(
-        data='D:\Quant_ML_Project\ML.py\EasyPark\configs\data.yaml',  # Path ke konfigurasi dataset (train/val)
-        epochs=100,            # Jumlah total iterasi training
-        imgsz=640,             # Ukuran gambar input yang akan digunakan YOLO
-        batch=8,               # Jumlah gambar per batch (semakin besar, semakin cepat tapi butuh RAM besar)
-        name='parking_detection',  # Nama folder hasil training di dalam runs/train/
-        patience=50,           # Early stopping: hentikan training jika tidak ada peningkatan 50 epoch
-        save=True,             # Simpan hasil model terbaik (.pt)
-        device=0,              # Gunakan GPU index ke-0 (atau 'cpu' kalau tidak punya GPU)
-        plots=True,            # Simpan grafik loss, mAP, precision, recall, dll.
-        workers=0              # Disable multiprocessing worker (mencegah bug di Windows)
-    )
-    
-    
+    # True  → augmentasi bayangan/gelap/noise dilakukan di memori tiap epoch
+    #         (tidak perlu jalankan Augmentasi.py)
+    # False → trainer default (mis. data: configs/data.yaml hasil Augmentasi.py)
+    # Trainer custom / callback → plan_training memakai 1 GPU (DDP membuangnya)
+    if config.get('online_aug', True):
+        trainer = online_trainer(p=config.get('online_aug_p', 0.75),
+                                 seed=config.get('online_aug_seed', 0))
+    else:
+        trainer = None         # Trainer default Ultralytics
+
+    # Shard hasil scripts/build_shards.py: gambar dibaca zero-copy dari memmap
+    if config.get('shard_dir'):
+        shard_dir = Path(config['shard_dir'])
+        trainer = sharded_trainer({'train': shard_dir / 'train', 'val': shard_dir / 'val'},
+                                  base=trainer)
+
+    results = model.train(trainer=trainer, **train_args)
+
     # =================================================
     # 📊 HASIL TRAINING
     # =================================================
@@ -0,0 +1,350 @@
+"""Server asyncio (aiohttp): MJPEG, SSE, dan WebSocket JSON deteksi dalam satu event loop"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from src.backend.events import KEEPALIVE_SECONDS, SUBSCRIBER_QUEUE, to_jsonl, to_sse
+from src.backend.pipeline import multipart_chunk
+from src.utils.metrics import CONTENT_TYPE
+
+
+# =========================================================
+# 🔹 Fan-out dengan backpressure
+# =========================================================
+class _Subscriber:
+    __slots__ = ('items', 'event', 'dropped')
+
+    def __init__(self, maxsize):
+        self.items = deque(maxlen=maxsize)
+        self.event = asyncio.Event()
+        self.dropped = 0
+
+
+class AsyncFanout:
+    """
+    Broadcast item ke banyak coroutine client tanpa saling menunggu.
+
+    Tiap client punya buffer sendiri sebesar `maxsize`; jika client lambat
+    (write ke socket belum selesai) dan buffer penuh, item paling lama
+    dibuang. maxsize=1 berarti latest-frame-wins (untuk video), nilai lebih
+    besar untuk event yang sebaiknya tidak hilang. publish() dan get()
+    hanya boleh dipanggil dari thread event loop.
+    """
+
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self._subscribers = set()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self):
+        sub = _Subscriber(self.maxsize)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        self._subscribers.discard(sub)
+
+    def publish(self, item):
+        self.published += 1
+        for sub in self._subscribers:
+            if len(sub.items) == self.maxsize:
+                sub.dropped += 1
+                self.dropped += 1
+            sub.items.append(item)
+            sub.event.set()
+
+    async def get(self, sub, timeout=None):
+        """Item berikutnya untuk `sub`; asyncio.TimeoutError jika tidak ada"""
+        while not sub.items:
+            sub.event.clear()
+            await asyncio.wait_for(sub.event.wait(), timeout)
+        return sub.items.popleft()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+
+def detections_message(camera, results, fps, tracker=None):
+    """JSON ringkas satu frame: box [x1, y1, x2, y2, kelas, conf] + jumlah slot"""
+    result = results[0]
+    boxes = result.boxes
+    rows = []
+    if boxes is not None and len(boxes):
+        xyxy = boxes.xyxy.cpu().numpy().round(1).tolist()
+        classes = boxes.cls.cpu().numpy().astype(int).tolist()
+        confs = boxes.conf.cpu().numpy().round(3).tolist()
+        rows = [[*box, c, s] for box, c, s in zip(xyxy, classes, confs)]
+    message = {
+        'type': 'detections',
+        'camera': camera,
+        't': round(time.time(), 3),
+        'fps': round(fps, 1),
+        'shape': list(result.orig_shape),
+        'names': result.names,
+        'boxes': rows,
+    }
+    if tracker is not None:
+        message['counts'] = tracker.counts()
+    return json.dumps(message, separators=(',', ':'))
+
+
+# =========================================================
+# 🔹 Server
+# =========================================================
+class AsyncStreamServer:
+    """
+    Pengganti mode Flask `threaded=True`: semua client dilayani satu
+    event loop, bukan satu thread OS per penonton.
+
+    Thread pipeline (inference/encode) tetap seperti biasa; beberapa
+    "pump" membaca slot latest-frame-wins di thread pool kecil (satu per
+    tier + satu untuk deteksi) lalu mem-broadcast ke client lewat
+    AsyncFanout. Client yang lambat hanya kehilangan frame, tidak
+    menahan client lain maupun pipeline; write yang macet lebih dari
+    `write_timeout` detik memutus client tersebut.
+
+    Route: / (dashboard), /video?tier=, /events (SSE / ?format=jsonl),
+    /ws (WebSocket JSON deteksi + event slot), /slots, /metrics.
+
+    Args:
+        pipeline: StreamPipeline yang sudah start()
+        tracker: SlotTracker (opsional, untuk /slots dan snapshot)
+        events: EventBus (opsional, untuk /events dan /ws)
+        metrics: Registry (opsional, untuk /metrics)
+        index_html: HTML dashboard
+        camera: Nama kamera di pesan JSON
+        write_timeout: Batas detik satu write ke client
+        ws_max_fps: Maksimum pesan deteksi per detik ke client WebSocket
+    """
+
+    def __init__(self, pipeline, tracker=None, events=None, metrics=None, index_html='',
+                 camera=None, write_timeout=5.0, ws_max_fps=10.0):
+        self.pipeline = pipeline
+        self.tracker = tracker
+        self.events = events
+        self.metrics = metrics
+        self.index_html = index_html
+        self.camera = camera or getattr(tracker, 'camera', None)
+        self.write_timeout = write_timeout
+        self.ws_interval = 1.0 / ws_max_fps if ws_max_fps else 0.0
+
+        self.video = {tier: AsyncFanout(maxsize=1) for tier in pipeline.tiers}
+        self.event_fanout = AsyncFanout(maxsize=SUBSCRIBER_QUEUE)
+        self.ws_fanout = AsyncFanout(maxsize=16)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.video) + 1,
+                                            thread_name_prefix='async-pump')
+        self._tasks = []
+        self._loop = None
+        self._closing = False
+
+        if metrics is not None:
+            self._register_metrics(metrics)
+
+    # -----------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/', self.handle_index)
+        app.router.add_get('/video', self.handle_video)
+        app.router.add_get('/events', self.handle_events)
+        app.router.add_get('/ws', self.handle_ws)
+        app.router.add_get('/slots', self.handle_slots)
+        app.router.add_get('/metrics', self.handle_metrics)
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    def run(self, host='0.0.0.0', port=5000):
+        web.run_app(self.app(), host=host, port=port, print=None)
+
+    async def _on_startup(self, app):
+        self._loop = asyncio.get_running_loop()
+        for tier, fanout in self.video.items():
+            self._tasks.append(asyncio.create_task(self._pump_video(tier, fanout)))
+        self._tasks.append(asyncio.create_task(self._pump_detections()))
+        if self.events is not None:
+            self.events.add_listener(self._on_event)
+
+    async def _on_cleanup(self, app):
+        self._closing = True
+        if self.events is not None:
+            self.events.remove_listener(self._on_event)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    # -----------------------------------------------------
+    # Pump: thread pipeline → event loop
+    # -----------------------------------------------------
+    async def _pump_video(self, tier, fanout):
+        slot = self.pipeline.jpegs[tier]
+        seq = 0
+        while not self._closing:
+            seq, frame_bytes = await self._loop.run_in_executor(self._executor, slot.get, seq, 1.0)
+            if frame_bytes is not None and len(fanout):
+                fanout.publish(multipart_chunk(frame_bytes))
+
+    def _next_detection(self, seq):
+        # Di thread pool: tunggu hasil baru + serialisasi JSON sekali untuk semua client
+        seq, item = self.pipeline.detections.get(seq, timeout=1.0)
+        if item is None or not len(self.ws_fanout):
+            return seq, None
+        return seq, detections_message(self.camera, item[1], self.pipeline.fps, self.tracker)
+
+    async def _pump_detections(self):
+        seq = 0
+        last = 0.0
+        while not self._closing:
+            seq, message = await self._loop.run_in_executor(self._executor, self._next_detection, seq)
+            now = time.monotonic()
+            if message is None or now - last < self.ws_interval:
+                continue
+            last = now
+            self.ws_fanout.publish(message)
+
+    def _on_event(self, event):
+        # Dipanggil di thread publisher EventBus
+        if self._loop is not None and not self._closing:
+            self._loop.call_soon_threadsafe(self._publish_event, event)
+
+    def _publish_event(self, event):
+        self.event_fanout.publish(event)
+        if len(self.ws_fanout):
+            self.ws_fanout.publish(json.dumps({'type': 'event', **event}, separators=(',', ':')))
+
+    def _snapshot(self):
+        if self.tracker is None:
+            return []
+        return [{'camera': self.tracker.camera, 'slot': slot, 'from': None, 'to': state}
+                for slot, state in self.tracker.snapshot().items()]
+
+    # -----------------------------------------------------
+    # Handler
+    # -----------------------------------------------------
+    async def _write(self, response, data):
+        await asyncio.wait_for(response.write(data), self.write_timeout)
+
+    async def handle_index(self, request):
+        return web.Response(text=self.index_html, content_type='text/html')
+
+    async def handle_video(self, request):
+        tier = request.query.get('tier', 'full')
+        if tier not in self.video:
+            return web.json_response(
+                {'error': f"tier harus salah satu dari {list(self.video)}"}, status=400)
+
+        response = web.StreamResponse(headers={
+            'Content-Type': 'multipart/x-mixed-replace; boundary=frame',
+            'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+        fanout = self.video[tier]
+        sub = fanout.subscribe()
+        slot = self.pipeline.acquire(tier)
+        try:
+            _, frame_bytes = slot.peek()     # Langsung kirim frame terbaru
+            if frame_bytes is not None:
+                await self._write(response, multipart_chunk(frame_bytes))
+            while not self._closing:
+                try:
+                    chunk = await fanout.get(sub, timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    continue
+                await self._write(response, chunk)
+        except (ConnectionResetError, asyncio.TimeoutError):
+            pass                             # Client putus / terlalu lambat
+        finally:
+            fanout.unsubscribe(sub)
+            self.pipeline.release(tier)
+        return response
+
+    async def handle_events(self, request):
+        if self.events is None:
+            raise web.HTTPNotFound()
+        fmt = request.query.get('format', 'sse')
+        encode = to_sse if fmt == 'sse' else to_jsonl
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream' if fmt == 'sse' else 'application/x-ndjson',
+            'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+        sub = self.event_fanout.subscribe()
+        try:
+            for event in self._snapshot():
+                await self._write(response, encode(event).encode())
+            while not self._closing:
+                try:
+                    data = encode(await self.event_fanout.get(sub, timeout=KEEPALIVE_SECONDS))
+                except asyncio.TimeoutError:
+                    data = ': keepalive\n\n' if fmt == 'sse' else '\n'
+                await self._write(response, data.encode())
+        except (ConnectionResetError, asyncio.TimeoutError):
+            pass
+        finally:
+            self.event_fanout.unsubscribe(sub)
+        return response
+
+    async def handle_ws(self, request):
+        """WebSocket: JSON deteksi (≤ ws_max_fps) + event slot, tanpa piksel"""
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        sub = self.ws_fanout.subscribe()
+
+        async def sender():
+            if self.tracker is not None:
+                await ws.send_str(json.dumps({'type': 'snapshot', 'camera': self.camera,
+                                              'slots': self.tracker.snapshot(),
+                                              'counts': self.tracker.counts()}))
+            try:
+                while not ws.closed:
+                    try:
+                        message = await self.ws_fanout.get(sub, timeout=KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        continue
+                    await asyncio.wait_for(ws.send_str(message), self.write_timeout)
+            except (ConnectionResetError, asyncio.TimeoutError):
+                await ws.close()             # Client macet → putuskan
+
+        task = asyncio.create_task(sender())
+        try:
+            async for _ in ws:               # Baca ping/close dari client
+                pass
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            self.ws_fanout.unsubscribe(sub)
+        return ws
+
+    async def handle_slots(self, request):
+        if self.tracker is None:
+            raise web.HTTPNotFound()
+        return web.json_response({'slots': self.tracker.snapshot(), 'counts': self.tracker.counts()})
+
+    async def handle_metrics(self, request):
+        if self.metrics is None:
+            raise web.HTTPNotFound()
+        return web.Response(body=self.metrics.render().encode(),
+                            headers={'Content-Type': CONTENT_TYPE})
+
+    # -----------------------------------------------------
+    # Metrik
+    # -----------------------------------------------------
+    def _register_metrics(self, registry):
+        labels = {'camera': self.camera} if self.camera else {}
+        registry.gauge('ws_clients', 'Client WebSocket /ws yang terhubung',
+                       lambda: len(self.ws_fanout), labels)
+        registry.gauge('event_stream_clients', 'Client /events (async) yang terhubung',
+                       lambda: len(self.event_fanout), labels)
+        for tier, fanout in self.video.items():
+            registry.counter('client_frames_dropped_total',
+                             'Frame dibuang karena client lambat (backpressure)',
+                             lambda fanout=fanout: fanout.dropped, {**labels, 'stream': f'video_{tier}'})
+        registry.counter('client_frames_dropped_total',
+                         'Frame dibuang karena client lambat (backpressure)',
+                         lambda: self.ws_fanout.dropped, {**labels, 'stream': 'ws'})
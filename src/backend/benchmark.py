@@ -0,0 +1,230 @@
+"""Benchmark offline: sweep backend/imgsz/batch/thread/conf, latency per tahap → JSON"""
+
+import itertools
+import json
+import os
+import platform
+import random
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.backend.inference import DEFAULT_CACHE_DIR, ExportedBackend, load_backend
+
+STAGES = ('decode', 'preprocess', 'inference', 'nms', 'plot', 'encode')
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+
+
+# =========================================================
+# 🔹 Input: byte JPEG dari folder gambar atau file video
+# =========================================================
+def load_frames(source, n=200, seed=0, jpeg_quality=90):
+    """
+    Kumpulkan n frame sebagai byte terkompresi, agar tahap decode ikut terukur.
+
+    Args:
+        source: Folder gambar (mis. Dataset/parking_lot_final/val/images)
+                atau file video rekaman
+        n: Jumlah frame maksimum
+        seed: Seed sampling gambar (hasil sama tiap run)
+    """
+    source = Path(source)
+    if source.is_dir():
+        paths = sorted(p for p in source.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        random.Random(seed).shuffle(paths)
+        return [p.read_bytes() for p in paths[:n]]
+
+    cap = cv2.VideoCapture(str(source))
+    frames = []
+    while len(frames) < n:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+        if ok:
+            frames.append(buf.tobytes())
+    cap.release()
+    return frames
+
+
+# =========================================================
+# 🔹 Statistik
+# =========================================================
+def summarize(times_ms, images):
+    """p50/p95/p99/mean (ms per panggilan) + throughput (gambar/detik)"""
+    t = np.asarray(times_ms, np.float64)
+    if t.size == 0:
+        return None
+    total = t.sum() / 1000
+    return {
+        'p50_ms': round(float(np.percentile(t, 50)), 3),
+        'p95_ms': round(float(np.percentile(t, 95)), 3),
+        'p99_ms': round(float(np.percentile(t, 99)), 3),
+        'mean_ms': round(float(t.mean()), 3),
+        'throughput': round(images / total, 2) if total > 0 else None,
+    }
+
+
+def environment():
+    """Info mesin + versi library, disimpan bersama hasil"""
+    import ultralytics
+
+    info = {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'ultralytics': ultralytics.__version__,
+    }
+    for module in ('torch', 'onnxruntime', 'openvino'):
+        try:
+            info[module] = __import__(module).__version__
+        except ImportError:
+            pass
+    return info
+
+
+# =========================================================
+# 🔹 Satu kasus (backend sudah di-load)
+# =========================================================
+def _timed(stage, times, fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    times[stage].append((time.perf_counter() - start) * 1000)
+    return out
+
+
+def run_case(model, frames, batch=1, conf=0.25, iou=0.7, warmup=3, jpeg_quality=85):
+    """
+    Jalankan semua frame lewat pipeline lengkap dengan timer per tahap.
+
+    Backend export (ONNX/OpenVINO) dipecah preprocess → inference → NMS.
+    Backend PyTorch memakai `Results.speed` Ultralytics untuk tiga tahap itu.
+    Semua angka ms per panggilan (satu batch). Jika frame kurang dari satu
+    batch, tidak ada yang diukur: 'images' = 0 dan statistik None.
+    """
+    exported = isinstance(model, ExportedBackend)
+    encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+    batches = [frames[i:i + batch] for i in range(0, len(frames) - batch + 1, batch)]
+
+    def infer(images):
+        if exported:
+            blob = _timed('preprocess', times, model.preprocess, images)
+            pred = _timed('inference', times, model._run, blob)
+            return _timed('nms', times, model.postprocess, pred, images, conf, iou)
+        results = model.predict(images, conf=conf, iou=iou)
+        speed = results[0].speed
+        times['preprocess'].append(speed['preprocess'] * len(images))
+        times['inference'].append(speed['inference'] * len(images))
+        times['nms'].append(speed['postprocess'] * len(images))
+        return results
+
+    def decode(chunk):
+        return [cv2.imdecode(np.frombuffer(b, np.uint8), cv2.IMREAD_COLOR) for b in chunk]
+
+    def annotate(results):
+        return [r.plot() for r in results]
+
+    def encode(plotted):
+        return [cv2.imencode('.jpg', im, encode_params)[1] for im in plotted]
+
+    times = {stage: [] for stage in STAGES}
+    for chunk in batches[:warmup]:
+        infer(decode(chunk))
+    times = {stage: [] for stage in STAGES}
+    times['total'] = []
+    detections = 0
+
+    for chunk in batches:
+        start = time.perf_counter()
+        images = _timed('decode', times, decode, chunk)
+        results = infer(images)
+        plotted = _timed('plot', times, annotate, results)
+        _timed('encode', times, encode, plotted)
+        detections += sum(len(r.boxes) for r in results)
+        times['total'].append((time.perf_counter() - start) * 1000)
+
+    images = len(batches) * batch
+    return {
+        'images': images,
+        'detections_per_image': round(detections / max(images, 1), 2),
+        'stages': {stage: summarize(times[stage], images) for stage in STAGES},
+        'total': summarize(times['total'], images),
+    }
+
+
+# =========================================================
+# 🔹 Sweep
+# =========================================================
+def sweep(weights, frames, backends=('onnx',), imgsz=(640,), batch=(1,), threads=(None,),
+          conf=(0.25,), device='cpu', warmup=3, cache_dir=DEFAULT_CACHE_DIR, log=print):
+    """
+    Produk kartesius semua parameter. Backend di-load sekali per
+    (backend, imgsz, threads); batch dan conf diulang di backend yang sama.
+
+    Returns:
+        list hasil per kasus (dict params + stages + total)
+    """
+    cases = []
+    for name, size, n_threads in itertools.product(backends, imgsz, threads):
+        try:
+            model = load_backend(weights, backend=name, imgsz=size, threads=n_threads,
+                                 device=device, cache_dir=cache_dir, warmup=0)
+        except (ImportError, FileNotFoundError) as e:
+            log(f"⚠ Lewati backend {name} (imgsz {size}): {e}")
+            continue
+        for b, c in itertools.product(batch, conf):
+            params = {'backend': model.name, 'imgsz': size, 'batch': b,
+                      'threads': n_threads, 'conf': c}
+            if len(frames) < b:
+                log(f"⚠ Lewati {model.name} batch={b}: hanya {len(frames)} frame")
+                continue
+            result = run_case(model, frames, batch=b, conf=c, warmup=warmup)
+            cases.append({'params': params, **result})
+            total = result['total']
+            log(f"{model.name:10} imgsz={size:<5} batch={b:<3} threads={n_threads or 'all':<4} "
+                f"conf={c:<5} → {total['throughput'] or 0:>7.1f} img/s  p95 {total['p95_ms']:.1f} ms")
+    return cases
+
+
+def build_report(cases, source, num_frames):
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'source': str(source),
+        'frames': num_frames,
+        'environment': environment(),
+        'cases': cases,
+    }
+
+
+def save_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def compare_reports(baseline, current, tolerance=0.10):
+    """
+    Bandingkan throughput total dua laporan (kasus dengan params yang sama).
+
+    Returns:
+        list (params, throughput lama, throughput baru, rasio) untuk kasus
+        yang turun lebih dari `tolerance`
+    """
+    def key(case):
+        return tuple(sorted(case['params'].items(), key=lambda kv: kv[0]))
+
+    old = {key(c): c['total']['throughput'] for c in baseline['cases']}
+    regressions = []
+    for case in current['cases']:
+        before = old.get(key(case))
+        after = case['total']['throughput']
+        if before and after and after < before * (1 - tolerance):
+            regressions.append((case['params'], before, after, round(after / before, 3)))
+    return regressions
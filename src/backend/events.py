@@ -0,0 +1,92 @@
+"""Bus event perubahan slot → JSON-lines (file) dan Server-Sent Events (HTTP)"""
+
+import json
+import queue
+import threading
+
+SUBSCRIBER_QUEUE = 256      # Event tertahan per client sebelum yang lama dibuang
+KEEPALIVE_SECONDS = 15      # Komentar SSE agar koneksi idle tidak diputus proxy
+
+
+def to_jsonl(event):
+    return json.dumps(event, separators=(',', ':')) + '\n'
+
+
+def to_sse(event):
+    return f"data: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+class EventBus:
+    """
+    Fan-out event ke banyak subscriber tanpa saling memblok.
+
+    Tiap subscriber punya queue sendiri; jika client lambat dan queue
+    penuh, event paling lama dibuang (client tetap dapat yang terbaru).
+    Opsional: semua event juga di-append ke file JSON-lines.
+    """
+
+    def __init__(self, log_path=None):
+        self._subscribers = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._log = open(log_path, 'a', encoding='utf-8') if log_path else None
+        self.published = 0
+
+    def publish(self, event):
+        if self._log is not None:
+            self._log.write(to_jsonl(event))
+            self._log.flush()
+        with self._lock:
+            self.published += 1
+            for listener in self._listeners:
+                listener(event)
+            for q in self._subscribers:
+                if q.full():
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+                q.put_nowait(event)
+
+    def add_listener(self, callback):
+        """Callback `callback(event)` di thread publisher (harus cepat, tidak blok)"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def subscribe(self, fmt='sse', snapshot=None):
+        """
+        Generator string untuk satu client HTTP.
+
+        Args:
+            fmt: 'sse' (text/event-stream) atau 'jsonl'
+            snapshot: Event awal (mis. status semua slot) dikirim lebih dulu
+        """
+        encode = to_sse if fmt == 'sse' else to_jsonl
+        q = queue.Queue(maxsize=SUBSCRIBER_QUEUE)
+        with self._lock:
+            self._subscribers.add(q)
+        try:
+            for event in snapshot or ():
+                yield encode(event)
+            while True:
+                try:
+                    yield encode(q.get(timeout=KEEPALIVE_SECONDS))
+                except queue.Empty:
+                    yield ': keepalive\n\n' if fmt == 'sse' else '\n'
+        finally:
+            with self._lock:
+                self._subscribers.discard(q)
+
+    @property
+    def subscribers(self):
+        return len(self._subscribers)
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,278 @@
+"""Backend inference: PyTorch (Ultralytics), ONNX Runtime CPU, OpenVINO (opsional)"""
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from src.utils.fileops import file_digest
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = ROOT_DIR / "Model" / ".export_cache"
+BACKENDS = ('auto', 'pytorch', 'onnx', 'onnx_int8', 'openvino')
+
+
+def default_threads():
+    """Jumlah core yang boleh dipakai proses ini"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def load_inference_config(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+# =========================================================
+# 🔹 Export + cache (key = hash weight)
+# =========================================================
+def export_cached(weights, fmt, imgsz=640, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Export model sekali lalu simpan di cache_dir/<sha256 weight>/.
+
+    Weight yang berubah (training ulang) otomatis dapat key baru, jadi
+    export lama tidak pernah dipakai untuk weight yang salah.
+
+    Returns:
+        Path file .onnx atau folder *_openvino_model
+    """
+    weights = Path(weights)
+    digest = file_digest(weights)[:16]
+    suffix = '.onnx' if fmt == 'onnx' else '_openvino_model'
+    target = Path(cache_dir) / digest / f"{weights.stem}_{imgsz}{suffix}"
+    if target.exists():
+        return target
+
+    from ultralytics import YOLO
+
+    print(f"📦 Export {weights.name} → {fmt} (imgsz {imgsz}), sekali saja...")
+    exported = Path(YOLO(str(weights)).export(format=fmt, imgsz=imgsz, dynamic=True))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(exported), str(target))
+    return target
+
+
+def int8_path(weights, imgsz=640, cache_dir=DEFAULT_CACHE_DIR):
+    """Lokasi model INT8 (dibuat oleh scripts/quantize_model.py) di cache export"""
+    weights = Path(weights)
+    digest = file_digest(weights)[:16]
+    return Path(cache_dir) / digest / f"{weights.stem}_{imgsz}_int8.onnx"
+
+
+# =========================================================
+# 🔹 Backend
+# =========================================================
+_torch_default_threads = None   # torch.get_num_threads() sebelum diubah backend mana pun
+
+
+class PyTorchBackend:
+    """YOLO Ultralytics biasa; CUDA jika tersedia, selain itu CPU"""
+
+    name = 'pytorch'
+
+    def __init__(self, weights, device=None, imgsz=640, threads=None):
+        import torch
+        from ultralytics import YOLO
+
+        global _torch_default_threads
+        if _torch_default_threads is None:
+            _torch_default_threads = torch.get_num_threads()
+
+        if device is None:
+            device = 0 if torch.cuda.is_available() else 'cpu'
+        if device == 'cpu':
+            # Setting thread torch berlaku per proses → None kembalikan ke default
+            # (backend sebelumnya di proses yang sama bisa saja membatasinya)
+            torch.set_num_threads(threads or _torch_default_threads)
+        self.device = device
+        self.imgsz = imgsz
+        self.model = YOLO(str(weights))
+        self.names = self.model.names
+
+    def predict(self, source, conf=0.25, iou=0.7, imgsz=None, device=None, verbose=False, **kwargs):
+        return self.model.predict(source, conf=conf, iou=iou, imgsz=imgsz or self.imgsz,
+                                  device=self.device if device is None else device,
+                                  verbose=verbose, **kwargs)
+
+    def __call__(self, source, **kwargs):
+        return self.predict(source, **kwargs)
+
+
+class ExportedBackend:
+    """
+    Dasar backend model hasil export: letterbox → run → NMS → Results.
+
+    Output berupa `ultralytics.engine.results.Results`, jadi plot(),
+    boxes, dll. sama persis dengan backend PyTorch.
+    """
+
+    name = 'exported'
+
+    def __init__(self, names, imgsz=640):
+        from ultralytics.data.augment import LetterBox
+
+        self.names = names
+        self.imgsz = imgsz
+        self._letterbox = LetterBox(new_shape=(imgsz, imgsz), auto=False)
+
+    def _run(self, blob):
+        raise NotImplementedError
+
+    def preprocess(self, images):
+        """List BGR uint8 → blob float32 (N, 3, S, S) RGB 0-1"""
+        batch = np.stack([self._letterbox(image=im) for im in images])
+        blob = batch[..., ::-1].transpose(0, 3, 1, 2)
+        return np.ascontiguousarray(blob, dtype=np.float32) / 255.0
+
+    def postprocess(self, pred, images, conf, iou, max_det=300):
+        import torch
+        from ultralytics.engine.results import Results
+        from ultralytics.utils import ops
+
+        dets = ops.non_max_suppression(torch.from_numpy(pred), conf, iou, max_det=max_det)
+        results = []
+        for det, im in zip(dets, images):
+            det[:, :4] = ops.scale_boxes((self.imgsz, self.imgsz), det[:, :4], im.shape)
+            results.append(Results(im, path='', names=self.names, boxes=det))
+        return results
+
+    def predict(self, source, conf=0.25, iou=0.7, max_det=300, verbose=False, **kwargs):
+        images = source if isinstance(source, (list, tuple)) else [source]
+        pred = self._run(self.preprocess(images))
+        return self.postprocess(pred, images, conf, iou, max_det)
+
+    def __call__(self, source, **kwargs):
+        return self.predict(source, **kwargs)
+
+
+class OnnxRuntimeBackend(ExportedBackend):
+    """ONNX Runtime CPU dengan jumlah thread yang diatur"""
+
+    name = 'onnx'
+
+    def __init__(self, path, names, imgsz=640, threads=None):
+        import onnxruntime as ort
+
+        super().__init__(names, imgsz)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads or default_threads()
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(path), options,
+                                            providers=['CPUExecutionProvider'])
+        self._input = self.session.get_inputs()[0].name
+
+    def _run(self, blob):
+        return self.session.run(None, {self._input: blob})[0]
+
+
+class OpenVinoBackend(ExportedBackend):
+    """OpenVINO CPU (opsional, butuh paket openvino)"""
+
+    name = 'openvino'
+
+    def __init__(self, path, names, imgsz=640, threads=None):
+        import openvino as ov
+
+        super().__init__(names, imgsz)
+        core = ov.Core()
+        xml = next(Path(path).glob('*.xml'))
+        config = {'INFERENCE_NUM_THREADS': threads or default_threads(),
+                  'PERFORMANCE_HINT': 'LATENCY'}
+        self.model = core.compile_model(core.read_model(xml), 'CPU', config)
+
+    def _run(self, blob):
+        return self.model(blob)[0]
+
+
+# =========================================================
+# 🔹 Factory
+# =========================================================
+def _cuda_available():
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+
+def _load_exported(weights, backend, imgsz, threads, cache_dir):
+    """Backend 'onnx', 'onnx_int8' atau 'openvino' (export di-cache)"""
+    from ultralytics import YOLO
+
+    names = YOLO(str(weights)).names
+    if backend == 'onnx_int8':
+        path = int8_path(weights, imgsz, cache_dir)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"❌ Model INT8 belum ada: {path} (jalankan scripts/quantize_model.py)")
+        model = OnnxRuntimeBackend(path, names, imgsz=imgsz, threads=threads)
+        model.name = 'onnx_int8'
+        return model
+    path = export_cached(weights, backend, imgsz, cache_dir)
+    cls = OnnxRuntimeBackend if backend == 'onnx' else OpenVinoBackend
+    return cls(path, names, imgsz=imgsz, threads=threads)
+
+
+def load_backend(weights, backend='auto', imgsz=640, threads=None, device=None,
+                 cache_dir=DEFAULT_CACHE_DIR, warmup=2):
+    """
+    Buat backend inference sesuai config.
+
+    Args:
+        weights: Path .pt hasil training
+        backend: 'auto' (CUDA → pytorch, CPU → onnx, fallback pytorch jika
+                 onnxruntime tidak ada / export gagal), 'pytorch', 'onnx',
+                 'onnx_int8' (hasil quantize_model.py), 'openvino'
+                 (backend eksplisit tidak pernah fallback)
+        imgsz: Ukuran input (export dibuat untuk ukuran ini)
+        threads: Thread CPU (None = semua core yang tersedia)
+        device: Device PyTorch (None = otomatis)
+        cache_dir: Folder cache hasil export
+        warmup: Jumlah inference dummy setelah load
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend harus salah satu dari {BACKENDS}, bukan {backend!r}")
+    if backend == 'auto':
+        if device not in ('cpu',) and _cuda_available():
+            model = PyTorchBackend(weights, device=device, imgsz=imgsz, threads=threads)
+        else:
+            # CPU → coba ONNX; tanpa onnxruntime / export gagal → PyTorch CPU
+            try:
+                import onnxruntime  # noqa: F401  (cek dulu sebelum export)
+                model = _load_exported(weights, 'onnx', imgsz, threads, cache_dir)
+            except Exception as e:
+                print(f"⚠ Backend onnx tidak bisa dipakai ({type(e).__name__}: {e}), "
+                      f"fallback ke pytorch")
+                model = PyTorchBackend(weights, device=device, imgsz=imgsz, threads=threads)
+    elif backend == 'pytorch':
+        model = PyTorchBackend(weights, device=device, imgsz=imgsz, threads=threads)
+    else:
+        model = _load_exported(weights, backend, imgsz, threads, cache_dir)
+
+    if warmup:
+        dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        for _ in range(warmup):
+            model(dummy, verbose=False)
+        print(f"✓ Backend {model.name} siap (warmup {warmup}x, "
+              f"{(time.perf_counter() - start) / warmup * 1000:.1f} ms/frame)")
+    return model
+
+
+def backend_from_config(config):
+    """load_backend() dari dict config (configs/inference.yaml)"""
+    return load_backend(
+        config['weights'],
+        backend=config.get('backend', 'auto'),
+        imgsz=config.get('imgsz', 640),
+        threads=config.get('threads') or None,
+        device=config.get('device'),
+        cache_dir=config.get('cache_dir') or DEFAULT_CACHE_DIR,
+        warmup=config.get('warmup', 2),
+    )
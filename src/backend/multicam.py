@@ -0,0 +1,222 @@
+"""Server multi-kamera: frame terbaru tiap kamera → satu batch predict → per kamera"""
+
+import threading
+import time
+
+import yaml
+
+from src.backend.pipeline import LatestSlot, multipart_chunk
+from src.backend.render import FrameRenderer, JpegEncoder, info_lines
+from src.utils.camera import CameraSource
+
+
+def load_camera_config(path):
+    """Baca configs/cameras.yaml → dict (model, device, cameras, ...)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    cameras = config.get('cameras') or []
+    names = [cam['name'] for cam in cameras]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Nama kamera harus unik: {names}")
+    return config
+
+
+class CameraFeed:
+    """State satu kamera: slot frame mentah, hasil deteksi, dan JPEG"""
+
+    def __init__(self, name, url, conf=None, on_frame=None):
+        self.name = name
+        self.url = url
+        self.conf = conf
+        self.source = CameraSource(url, name=name, on_frame=on_frame)
+        self.results = LatestSlot()      # (frame, result) terbaru
+        self.jpegs = LatestSlot()        # JPEG teranotasi terbaru
+        self.fps = 0.0
+        self.clients = 0
+        self._taken_seq = 0              # seq frame terakhir yang masuk batch
+        self._fps_count = 0
+        self._fps_time = time.time()
+
+    def tick(self):
+        """Hitung FPS inference kamera ini (update tiap 1 detik)"""
+        self._fps_count += 1
+        now = time.time()
+        if now - self._fps_time >= 1:
+            self.fps = self._fps_count / (now - self._fps_time)
+            self._fps_count = 0
+            self._fps_time = now
+
+
+class MultiCameraServer:
+    """
+    Satu model untuk banyak kamera.
+
+    Tiap kamera punya thread capture sendiri. Thread batch mengumpulkan
+    frame terbaru dari kamera yang punya frame baru, menunggu paling lama
+    `max_wait` detik sejak frame pertama masuk, lalu menjalankan satu
+    `model.predict` untuk semua frame dan mengembalikan hasil per kamera.
+
+    Args:
+        cameras: List dict {'name', 'url', 'conf' (opsional)}
+        model: Model YOLO (ultralytics)
+        conf: Threshold default
+        imgsz: Ukuran input model
+        device: 0 / 'cuda' / 'cpu' / None (otomatis)
+        max_batch: Batas jumlah frame per predict
+        max_wait: Deadline batching dalam detik
+        jpeg_quality: Kualitas JPEG stream
+    """
+
+    def __init__(self, cameras, model, conf=0.5, imgsz=640, device=None,
+                 max_batch=16, max_wait=0.05, jpeg_quality=85):
+        self._new_frame = threading.Event()
+        self.feeds = {cam['name']: CameraFeed(cam['name'], cam['url'], cam.get('conf'),
+                                              on_frame=self._new_frame.set)
+                      for cam in cameras}
+        if not self.feeds:
+            raise ValueError("Minimal satu kamera harus dikonfigurasi")
+        self.model = model
+        self.conf = conf
+        self.imgsz = imgsz
+        self.device = device
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.jpeg_quality = jpeg_quality
+
+        self.batches = 0
+        self.batched_frames = 0
+        self._rr = 0
+        self._clients_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads = []
+
+    # -----------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------
+    def start(self):
+        jobs = [(self._batch_loop, ())]
+        for feed in self.feeds.values():
+            feed.source.start()
+            jobs.append((self._encode_loop, (feed,)))
+        for target, args in jobs:
+            t = threading.Thread(target=target, args=args, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._new_frame.set()
+        for feed in self.feeds.values():
+            feed.source.stop()
+            for slot in (feed.results, feed.jpegs):
+                slot.close()
+        for t in self._threads:
+            t.join(timeout=2)
+
+    # -----------------------------------------------------
+    # Stage
+    # -----------------------------------------------------
+    def _collect(self):
+        """Ambil frame baru dari semua kamera sampai batch penuh atau deadline"""
+        batch = {}
+        deadline = None
+        # Round-robin urutan kamera agar kamera di akhir list tidak kelaparan
+        feeds = list(self.feeds.values())
+        self._rr = (self._rr + 1) % len(feeds)
+        feeds = feeds[self._rr:] + feeds[:self._rr]
+        while not self._stopped.is_set():
+            self._new_frame.clear()
+            for feed in feeds:
+                if feed.name in batch or len(batch) >= self.max_batch:
+                    continue
+                if feed.source.seq > feed._taken_seq:
+                    seq, frame = feed.source.read(feed._taken_seq, timeout=0)
+                    if frame is not None:
+                        feed._taken_seq = seq
+                        batch[feed.name] = frame
+
+            if len(batch) >= min(len(self.feeds), self.max_batch):
+                break
+            now = time.perf_counter()
+            if batch and deadline is None:
+                deadline = now + self.max_wait
+            if deadline is not None and now >= deadline:
+                break
+            timeout = 0.5 if deadline is None else deadline - now
+            self._new_frame.wait(timeout)
+        return batch
+
+    def _predict(self, frames, conf):
+        return self.model.predict(frames, conf=conf, imgsz=self.imgsz,
+                                  device=self.device, verbose=False)
+
+    def _batch_loop(self):
+        while not self._stopped.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            # Kelompokkan per threshold (biasanya semua kamera pakai default)
+            groups = {}
+            for name in batch:
+                conf = self.feeds[name].conf or self.conf
+                groups.setdefault(conf, []).append(name)
+
+            for conf, names in groups.items():
+                results = self._predict([batch[name] for name in names], conf)
+                for name, result in zip(names, results):
+                    feed = self.feeds[name]
+                    feed.results.put((batch[name], result))
+                    feed.tick()
+
+            self.batches += 1
+            self.batched_frames += len(batch)
+
+    def _encode_loop(self, feed):
+        # Buffer render milik thread ini; encoder libjpeg-turbo jika terpasang
+        renderer = FrameRenderer()
+        encoder = JpegEncoder()
+        seq = 0
+        while not self._stopped.is_set():
+            seq, item = feed.results.get(seq, timeout=1.0)
+            # Encode hanya jika ada yang menonton kamera ini
+            if item is None or feed.clients == 0:
+                continue
+            result = item[1]
+            annotated = renderer.render(result, info_lines(feed.fps, len(result.boxes)))
+            frame_bytes = encoder.encode(annotated, self.jpeg_quality)
+            if frame_bytes is not None:
+                feed.jpegs.put(frame_bytes)
+
+    # -----------------------------------------------------
+    # Client
+    # -----------------------------------------------------
+    def stream(self, name):
+        """Generator MJPEG untuk satu kamera"""
+        feed = self.feeds[name]
+        with self._clients_lock:
+            feed.clients += 1
+        try:
+            seq = max(feed.jpegs.seq - 1, 0)
+            while not self._stopped.is_set():
+                seq, frame_bytes = feed.jpegs.get(seq, timeout=1.0)
+                if frame_bytes is not None:
+                    yield multipart_chunk(frame_bytes)
+        finally:
+            with self._clients_lock:
+                feed.clients -= 1
+
+    def status(self):
+        """Ringkasan per kamera (jumlah objek terakhir, FPS) + ukuran batch rata-rata"""
+        cameras = {}
+        for name, feed in self.feeds.items():
+            _, item = feed.results.peek()
+            cameras[name] = {
+                'fps': round(feed.fps, 1),
+                'objects': len(item[1].boxes) if item else 0,
+                'clients': feed.clients,
+                'source': feed.source.stats(),
+            }
+        avg_batch = self.batched_frames / self.batches if self.batches else 0.0
+        return {'cameras': cameras, 'batches': self.batches, 'avg_batch': round(avg_batch, 2)}
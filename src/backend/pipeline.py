@@ -0,0 +1,288 @@
+"""Pipeline streaming: capture → inference → encode, broadcast ke semua client"""
+
+import copy
+import threading
+import time
+
+from src.backend.render import FrameRenderer, TierEncoder, info_lines
+from src.utils.metrics import Histogram
+
+MULTIPART_BOUNDARY = b'--frame\r\n'
+
+
+def with_frame(results, frame):
+    """Pakai ulang hasil deteksi lama di atas frame baru (copy dangkal)"""
+    result = copy.copy(results[0])
+    result.orig_img = frame
+    return [result]
+
+
+def multipart_chunk(frame_bytes):
+    """Bungkus satu JPEG sebagai bagian stream multipart/x-mixed-replace"""
+    return (MULTIPART_BOUNDARY +
+            b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+
+
+class LatestSlot:
+    """
+    Antrian ukuran 1 (latest-frame-wins) dengan nomor urut.
+
+    put() selalu menimpa item lama; pembaca yang tertinggal langsung dapat
+    item terbaru, tidak pernah antre. Banyak pembaca bisa menunggu slot
+    yang sama (broadcast), masing-masing menyimpan `seq` terakhirnya.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._seq = 0
+        self._taken = True
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, item):
+        with self._cond:
+            if not self._taken:
+                self.dropped += 1
+            self._item = item
+            self._seq += 1
+            self._taken = False
+            self._cond.notify_all()
+
+    def get(self, last_seq=0, timeout=None):
+        """Tunggu item dengan seq > last_seq; return (seq, item) atau (last_seq, None)"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > last_seq or self.closed, timeout):
+                return last_seq, None
+            if self.closed and self._seq <= last_seq:
+                return last_seq, None
+            self._taken = True
+            return self._seq, self._item
+
+    def peek(self):
+        """(seq, item) terbaru tanpa menunggu dan tanpa menandai sudah diambil"""
+        with self._cond:
+            return self._seq, self._item
+
+    @property
+    def seq(self):
+        return self._seq
+
+    @property
+    def pending(self):
+        """1 jika ada item yang belum diambil pembaca (kedalaman antrian)"""
+        return int(not self._taken)
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class StreamPipeline:
+    """
+    Tiga stage di thread terpisah, dihubungkan slot latest-frame-wins:
+
+        capture (CameraSource) → inference (YOLO) → encode (render + JPEG)
+
+    Semua client /video berlangganan slot JPEG per tier (resolusi +
+    kualitas, lihat src.backend.render.DEFAULT_TIERS), jadi menambah
+    penonton tidak menambah inference maupun encode. Tiap frame digambar
+    sekali di buffer yang dipakai ulang lalu di-encode hanya untuk tier
+    yang sedang ditonton; tanpa penonton, render + encode dilewati.
+
+    Jika `gate` (src.core.motion.MotionGate) diberikan, YOLO hanya jalan
+    saat frame berubah; di antaranya hasil terakhir dipakai ulang.
+    `listeners` dipanggil `listener(frame, results)` setiap inference baru
+    (mis. tracker slot), di thread inference. `force_infer` (callable tanpa
+    argumen) memaksa inference walau gate tidak melihat perubahan — mis.
+    `lambda: tracker.pending`, agar debounce per observasi tracker tidak
+    menunggu max_staleness gate di tiap langkah.
+
+    Durasi tiap stage selalu dicatat di histogram (`stage_times`);
+    register_metrics() mengekspornya ke Registry untuk /metrics.
+    """
+
+    def __init__(self, source, model, conf=0.5, jpeg_quality=85, gate=None, listeners=(),
+                 tiers=None, jpeg_backend='auto', force_infer=None):
+        self.source = source             # src.utils.camera.CameraSource
+        self.model = model
+        self.conf = conf
+        self.jpeg_quality = jpeg_quality
+        self.gate = gate
+        self.listeners = list(listeners)
+        self.force_infer = force_infer
+        self.tiers = dict(tiers or {'full': (None, jpeg_quality)})
+
+        self.renderer = FrameRenderer()
+        self.encoder = TierEncoder(self.tiers, backend=jpeg_backend)
+        self.detections = LatestSlot()   # (frame, results)
+        self.jpegs = {tier: LatestSlot() for tier in self.tiers}   # bytes JPEG per tier
+        self.tier_clients = {tier: 0 for tier in self.tiers}
+
+        self.fps = 0.0
+        self.inferences = 0
+        self.reused = 0
+        self.forced = 0                  # Inference saat force_infer aktif (gate dilewati)
+        self.idle_skips = 0              # Frame tanpa penonton (tidak di-encode)
+        self.stage_times = {stage: Histogram() for stage in ('inference', 'annotate', 'encode')}
+        self._clients_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads = []
+
+    # -----------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------
+    def start(self):
+        if not self.source.running:
+            self.source.start()
+        for target in (self._inference_loop, self._encode_loop):
+            t = threading.Thread(target=target, name=target.__name__, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        for slot in (self.detections, *self.jpegs.values()):
+            slot.close()
+        self.source.stop()
+        for t in self._threads:
+            t.join(timeout=2)
+
+    # -----------------------------------------------------
+    # Stage
+    # -----------------------------------------------------
+    def _inference_loop(self):
+        seq = 0
+        prev_time = time.time()
+        fps_counter = 0
+        last_results = None
+        while not self._stopped.is_set():
+            seq, frame = self.source.read(seq, timeout=1.0)
+            if frame is None:
+                continue
+
+            force = self.gate is not None and self.force_infer is not None and self.force_infer()
+            if self.gate is None or self.gate.should_infer(frame, force=force) or last_results is None:
+                self.forced += force
+                start = time.perf_counter()
+                results = last_results = self.model(frame, conf=self.conf, verbose=False)
+                self.stage_times['inference'].observe(time.perf_counter() - start)
+                self.inferences += 1
+                if self.gate is not None:
+                    self.gate.mark_inferred()
+                for listener in self.listeners:
+                    listener(frame, results)
+            else:
+                # Tidak ada perubahan → pakai ulang box terakhir
+                results = with_frame(last_results, frame)
+                self.reused += 1
+            self.detections.put((frame, results))
+
+            # Hitung FPS inference (update tiap 1 detik)
+            fps_counter += 1
+            current_time = time.time()
+            if current_time - prev_time >= 1:
+                self.fps = fps_counter / (current_time - prev_time)
+                fps_counter = 0
+                prev_time = current_time
+
+    def _encode_loop(self):
+        seq = 0
+        while not self._stopped.is_set():
+            seq, item = self.detections.get(seq, timeout=1.0)
+            if item is None:
+                continue
+            active = [tier for tier, n in self.tier_clients.items() if n]
+            if not active:
+                self.idle_skips += 1
+                continue
+
+            result = item[1][0]
+            extra = [f"Skip: {self.gate.skip_ratio:.0%}"] if self.gate is not None else ()
+            start = time.perf_counter()
+            annotated = self.renderer.render(result, info_lines(self.fps, len(result.boxes), extra))
+            mid = time.perf_counter()
+            encoded = self.encoder.encode(annotated, active)
+            self.stage_times['annotate'].observe(mid - start)
+            self.stage_times['encode'].observe(time.perf_counter() - mid)
+            for tier, frame_bytes in encoded.items():
+                self.jpegs[tier].put(frame_bytes)
+
+    # -----------------------------------------------------
+    # Metrik
+    # -----------------------------------------------------
+    def register_metrics(self, registry, labels=None):
+        """Daftarkan histogram stage + counter/gauge pipeline ke `registry`"""
+        labels = dict(labels or {})
+        source = self.source
+        stage = 'frame_stage_seconds'
+        stage_help = 'Durasi per stage hot-path (detik)'
+        registry.histogram(stage, stage_help, {**labels, 'stage': 'capture'}, hist=source.read_time)
+        for name, hist in self.stage_times.items():
+            registry.histogram(stage, stage_help, {**labels, 'stage': name}, hist=hist)
+        registry.histogram('frame_age_seconds', 'Umur frame kamera saat diambil inference (detik)',
+                           labels, hist=source.frame_age)
+
+        registry.gauge('queue_depth', 'Item belum diambil di slot antar-stage',
+                       lambda: self.detections.pending, {**labels, 'queue': 'detections'})
+        for tier, slot in self.jpegs.items():
+            registry.gauge('queue_depth', 'Item belum diambil di slot antar-stage',
+                           lambda slot=slot: slot.pending, {**labels, 'queue': f'jpegs_{tier}'})
+        registry.counter('frames_dropped_total', 'Frame ditimpa sebelum sempat diproses',
+                         lambda: source.dropped, {**labels, 'stage': 'capture'})
+        registry.counter('frames_dropped_total', 'Frame ditimpa sebelum sempat diproses',
+                         lambda: self.detections.dropped, {**labels, 'stage': 'encode'})
+        registry.counter('frames_captured_total', 'Frame diterima dari kamera',
+                         lambda: source.frames, labels)
+        registry.counter('inference_total', 'Frame yang benar-benar dijalankan ke model',
+                         lambda: self.inferences, labels)
+        registry.counter('inference_skipped_total', 'Frame yang memakai ulang hasil lama (motion gate)',
+                         lambda: self.reused, labels)
+        registry.counter('inference_forced_total', 'Inference saat force_infer aktif (motion gate dilewati)',
+                         lambda: self.forced, labels)
+        registry.counter('camera_reconnects_total', 'Reconnect stream kamera',
+                         lambda: source.reconnects, labels)
+        registry.gauge('camera_connected', '1 jika stream kamera tersambung',
+                       lambda: source.connected, labels)
+        registry.gauge('inference_fps', 'FPS inference (rata-rata 1 detik)',
+                       lambda: round(self.fps, 2), labels)
+        for tier in self.tiers:
+            registry.gauge('stream_clients', 'Client /video yang terhubung',
+                           lambda tier=tier: self.tier_clients[tier], {**labels, 'tier': tier})
+        registry.counter('encode_idle_skips_total', 'Frame tidak di-encode karena tanpa penonton',
+                         lambda: self.idle_skips, labels)
+        return registry
+
+    # -----------------------------------------------------
+    # Client
+    # -----------------------------------------------------
+    @property
+    def clients(self):
+        return sum(self.tier_clients.values())
+
+    def acquire(self, tier='full'):
+        """Daftarkan satu penonton tier (encode tier ini aktif); return slot JPEG-nya"""
+        if tier not in self.jpegs:
+            raise KeyError(f"Tier tidak dikenal: {tier!r} (ada: {list(self.tiers)})")
+        with self._clients_lock:
+            self.tier_clients[tier] += 1
+        return self.jpegs[tier]
+
+    def release(self, tier='full'):
+        with self._clients_lock:
+            self.tier_clients[tier] -= 1
+
+    def stream(self, tier='full'):
+        """Generator multipart MJPEG untuk satu client (berbagi encode per tier)"""
+        slot = self.acquire(tier)
+        try:
+            seq = max(slot.seq - 1, 0)   # Langsung kirim frame terbaru
+            while not self._stopped.is_set():
+                seq, frame_bytes = slot.get(seq, timeout=1.0)
+                if frame_bytes is None:
+                    continue
+                yield multipart_chunk(frame_bytes)
+        finally:
+            self.release(tier)
@@ -0,0 +1,160 @@
+"""Post-training quantization INT8 (ONNX Runtime) + laporan akurasi vs latency"""
+
+import json
+import random
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.backend.inference import (
+    DEFAULT_CACHE_DIR,
+    ExportedBackend,
+    OnnxRuntimeBackend,
+    export_cached,
+    int8_path,
+)
+
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+
+
+def sample_images(image_dir, n, seed=0):
+    """Ambil n gambar secara acak (seeded) dari folder"""
+    paths = sorted(p for p in Path(image_dir).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    random.Random(seed).shuffle(paths)
+    return paths[:n]
+
+
+def _calibration_reader(input_name, paths, imgsz):
+    """CalibrationDataReader ONNX Runtime: satu gambar (preprocess YOLO) per batch"""
+    from onnxruntime.quantization import CalibrationDataReader
+
+    preprocess = ExportedBackend({}, imgsz).preprocess
+
+    class Reader(CalibrationDataReader):
+        def __init__(self):
+            self._iter = iter(paths)
+
+        def get_next(self):
+            for path in self._iter:
+                image = cv2.imread(str(path))
+                if image is not None:
+                    return {input_name: preprocess([image])}
+            return None
+
+    return Reader()
+
+
+def quantize_int8(weights, calib_dir, imgsz=640, num_calib=200, seed=0,
+                  method='minmax', cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Buat model ONNX INT8 (format QDQ, bobot per-channel) dari checkpoint .pt.
+
+    Args:
+        weights: Path best.pt
+        calib_dir: Folder gambar kalibrasi (mis. Dataset/parking_lot_final/val/images)
+        imgsz: Ukuran input
+        num_calib: Jumlah gambar kalibrasi (sampel seeded)
+        method: 'minmax', 'entropy', atau 'percentile'
+
+    Returns:
+        (path FP32 .onnx, path INT8 .onnx)
+    """
+    import onnxruntime as ort
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+
+    fp32_path = export_cached(weights, 'onnx', imgsz, cache_dir)
+    out_path = int8_path(weights, imgsz, cache_dir)
+
+    # Pre-process (shape inference + optimasi graph) yang disarankan ORT
+    prepared = out_path.with_name(out_path.stem + '_prep.onnx')
+    try:
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+        quant_pre_process(str(fp32_path), str(prepared))
+    except Exception as e:   # versi ORT lama / graph tidak bisa dioptimasi
+        print(f"⚠ quant_pre_process dilewati: {e}")
+        prepared = fp32_path
+
+    session = ort.InferenceSession(str(prepared), providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+    paths = sample_images(calib_dir, num_calib, seed)
+    print(f"🎯 Kalibrasi INT8 dengan {len(paths)} gambar ({method})...")
+
+    methods = {'minmax': CalibrationMethod.MinMax,
+               'entropy': CalibrationMethod.Entropy,
+               'percentile': CalibrationMethod.Percentile}
+    quantize_static(
+        str(prepared), str(out_path),
+        _calibration_reader(input_name, paths, imgsz),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method=methods[method],
+    )
+    if prepared != fp32_path:
+        prepared.unlink(missing_ok=True)
+    return fp32_path, out_path
+
+
+def measure_latency(backend, paths, warmup=5, conf=0.25):
+    """Latency per gambar (ms) termasuk pre/post-process: mean, p50, p95"""
+    images = [im for im in (cv2.imread(str(p)) for p in paths) if im is not None]
+    for im in images[:warmup]:
+        backend(im, conf=conf)
+    times = []
+    for im in images:
+        start = time.perf_counter()
+        backend(im, conf=conf)
+        times.append((time.perf_counter() - start) * 1000)
+    times = np.asarray(times)
+    return {'mean_ms': round(float(times.mean()), 2),
+            'p50_ms': round(float(np.percentile(times, 50)), 2),
+            'p95_ms': round(float(np.percentile(times, 95)), 2),
+            'images': len(images)}
+
+
+def evaluate_map(onnx_path, data_yaml, imgsz=640):
+    """mAP di split val memakai validator Ultralytics (AutoBackend ONNX)"""
+    from ultralytics import YOLO
+
+    metrics = YOLO(str(onnx_path), task='detect').val(
+        data=str(data_yaml), imgsz=imgsz, batch=1, device='cpu', plots=False, verbose=False)
+    return {'map50': round(float(metrics.box.map50), 4),
+            'map50_95': round(float(metrics.box.map), 4)}
+
+
+def compare_report(weights, fp32_path, int8_path_, data_yaml, val_dir, imgsz=640,
+                   threads=None, num_latency=100, seed=0):
+    """Bandingkan FP32 vs INT8: ukuran file, mAP val, latency CPU"""
+    from ultralytics import YOLO
+
+    names = YOLO(str(weights)).names
+    paths = sample_images(val_dir, num_latency, seed)
+    report = {'weights': str(weights), 'imgsz': imgsz, 'models': {}}
+    for label, path in (('fp32', fp32_path), ('int8', int8_path_)):
+        backend = OnnxRuntimeBackend(path, names, imgsz=imgsz, threads=threads)
+        report['models'][label] = {
+            'path': str(path),
+            'size_mb': round(Path(path).stat().st_size / 1e6, 2),
+            **evaluate_map(path, data_yaml, imgsz),
+            **measure_latency(backend, paths),
+        }
+
+    fp32, int8 = report['models']['fp32'], report['models']['int8']
+    report['delta'] = {
+        'map50': round(int8['map50'] - fp32['map50'], 4),
+        'map50_95': round(int8['map50_95'] - fp32['map50_95'], 4),
+        'speedup': round(fp32['mean_ms'] / int8['mean_ms'], 2) if int8['mean_ms'] else None,
+        'size_ratio': round(int8['size_mb'] / fp32['size_mb'], 2) if fp32['size_mb'] else None,
+    }
+    return report
+
+
+def save_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
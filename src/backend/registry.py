@@ -0,0 +1,233 @@
+"""Registry model: index run training (results.csv), benchmark latency, promote model terbaik dalam budget"""
+
+import csv
+import json
+import os
+import time
+from pathlib import Path
+
+import yaml
+
+from src.utils.fileops import file_digest, link_file
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+MODEL_DIR = ROOT_DIR / "Model"
+PRODUCTION_DIR = MODEL_DIR / "production"
+PRODUCTION_WEIGHTS = 'best.pt'
+PRODUCTION_META = 'production.json'
+REGISTRY_NAME = 'registry.json'
+METRICS = ('precision', 'recall', 'mAP50', 'mAP50-95', 'fitness')
+
+# Kolom results.csv Ultralytics → nama pendek
+_COLUMNS = {
+    'metrics/precision(B)': 'precision',
+    'metrics/recall(B)': 'recall',
+    'metrics/mAP50(B)': 'mAP50',
+    'metrics/mAP50-95(B)': 'mAP50-95',
+}
+
+
+# =========================================================
+# 🔹 Index run
+# =========================================================
+def parse_results(path):
+    """
+    results.csv → metrik epoch terbaik (fitness Ultralytics:
+    0.1 × mAP50 + 0.9 × mAP50-95, epoch yang disimpan sebagai best.pt).
+
+    Returns:
+        dict (epochs, best_epoch, train_seconds, precision, recall,
+        mAP50, mAP50-95, fitness) atau None jika kosong
+    """
+    best, epochs, seconds = None, 0, None
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            row = {k.strip(): v.strip() for k, v in row.items() if k}
+            try:
+                metrics = {short: float(row[col]) for col, short in _COLUMNS.items()}
+                epoch = int(float(row['epoch']))
+            except (KeyError, ValueError):
+                continue
+            metrics['fitness'] = 0.1 * metrics['mAP50'] + 0.9 * metrics['mAP50-95']
+            epochs = max(epochs, epoch)
+            if row.get('time'):
+                seconds = float(row['time'])
+            if best is None or metrics['fitness'] > best['fitness']:
+                best = dict(metrics, best_epoch=epoch)
+    if best is None:
+        return None
+    best = {k: round(v, 5) if isinstance(v, float) else v for k, v in best.items()}
+    return dict(best, epochs=epochs, train_seconds=seconds)
+
+
+def index_runs(root=MODEL_DIR):
+    """
+    Semua folder run training di bawah `root` yang punya results.csv.
+
+    Returns:
+        list dict kandidat (name, path, weights atau None, imgsz, model,
+        metrics, digest), urut fitness menurun
+    """
+    root = Path(root)
+    runs = []
+    for results in sorted(root.rglob('results.csv')):
+        run = results.parent
+        if PRODUCTION_DIR in run.parents or run == PRODUCTION_DIR:
+            continue
+        metrics = parse_results(results)
+        if metrics is None:
+            continue
+        args = {}
+        if (run / 'args.yaml').exists():
+            with open(run / 'args.yaml', 'r', encoding='utf-8') as f:
+                args = yaml.safe_load(f) or {}
+        weights = run / 'weights' / 'best.pt'
+        runs.append({
+            'name': run.relative_to(root).as_posix(),
+            'path': str(run),
+            'weights': str(weights) if weights.exists() else None,
+            'digest': file_digest(weights)[:16] if weights.exists() else None,
+            'imgsz': args.get('imgsz', 640),
+            'model': args.get('model'),
+            'metrics': metrics,
+        })
+    runs.sort(key=lambda r: r['metrics']['fitness'], reverse=True)
+    return runs
+
+
+# =========================================================
+# 🔹 Benchmark latency (backend target)
+# =========================================================
+def _bench_key(candidate, backend, imgsz, device, threads):
+    return f"{candidate['digest']}:{backend}:{imgsz}:{device}:{threads or 'all'}"
+
+
+def benchmark_runs(runs, frames, backend='onnx', imgsz=None, device='cpu', threads=None,
+                   warmup=3, cache=None, log=print):
+    """
+    Ukur latency pipeline lengkap (decode → inference → NMS → plot → encode)
+    tiap kandidat yang punya weight, dengan backend yang dipakai server.
+
+    Hasil di-cache per (hash weight, backend, imgsz, device, threads) di
+    `cache` (dict dari registry.json), jadi run ulang hanya mengukur
+    weight baru. Pengukuran tanpa hasil (tidak ada frame) tidak di-cache.
+    """
+    from src.backend.benchmark import run_case
+    from src.backend.inference import load_backend
+
+    if not frames:
+        raise ValueError("benchmark_runs butuh minimal satu frame")
+    cache = {} if cache is None else cache
+    for run in runs:
+        if run['weights'] is None:
+            run['latency'] = None
+            continue
+        size = imgsz or run['imgsz']
+        key = _bench_key(run, backend, size, device, threads)
+        if not (cache.get(key) or {}).get('total'):
+            try:
+                model = load_backend(run['weights'], backend=backend, imgsz=size,
+                                     threads=threads, device=device, warmup=0)
+            except (ImportError, FileNotFoundError) as e:
+                log(f"⚠ Lewati {run['name']}: {e}")
+                run['latency'] = None
+                continue
+            result = run_case(model, frames, batch=1, warmup=warmup)
+            if result['total'] is None:
+                log(f"⚠ Lewati {run['name']}: tidak ada frame yang terukur")
+                run['latency'] = None
+                continue
+            cache[key] = {'backend': model.name, 'imgsz': size, 'total': result['total'],
+                          'inference': result['stages']['inference'],
+                          'measured': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        run['latency'] = cache[key]
+        total = cache[key]['total']
+        log(f"  {run['name']:<32} p50 {total['p50_ms']:.1f} ms | p95 {total['p95_ms']:.1f} ms "
+            f"| {total['throughput'] or 0:.1f} img/s")
+    return runs
+
+
+# =========================================================
+# 🔹 Seleksi + promote
+# =========================================================
+def select_best(runs, budget_ms, metric='mAP50-95', stat='p95_ms', stage='total'):
+    """
+    Kandidat dengan `metric` tertinggi yang latency-nya (stat dari stage
+    'total' atau 'inference') ≤ budget_ms. None jika tidak ada yang lolos.
+    """
+    eligible = [r for r in runs
+                if r.get('latency') and r['latency'][stage][stat] <= budget_ms]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda r: (r['metrics'][metric], -r['latency'][stage][stat]))
+
+
+def promote(run, target_dir=PRODUCTION_DIR, budget_ms=None, reason=None):
+    """
+    Salin best.pt kandidat ke <target>/best.pt (atomic) + production.json.
+
+    Disalin, bukan di-link: training ulang yang menimpa best.pt di folder
+    run tidak ikut mengubah model produksi.
+    """
+    target_dir = Path(target_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    link_file(run['weights'], target_dir / PRODUCTION_WEIGHTS, mode='copy')
+    meta = {
+        'promoted': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'run': run['name'],
+        'source': run['weights'],
+        'digest': run['digest'],
+        'imgsz': run['imgsz'],
+        'metrics': run['metrics'],
+        'latency': run.get('latency'),
+        'budget_ms': budget_ms,
+        'reason': reason,
+    }
+    tmp = target_dir / (PRODUCTION_META + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, target_dir / PRODUCTION_META)
+    return target_dir / PRODUCTION_WEIGHTS
+
+
+def load_registry(path=MODEL_DIR / REGISTRY_NAME):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'benchmarks': {}}
+
+
+def save_registry(registry, path=MODEL_DIR / REGISTRY_NAME):
+    path = Path(path)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(registry, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+# =========================================================
+# 🔹 Dipakai server saat startup
+# =========================================================
+def production_info(target_dir=PRODUCTION_DIR):
+    """Isi production.json atau None"""
+    try:
+        with open(Path(target_dir) / PRODUCTION_META, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def resolve_model(fallback=None, target_dir=PRODUCTION_DIR):
+    """
+    Path weight yang dipakai server: model produksi hasil promote jika
+    ada, selain itu `fallback`.
+    """
+    weights = Path(target_dir) / PRODUCTION_WEIGHTS
+    if weights.exists():
+        info = production_info(target_dir) or {}
+        print(f"📌 Model produksi: {info.get('run', weights)} "
+              f"(mAP50-95 {info.get('metrics', {}).get('mAP50-95', '?')})")
+        return str(weights)
+    return str(fallback) if fallback is not None else None
@@ -0,0 +1,179 @@
+"""Renderer box in-place + encoder JPEG cepat (simplejpeg / TurboJPEG / OpenCV) per tier"""
+
+import cv2
+import numpy as np
+
+# BGR per kelas: 0 = terisi (merah), 1 = kosong (hijau); kelas lain dari palet
+CLASS_COLORS = {0: (0, 0, 255), 1: (0, 200, 0)}
+PALETTE = ((255, 128, 0), (255, 0, 255), (0, 255, 255), (128, 0, 255), (255, 255, 0))
+
+# Tier stream: nama → (lebar maksimum atau None = resolusi asli, kualitas JPEG)
+DEFAULT_TIERS = {
+    'full': (None, 85),
+    'medium': (640, 75),
+    'low': (320, 60),
+}
+JPEG_BACKENDS = ('auto', 'simplejpeg', 'turbojpeg', 'opencv')
+
+
+# =========================================================
+# 🔹 Renderer
+# =========================================================
+class FrameRenderer:
+    """
+    Gambar box + label + teks info di buffer yang dipakai ulang.
+
+    Pengganti `Results.plot()`: tidak ada alokasi gambar baru per frame
+    (frame hanya di-copy ke buffer milik renderer), dan semua box diambil
+    dari tensor sekali sebagai numpy. Satu renderer untuk satu thread.
+    """
+
+    def __init__(self, line_width=2, font_scale=0.5, show_conf=True):
+        self.line_width = line_width
+        self.font_scale = font_scale
+        self.show_conf = show_conf
+        self._buffer = None
+
+    def _target(self, frame):
+        if self._buffer is None or self._buffer.shape != frame.shape:
+            self._buffer = np.empty_like(frame)
+        np.copyto(self._buffer, frame)
+        return self._buffer
+
+    @staticmethod
+    def color(cls):
+        return CLASS_COLORS.get(cls, PALETTE[cls % len(PALETTE)])
+
+    def render(self, result, lines=(), frame=None):
+        """
+        Args:
+            result: Results Ultralytics (box + names)
+            lines: Teks info di pojok kiri atas, [(teks, warna BGR), ...]
+            frame: Gambar dasar (default result.orig_img)
+
+        Returns:
+            Buffer BGR milik renderer (ditimpa di panggilan berikutnya)
+        """
+        image = self._target(result.orig_img if frame is None else frame)
+        boxes = result.boxes
+        if boxes is not None and len(boxes):
+            xyxy = boxes.xyxy.cpu().numpy().astype(np.int32)
+            classes = boxes.cls.cpu().numpy().astype(np.int32)
+            confs = boxes.conf.cpu().numpy()
+            names = result.names
+            for (x1, y1, x2, y2), cls, conf in zip(xyxy, classes, confs):
+                color = self.color(int(cls))
+                cv2.rectangle(image, (x1, y1), (x2, y2), color, self.line_width, cv2.LINE_8)
+                label = names.get(int(cls), str(cls)) if isinstance(names, dict) else str(cls)
+                if self.show_conf:
+                    label = f"{label} {conf:.2f}"
+                (tw, th), base = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, self.font_scale, 1)
+                top = max(y1 - th - base - 2, 0)
+                cv2.rectangle(image, (x1, top), (x1 + tw + 2, top + th + base + 2), color, -1)
+                cv2.putText(image, label, (x1 + 1, top + th + 1), cv2.FONT_HERSHEY_SIMPLEX,
+                            self.font_scale, (255, 255, 255), 1, cv2.LINE_AA)
+
+        for i, (text, color) in enumerate(lines):
+            cv2.putText(image, text, (10, 30 + 40 * i), cv2.FONT_HERSHEY_SIMPLEX,
+                        1, color, 2, cv2.LINE_AA)
+        return image
+
+
+def info_lines(fps, objects, extra=()):
+    """Baris FPS / jumlah objek / teks tambahan seperti overlay lama"""
+    lines = [(f"FPS: {fps:.1f}", (0, 255, 0)), (f"Objects: {objects}", (255, 255, 0))]
+    lines += [(text, (255, 255, 255)) for text in extra]
+    return lines
+
+
+# =========================================================
+# 🔹 Encoder JPEG
+# =========================================================
+class JpegEncoder:
+    """
+    Encode BGR → bytes JPEG dengan backend tercepat yang terpasang.
+
+    'auto' memilih simplejpeg → TurboJPEG (PyTurboJPEG) → cv2.imencode.
+    simplejpeg/TurboJPEG langsung memakai libjpeg-turbo dengan fast DCT,
+    biasanya jauh lebih murah daripada imencode untuk kualitas yang sama.
+    """
+
+    def __init__(self, backend='auto'):
+        if backend not in JPEG_BACKENDS:
+            raise ValueError(f"backend JPEG harus salah satu dari {JPEG_BACKENDS}, bukan {backend!r}")
+        self._encode = None
+        candidates = ('simplejpeg', 'turbojpeg', 'opencv') if backend == 'auto' else (backend,)
+        for name in candidates:
+            try:
+                self._encode = getattr(self, f'_load_{name}')()
+                self.name = name
+                break
+            except (ImportError, OSError, RuntimeError):
+                if backend != 'auto':
+                    raise
+
+    @staticmethod
+    def _load_simplejpeg():
+        import simplejpeg
+
+        def encode(image, quality):
+            return simplejpeg.encode_jpeg(image, quality=quality, colorspace='BGR', fastdct=True)
+        return encode
+
+    @staticmethod
+    def _load_turbojpeg():
+        from turbojpeg import TJFLAG_FASTDCT, TurboJPEG
+
+        jpeg = TurboJPEG()
+
+        def encode(image, quality):
+            return jpeg.encode(image, quality=quality, flags=TJFLAG_FASTDCT)
+        return encode
+
+    @staticmethod
+    def _load_opencv():
+        def encode(image, quality):
+            ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            return buffer.tobytes() if ok else None
+        return encode
+
+    def encode(self, image, quality=85):
+        return self._encode(np.ascontiguousarray(image), quality)
+
+
+# =========================================================
+# 🔹 Tier resolusi / kualitas
+# =========================================================
+class TierEncoder:
+    """
+    Satu frame teranotasi → JPEG per tier (resolusi + kualitas berbeda).
+
+    Resize memakai buffer tujuan yang dipakai ulang per tier. Hanya tier
+    yang ada di `active` yang di-encode, jadi tier tanpa penonton gratis.
+    """
+
+    def __init__(self, tiers=None, backend='auto'):
+        self.tiers = dict(tiers or DEFAULT_TIERS)
+        self.encoder = JpegEncoder(backend)
+        self._buffers = {}
+
+    def _resized(self, name, image, width):
+        h, w = image.shape[:2]
+        if width is None or width >= w:
+            return image
+        size = (width, int(round(h * width / w)))
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape[1::-1] != size:
+            buffer = self._buffers[name] = np.empty((size[1], size[0], 3), image.dtype)
+        cv2.resize(image, size, dst=buffer, interpolation=cv2.INTER_AREA)
+        return buffer
+
+    def encode(self, image, active):
+        """Return {tier: bytes} untuk tier di `active`"""
+        out = {}
+        for name in active:
+            width, quality = self.tiers[name]
+            data = self.encoder.encode(self._resized(name, image, width), quality)
+            if data is not None:
+                out[name] = data
+        return out
@@ -0,0 +1,217 @@
+"""Inference tile (sliced): frame resolusi penuh → tile 640 overlap → satu batch → NMS lintas tile"""
+
+import math
+
+import numpy as np
+
+MATCH_METRICS = ('iou', 'ios')
+
+
+# =========================================================
+# 🔹 Grid tile
+# =========================================================
+def _axis_starts(length, tile, overlap):
+    """Posisi awal tile di satu sumbu; tile terakhir rata dengan tepi frame"""
+    if length <= tile:
+        return [0]
+    step = tile * (1.0 - overlap)
+    n = math.ceil((length - tile) / step) + 1
+    return [round(i * (length - tile) / (n - 1)) for i in range(n)]
+
+
+def tile_grid(width, height, tile=640, overlap=0.2):
+    """
+    Tile (x0, y0, x1, y1) yang menutup seluruh frame dengan overlap minimal
+    `overlap` (fraksi sisi tile). Sisa dibagi rata, jadi semua tile
+    berukuran penuh dan tidak ada tile kecil di tepi.
+    """
+    if not 0 <= overlap < 1:
+        raise ValueError(f"overlap harus 0 ≤ overlap < 1, bukan {overlap}")
+    xs = _axis_starts(width, tile, overlap)
+    ys = _axis_starts(height, tile, overlap)
+    return [(x, y, min(x + tile, width), min(y + tile, height)) for y in ys for x in xs]
+
+
+def slot_tiles(tiles, rects, margin=0):
+    """Hanya tile yang beririsan dengan minimal satu rect slot (x0, y0, x1, y1)"""
+    keep = []
+    for tx0, ty0, tx1, ty1 in tiles:
+        for x0, y0, x1, y1 in rects:
+            if x0 - margin < tx1 and x1 + margin > tx0 and y0 - margin < ty1 and y1 + margin > ty0:
+                keep.append((tx0, ty0, tx1, ty1))
+                break
+    return keep
+
+
+# =========================================================
+# 🔹 NMS lintas tile
+# =========================================================
+def merge_boxes(boxes, scores, classes, metric='ios', threshold=0.6, union=True, max_det=300):
+    """
+    NMS greedy per kelas untuk box gabungan semua tile (koordinat frame).
+
+    metric 'ios' (intersection / area box terkecil) menangkap box mobil
+    yang terpotong di tepi tile, yang IoU-nya dengan box utuh kecil.
+    union=True → box yang menang diperluas ke gabungan box yang ditekannya,
+    sehingga potongan di tepi tile tidak mengecilkan box akhir.
+
+    Returns:
+        (boxes (K, 4), scores (K,), classes (K,)) urut skor menurun
+    """
+    if metric not in MATCH_METRICS:
+        raise ValueError(f"metric harus salah satu dari {MATCH_METRICS}, bukan {metric!r}")
+    boxes = np.asarray(boxes, np.float32).reshape(-1, 4)
+    scores = np.asarray(scores, np.float32).reshape(-1)
+    classes = np.asarray(classes, np.float32).reshape(-1)
+    if len(boxes) == 0:
+        return boxes, scores, classes
+
+    areas = np.maximum(boxes[:, 2] - boxes[:, 0], 0) * np.maximum(boxes[:, 3] - boxes[:, 1], 0)
+    order = np.argsort(-scores, kind='stable')
+    out_boxes, keep = [], []
+    while order.size and len(keep) < max_det:
+        i, rest = order[0], order[1:]
+        rest = rest[classes[rest] == classes[i]]
+        xx0 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy0 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx1 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy1 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.maximum(xx1 - xx0, 0) * np.maximum(yy1 - yy0, 0)
+        if metric == 'ios':
+            denom = np.minimum(areas[i], areas[rest])
+        else:
+            denom = areas[i] + areas[rest] - inter
+        overlap = inter / np.maximum(denom, 1e-9)
+        suppressed = rest[overlap > threshold]
+
+        box = boxes[i].copy()
+        if union and suppressed.size:
+            box[:2] = np.minimum(box[:2], boxes[suppressed, :2].min(axis=0))
+            box[2:] = np.maximum(box[2:], boxes[suppressed, 2:].max(axis=0))
+        out_boxes.append(box)
+        keep.append(i)
+        order = order[1:][~np.isin(order[1:], suppressed)]
+
+    keep = np.asarray(keep, np.int64)
+    return np.stack(out_boxes), scores[keep], classes[keep]
+
+
+# =========================================================
+# 🔹 Detector
+# =========================================================
+class TiledDetector:
+    """
+    Bungkus backend (src.backend.inference) agar deteksi jalan di resolusi penuh.
+
+    Frame dipotong menjadi tile `tile`×`tile` yang overlap, semua tile
+    (+ satu pass full-frame untuk mobil besar yang melintasi tile) dikirim
+    ke model dalam SATU panggilan batch, lalu box digeser ke koordinat
+    frame dan digabung dengan merge_boxes(). Output sama seperti backend:
+    list berisi satu `Results`, jadi plot() / boxes tetap dipakai apa adanya.
+
+    Args:
+        model: Backend dari load_backend() / backend_from_config()
+        tile: Sisi tile (sebaiknya = imgsz model)
+        overlap: Overlap antar tile (fraksi sisi tile)
+        full_frame: Tambahkan pass full-frame (letterbox ke imgsz)
+        metric, threshold: Pencocokan box lintas tile (lihat merge_boxes)
+        slots: SlotMap opsional → hanya tile yang berisi slot yang diproses
+               (tidak ada tile tersisa → fallback satu pass full-frame)
+        margin: Perluasan rect slot (piksel) saat memilih tile
+    """
+
+    def __init__(self, model, tile=640, overlap=0.2, full_frame=True, metric='ios',
+                 threshold=0.6, slots=None, margin=32):
+        self.model = model
+        self.names = model.names
+        self.name = f"{model.name}+tiles"
+        self.tile = tile
+        self.overlap = overlap
+        self.full_frame = full_frame
+        self.metric = metric
+        self.threshold = threshold
+        self.slots = slots
+        self.margin = margin
+        self.last_tiles = 0          # Jumlah tile di panggilan terakhir
+        self._grids = {}             # (w, h) → list tile
+
+    def tiles_for(self, shape):
+        """Tile untuk resolusi frame ini (di-cache per resolusi)"""
+        h, w = shape[:2]
+        tiles = self._grids.get((w, h))
+        if tiles is None:
+            tiles = tile_grid(w, h, self.tile, self.overlap)
+            if self.slots is not None and len(self.slots):
+                tiles = slot_tiles(tiles, self.slots.scaled_to(shape).rects, self.margin)
+            self._grids[(w, h)] = tiles
+        return tiles
+
+    def predict(self, source, conf=0.25, iou=0.7, max_det=300, verbose=False, **kwargs):
+        import torch
+        from ultralytics.engine.results import Results
+
+        frames = source if isinstance(source, (list, tuple)) else [source]
+        out = []
+        for frame in frames:
+            tiles = self.tiles_for(frame.shape)
+            h, w = frame.shape[:2]
+            # Frame sudah muat di satu tile → tidak perlu slicing. Slot map
+            # yang tidak kena tile mana pun → tetap satu pass full-frame
+            if not tiles or (len(tiles) == 1 and tiles[0] == (0, 0, w, h)):
+                out.extend(self.model(frame, conf=conf, iou=iou, max_det=max_det,
+                                      verbose=verbose, **kwargs))
+                self.last_tiles = 1
+                continue
+
+            crops = [frame[y0:y1, x0:x1] for x0, y0, x1, y1 in tiles]
+            offsets = [(x0, y0) for x0, y0, _, _ in tiles]
+            if self.full_frame:
+                crops.append(frame)
+                offsets.append((0, 0))
+            results = self.model(crops, conf=conf, iou=iou, max_det=max_det,
+                                 verbose=verbose, **kwargs)
+            self.last_tiles = len(crops)
+
+            boxes, scores, classes = [], [], []
+            for result, (dx, dy) in zip(results, offsets):
+                if result.boxes is None or not len(result.boxes):
+                    continue
+                boxes.append(result.boxes.xyxy.cpu().numpy() + (dx, dy, dx, dy))
+                scores.append(result.boxes.conf.cpu().numpy())
+                classes.append(result.boxes.cls.cpu().numpy())
+            if boxes:
+                merged = merge_boxes(np.concatenate(boxes), np.concatenate(scores),
+                                     np.concatenate(classes), self.metric,
+                                     self.threshold, max_det=max_det)
+                det = np.concatenate([merged[0], merged[1][:, None], merged[2][:, None]], axis=1)
+            else:
+                det = np.zeros((0, 6), np.float32)
+            out.append(Results(frame, path='', names=self.names, boxes=torch.from_numpy(det)))
+        return out
+
+    def __call__(self, source, **kwargs):
+        return self.predict(source, **kwargs)
+
+
+def tiled_from_config(model, config):
+    """
+    Bungkus model dengan TiledDetector jika `tiling.enabled` di config
+    (configs/inference.yaml); selain itu model dikembalikan apa adanya.
+    """
+    tiling = (config or {}).get('tiling') or {}
+    if not tiling.get('enabled'):
+        return model
+    slots = None
+    if tiling.get('slots'):
+        from src.core.slots import SlotMap
+        slots = SlotMap.load(tiling['slots'])
+    return TiledDetector(
+        model,
+        tile=tiling.get('tile') or config.get('imgsz', 640),
+        overlap=tiling.get('overlap', 0.2),
+        full_frame=tiling.get('full_frame', True),
+        metric=tiling.get('metric', 'ios'),
+        threshold=tiling.get('threshold', 0.6),
+        slots=slots,
+        margin=tiling.get('margin', 32),
+    )
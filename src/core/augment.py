@@ -0,0 +1,252 @@
+"""Kernel augmentasi (bayangan, gelap, noise) dengan buffer yang dipakai ulang"""
+
+import cv2
+import numpy as np
+
+# =========================================================
+# 🔹 Parameter augmentasi (sama dengan versi lama di Augmentasi.py)
+# =========================================================
+AUG_TYPES = (
+    'shadow_only',
+    'dark_only',
+    'shadow_dark',
+    'dark_noise',
+    'shadow_dark_noise'
+)
+SHADOW_TYPES = ('vertical', 'horizontal', 'diagonal', 'random')
+
+SHADOW_RANGE = (0.3, 0.6)       # Faktor gelap area bayangan
+DARK_RANGE = (0.4, 0.8)         # Faktor brightness untuk tipe "dark"
+BRIGHTNESS_RANGE = (0.4, 1.5)   # Default adjust_brightness (gelap s/d terang)
+NOISE_SIGMA_RANGE = (10, 25)    # Std Gaussian noise (inklusif)
+
+MASK_SCALE = 4                  # Mask bayangan dibuat di 1/4 resolusi
+BLUR_KSIZE = 21                 # Kernel blur mask di resolusi penuh
+MAX_CACHED_KERNELS = 8          # Batas kernel per ukuran gambar per proses
+
+
+class AugmentKernel:
+    """
+    Augmentasi untuk satu ukuran gambar dengan scratch buffer tetap.
+
+    Semua buffer (mask, float work, noise, LUT) dialokasikan sekali di
+    constructor, jadi apply() tidak membuat array baru per gambar kecuali
+    `out` tidak diberikan.
+    """
+
+    def __init__(self, shape, mask_scale=MASK_SCALE):
+        h, w = shape[:2]
+        self.shape = (h, w, 3)
+        scale = max(1, int(mask_scale))
+
+        # Mask 1 channel di resolusi rendah → blur murah, lalu di-upscale
+        self._small = np.empty((max(1, h // scale), max(1, w // scale)), np.float32)
+        self._mask = np.empty((h, w), np.float32)
+        ksize = max(3, (BLUR_KSIZE // scale) | 1)
+        self._ksize = (ksize, ksize)
+
+        self._work = np.empty(self.shape, np.float32)
+        self._noise = np.empty(self.shape, np.float32)
+        self._ramp = np.arange(256, dtype=np.float32)
+        self._lut_f = np.empty(256, np.float32)
+        self._lut = np.empty(256, np.uint8)
+
+    # -----------------------------------------------------
+    # Mask bayangan
+    # -----------------------------------------------------
+    def shadow_mask(self, rng, factor=1.0):
+        """Isi mask (h, w) float32 dengan bayangan acak, dikali `factor`"""
+        small = self._small
+        sh, sw = small.shape
+        h, w = self.shape[:2]
+        fx, fy = sw / w, sh / h
+        small.fill(1.0)
+
+        shadow_type = SHADOW_TYPES[rng.integers(len(SHADOW_TYPES))]
+
+        # Bayangan vertikal seperti tiang atau pohon
+        if shadow_type == 'vertical':
+            width = int(rng.integers(w // 8, w // 3 + 1))
+            pos = int(rng.integers(0, w - width + 1))
+            small[:, int(pos * fx):int((pos + width) * fx)] = rng.uniform(*SHADOW_RANGE)
+
+        # Bayangan horizontal seperti atap
+        elif shadow_type == 'horizontal':
+            height = int(rng.integers(h // 8, h // 2 + 1))
+            pos = int(rng.integers(0, h - height + 1))
+            small[int(pos * fy):int((pos + height) * fy), :] = rng.uniform(*SHADOW_RANGE)
+
+        # Bayangan diagonal seperti dari arah miring
+        elif shadow_type == 'diagonal':
+            pts = np.array([
+                [rng.integers(0, w // 2 + 1) * fx, 0],
+                [rng.integers(w // 2, w + 1) * fx, 0],
+                [rng.integers(w // 2, w + 1) * fx, sh],
+                [rng.integers(0, w // 2 + 1) * fx, sh]
+            ], dtype=np.int32)
+            cv2.fillPoly(small, [pts], float(rng.uniform(*SHADOW_RANGE)))
+
+        # Bayangan acak (irregular) seperti awan atau bayangan orang
+        else:
+            side = min(h, w)
+            for _ in range(int(rng.integers(1, 4))):
+                x = int(rng.integers(0, w + 1) * fx)
+                y = int(rng.integers(0, h + 1) * fy)
+                radius = int(rng.integers(side // 8, side // 3 + 1) * min(fx, fy))
+                cv2.circle(small, (x, y), max(1, radius),
+                           float(rng.uniform(*SHADOW_RANGE)), -1)
+
+        # Blur sekali di resolusi rendah, lalu upscale ke buffer penuh
+        cv2.GaussianBlur(small, self._ksize, 0, dst=small)
+        cv2.resize(small, (w, h), dst=self._mask, interpolation=cv2.INTER_LINEAR)
+        if factor != 1.0:
+            self._mask *= factor
+        return self._mask
+
+    # -----------------------------------------------------
+    # LUT brightness
+    # -----------------------------------------------------
+    def brightness_lut(self, factor):
+        """
+        LUT uint8 untuk skala brightness per channel. Setara skala V di
+        HSV hanya jika factor ≤ 1 (tidak ada channel yang terpotong di 255);
+        untuk factor > 1 pakai scale_brightness().
+        """
+        np.multiply(self._ramp, factor, out=self._lut_f)
+        np.clip(self._lut_f, 0, 255, out=self._lut_f)
+        np.copyto(self._lut, self._lut_f, casting='unsafe')
+        return self._lut
+
+    def scale_brightness(self, work, factor):
+        """
+        Skala brightness in-place pada buffer float32 (h, w, 3), setara skala
+        V di HSV: per piksel faktor min(factor, 255 / max channel), jadi
+        piksel terang jenuh di V = 255 tanpa mengubah hue/saturasi.
+        """
+        v = self._mask
+        np.max(work, axis=2, out=v)
+        np.maximum(v, 1.0, out=v)
+        np.divide(255.0, v, out=v)
+        np.minimum(v, factor, out=v)
+        np.multiply(work, v[..., None], out=work)
+        return work
+
+    # -----------------------------------------------------
+    # API utama
+    # -----------------------------------------------------
+    def apply(self, image, aug_type, rng, out=None):
+        """
+        Terapkan satu tipe augmentasi (lihat AUG_TYPES).
+
+        Args:
+            image: Gambar BGR uint8 dengan ukuran self.shape
+            aug_type: Kombinasi 'shadow' / 'dark' / 'noise'
+            rng: np.random.Generator (seed menentukan hasil)
+            out: Buffer uint8 tujuan (boleh sama dengan image)
+        """
+        shadow = 'shadow' in aug_type
+        factor = rng.uniform(*DARK_RANGE) if 'dark' in aug_type else 1.0
+        noise_range = NOISE_SIGMA_RANGE if 'noise' in aug_type else None
+        return self.compose(image, rng, shadow, factor, noise_range, out=out)
+
+    def compose(self, image, rng, shadow=False, factor=1.0, noise_range=None, out=None):
+        """
+        Bayangan × faktor brightness + Gaussian noise dalam satu pass float32.
+
+        Args:
+            image: Gambar BGR uint8 dengan ukuran self.shape
+            rng: np.random.Generator
+            shadow: Tambahkan bayangan acak
+            factor: Faktor brightness (1.0 = tetap)
+            noise_range: Rentang sigma noise (min, max) inklusif, atau None
+            out: Buffer uint8 tujuan (boleh sama dengan image)
+        """
+        if out is None:
+            out = np.empty_like(image)
+
+        # Gelap saja → cukup satu LUT uint8, tanpa float sama sekali
+        brighten = factor > 1.0
+        if not shadow and noise_range is None and not brighten:
+            return cv2.LUT(image, self.brightness_lut(factor), dst=out)
+
+        work = self._work
+        np.copyto(work, image, casting='unsafe')
+
+        # Faktor gelap digabung ke mask bayangan → satu perkalian saja
+        if shadow:
+            mask = self.shadow_mask(rng, 1.0 if brighten else factor)
+            np.multiply(work, mask[..., None], out=work)
+        elif factor != 1.0 and not brighten:
+            work *= factor
+
+        # Terang → skala per piksel agar channel tidak terpotong sendiri-sendiri
+        if brighten:
+            self.scale_brightness(work, factor)
+
+        if noise_range is not None:
+            sigma = rng.integers(noise_range[0], noise_range[1] + 1)
+            rng.standard_normal(dtype=np.float32, out=self._noise)
+            self._noise *= sigma
+            work += self._noise
+
+        np.clip(work, 0, 255, out=work)
+        np.copyto(out, work, casting='unsafe')
+        return out
+
+    def apply_each(self, images, aug_types, rng, out=None):
+        """
+        Panggil apply() untuk tiap gambar di array (N, H, W, 3), ditulis ke
+        satu array output. Bukan operasi batch: tetap loop Python per gambar
+        (tipe, mask bayangan, dan sigma noise berbeda tiap gambar); hasil sama
+        dengan memanggil apply() berurutan dengan rng yang sama.
+        """
+        if out is None:
+            out = np.empty_like(images)
+        for i, aug_type in enumerate(aug_types):
+            self.apply(images[i], aug_type, rng, out=out[i])
+        return out
+
+
+# =========================================================
+# 🔹 Cache kernel per ukuran gambar (per proses)
+# =========================================================
+_kernels = {}
+_default_rng = np.random.default_rng()
+
+
+def get_kernel(shape):
+    """Ambil (atau buat) AugmentKernel untuk ukuran gambar tertentu"""
+    key = tuple(shape[:2])
+    kernel = _kernels.get(key)
+    if kernel is None:
+        if len(_kernels) >= MAX_CACHED_KERNELS:
+            _kernels.clear()
+        kernel = _kernels[key] = AugmentKernel(key)
+    return kernel
+
+
+def random_aug_type(rng):
+    """Pilih tipe augmentasi secara acak"""
+    return AUG_TYPES[rng.integers(len(AUG_TYPES))]
+
+
+# =========================================================
+# 🔹 Fungsi kompatibel dengan API lama Augmentasi.py
+# =========================================================
+def apply_shadow(image, rng=None):
+    """Tambahkan bayangan acak pada gambar"""
+    rng = rng or _default_rng
+    return get_kernel(image.shape).apply(image, 'shadow_only', rng)
+
+
+def adjust_brightness(image, factor=None, rng=None):
+    """Ubah brightness gambar (setara skala V di HSV, termasuk factor > 1)"""
+    if factor is None:
+        factor = (rng or _default_rng).uniform(*BRIGHTNESS_RANGE)
+    return get_kernel(image.shape).compose(image, None, factor=factor)
+
+
+def add_noise(image, rng=None):
+    """Tambahkan noise untuk simulasi low-light"""
+    rng = rng or _default_rng
+    return get_kernel(image.shape).apply(image, 'noise', rng)
@@ -0,0 +1,403 @@
+"""Pipeline build dataset: decode sekali → stage (CLAHE, resize, bayangan, brightness, noise) → semua variasi"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from multiprocessing import Pool
+from pathlib import Path
+
+import cv2
+import numpy as np
+import yaml
+
+from src.core.augment import DARK_RANGE, NOISE_SIGMA_RANGE, get_kernel
+from src.core.preprocess import IMAGE_SUFFIXES, read_image
+from src.utils.fileops import BuildManifest, DedupManifest, file_digest
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+STAGE_TYPES = ('clahe', 'resize', 'shadow', 'brightness', 'noise')
+PHOTOMETRIC = ('shadow', 'brightness', 'noise')   # Urutan pass gabungan AugmentKernel.compose
+PROGRESS_INTERVAL = 2.0
+
+
+# =========================================================
+# 🔹 Stage
+# =========================================================
+class ClaheStage:
+    """
+    CLAHE. mode 'gray' = seperti color_correction.py (output 1 channel),
+    'lab' = CLAHE di channel L, warna dipertahankan.
+    """
+
+    def __init__(self, mode='gray', clip_limit=2.0, tile_grid=(8, 8), blur_ksize=3):
+        if mode not in ('gray', 'lab'):
+            raise ValueError(f"mode CLAHE harus 'gray' atau 'lab', bukan {mode!r}")
+        self.mode = mode
+        self.blur_ksize = blur_ksize
+        self._clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tuple(tile_grid))
+
+    def __call__(self, image, rng):
+        if self.mode == 'gray':
+            gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            out = self._clahe.apply(gray)
+        else:
+            lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+            lab[..., 0] = self._clahe.apply(lab[..., 0])
+            out = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+        if self.blur_ksize:
+            out = cv2.GaussianBlur(out, (self.blur_ksize, self.blur_ksize), 0)
+        return out
+
+
+class ResizeStage:
+    """Resize ke (lebar, tinggi); label YOLO ternormalisasi jadi tidak berubah"""
+
+    def __init__(self, size=(640, 640)):
+        self.size = tuple(size)
+
+    def __call__(self, image, rng):
+        if image.shape[1::-1] == self.size:
+            return image
+        interpolation = cv2.INTER_AREA if image.shape[1] > self.size[0] else cv2.INTER_LINEAR
+        return cv2.resize(image, self.size, interpolation=interpolation)
+
+
+class PhotometricStage:
+    """
+    Bayangan × brightness + noise digabung dalam satu pass float32
+    (memakai kernel src.core.augment). Brightness saja → LUT uint8.
+
+    Args:
+        shadow: Tambahkan bayangan acak
+        brightness: Rentang faktor brightness [min, max] atau None
+        noise: Rentang sigma Gaussian noise [min, max] atau None
+    """
+
+    def __init__(self, shadow=False, brightness=None, noise=None):
+        self.shadow = shadow
+        self.brightness = tuple(brightness) if brightness else None
+        self.noise = tuple(noise) if noise else None
+
+    def __call__(self, image, rng):
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        factor = rng.uniform(*self.brightness) if self.brightness else 1.0
+        return get_kernel(image.shape).compose(image, rng, self.shadow, factor, self.noise)
+
+
+def build_stages(specs):
+    """
+    List spec YAML → list stage. Stage fotometrik yang berurutan
+    (shadow / brightness / noise) digabung menjadi satu PhotometricStage
+    selama urutannya sama dengan urutan pass gabungan (shadow → brightness
+    → noise). Stage yang datang "mundur" (mis. brightness setelah noise)
+    memulai PhotometricStage baru, jadi urutan di YAML selalu dihormati.
+    """
+    stages = []
+    photo = None
+    for spec in specs or ():
+        spec = dict(spec)
+        kind = spec.pop('type')
+        if kind not in STAGE_TYPES:
+            raise ValueError(f"Stage tidak dikenal: {kind!r} (ada: {STAGE_TYPES})")
+        if kind in PHOTOMETRIC:
+            rank = PHOTOMETRIC.index(kind)
+            if photo is not None and any(PHOTOMETRIC.index(k) >= rank for k in photo):
+                stages.append(PhotometricStage(**photo))
+                photo = None
+            if photo is None:
+                photo = {}
+            if kind == 'shadow':
+                photo['shadow'] = True
+            elif kind == 'brightness':
+                photo['brightness'] = spec.get('range', DARK_RANGE)
+            else:
+                photo['noise'] = spec.get('sigma', NOISE_SIGMA_RANGE)
+            continue
+        if photo is not None:
+            stages.append(PhotometricStage(**photo))
+            photo = None
+        stages.append(ClaheStage(**spec) if kind == 'clahe' else ResizeStage(**spec))
+    if photo is not None:
+        stages.append(PhotometricStage(**photo))
+    return stages
+
+
+def _target_size(specs):
+    """Ukuran resize di base stage → JPEG besar boleh di-decode tereduksi"""
+    for spec in specs or ():
+        if spec['type'] == 'resize':
+            return tuple(spec.get('size', (640, 640)))
+    return None
+
+
+# =========================================================
+# 🔹 Config
+# =========================================================
+def load_build_config(path):
+    """Baca configs/build.yaml; path relatif dihitung dari root repo"""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    for key in ('source', 'target', 'data_yaml'):
+        if config.get(key):
+            p = Path(config[key])
+            config[key] = str(p if p.is_absolute() else ROOT_DIR / p)
+    if not config.get('variants'):
+        raise ValueError("Config build harus punya minimal satu variant")
+    build_stages(config.get('base'))
+    for stages in config['variants'].values():
+        build_stages(stages)
+    return config
+
+
+def config_digest(config):
+    """Hash bagian config yang memengaruhi isi output"""
+    keys = ('base', 'variants', 'seed', 'jpeg_quality')
+    blob = json.dumps({k: config.get(k) for k in keys}, sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+# =========================================================
+# 🔹 Worker
+# =========================================================
+_state = None
+
+
+def _init_worker(config):
+    global _state
+    cv2.setNumThreads(1)
+    _state = {
+        'base': build_stages(config.get('base')),
+        'target_size': _target_size(config.get('base')),
+        'variants': [(name, build_stages(specs)) for name, specs in config['variants'].items()],
+        'quality': int(config.get('jpeg_quality', 95)),
+        'store': DedupManifest(config['target'], mode=config.get('link_mode', 'auto')),
+    }
+
+
+def _output_stem(stem, variant):
+    return stem if variant == 'original' else f"{stem}_{variant}"
+
+
+def _build_one(task):
+    """
+    Satu gambar sumber → semua variasi (decode sekali).
+
+    Returns:
+        (key, mtime_ns, size, jumlah ditulis, entri manifest, gagal)
+    """
+    key, img_path, label_path, out_images, out_labels, seed, mtime_ns, size = task
+    img_path = Path(img_path)
+    store = _state['store']
+    entries = []
+
+    base_stages = _state['base']
+    image = None
+    if base_stages or any(stages for _, stages in _state['variants']):
+        image = read_image(img_path, _state['target_size'])
+        if image is None:
+            return key, mtime_ns, size, 0, entries, True
+        for stage in base_stages:
+            image = stage(image, None)
+
+    label_digest = file_digest(label_path) if label_path else None
+    written = 0
+    for index, (variant, stages) in enumerate(_state['variants']):
+        stem = _output_stem(img_path.stem, variant)
+        out_img = Path(out_images) / f"{stem}{img_path.suffix}"
+
+        if not base_stages and not stages:
+            # Tanpa stage sama sekali → link file asli, tanpa encode ulang
+            store.put_file(img_path, out_img)
+        else:
+            rng = np.random.default_rng((seed, index))
+            result = image
+            for stage in stages:
+                result = stage(result, rng)
+            params = [cv2.IMWRITE_JPEG_QUALITY, _state['quality']] \
+                if img_path.suffix.lower() in ('.jpg', '.jpeg') else []
+            ok, buffer = cv2.imencode(img_path.suffix, result, params)
+            if not ok:
+                continue
+            # Output lama bisa saja hardlink ke gambar sumber (variant tanpa
+            # stage di build sebelumnya) → lepas dulu sebelum menulis
+            if out_img.is_file() and not out_img.is_symlink() and out_img.stat().st_nlink > 1:
+                out_img.unlink()
+            store.put_bytes(buffer.tobytes(), out_img)
+        entries.append(store.entry(out_img))
+
+        if label_digest is not None:
+            out_lbl = Path(out_labels) / f"{stem}.txt"
+            store.put_file(label_path, out_lbl, digest=label_digest)
+            entries.append(store.entry(out_lbl))
+        written += 1
+    return key, mtime_ns, size, written, entries, False
+
+
+# =========================================================
+# 🔹 Runner
+# =========================================================
+def _outputs_exist(split_dir, name, has_label, variants):
+    """Semua gambar (dan label, jika sumber punya label) tiap variant masih ada"""
+    stem, suffix = os.path.splitext(name)
+    for variant in variants:
+        out = _output_stem(stem, variant)
+        if not os.path.exists(split_dir / 'images' / (out + suffix)):
+            return False
+        if has_label and not os.path.exists(split_dir / 'labels' / (out + '.txt')):
+            return False
+    return True
+
+
+def _image_seed(base_seed, key):
+    return (base_seed * 1_000_003 + zlib.crc32(key.encode('utf-8'))) & 0xFFFFFFFF
+
+
+def build_dataset(config, force=False, log=print):
+    """
+    Jalankan pipeline build sesuai config (lihat configs/build.yaml).
+
+    Tiap gambar sumber di-decode sekali; base stage dijalankan sekali,
+    lalu setiap variant menerapkan stage-nya di memori dan ditulis.
+    Sumber yang tidak berubah sejak build terakhir (mtime/size, config
+    sama) dilewati.
+
+    Returns:
+        dict ringkasan per split
+    """
+    source = Path(config['source'])
+    target = Path(config['target'])
+    splits = config.get('splits', ['train', 'val'])
+    workers = config.get('workers') or os.cpu_count() or 1
+    chunksize = config.get('chunksize', 8)
+    seed = config.get('seed', 0)
+
+    builds = BuildManifest(target, params={'config': config_digest(config)})
+    manifest = DedupManifest(target, mode=config.get('link_mode', 'auto'))
+    for split in splits:
+        (target / split / 'images').mkdir(parents=True, exist_ok=True)
+        (target / split / 'labels').mkdir(parents=True, exist_ok=True)
+
+    if workers > 1:
+        pool = Pool(processes=workers, initializer=_init_worker, initargs=(config,))
+    else:
+        pool = None
+        _init_worker(config)
+
+    summary = {}
+    seen = []
+    variants = list(config['variants'])
+    try:
+        for split in splits:
+            image_dir = source / split / 'images'
+            label_dir = source / split / 'labels'
+            if not image_dir.exists():
+                log(f"Warning: {image_dir} tidak ditemukan!")
+                continue
+            counts = {'images': 0, 'skipped': 0, 'written': 0, 'failed': 0}
+
+            # Daftar task dibuat penuh di thread utama (bukan generator yang
+            # dijalankan thread feeder Pool bersamaan dengan builds.record())
+            tasks = []
+            with os.scandir(image_dir) as entries:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    if not entry.name.lower().endswith(IMAGE_SUFFIXES):
+                        continue
+                    key = f"{split}/{entry.name}"
+                    seen.append(key)
+                    counts['images'] += 1
+                    stat = entry.stat()
+                    label = label_dir / f"{Path(entry.name).stem}.txt"
+                    if not force and builds.status(key, stat) == 'fresh' \
+                            and _outputs_exist(target / split, entry.name, label.exists(), variants):
+                        counts['skipped'] += 1
+                        continue
+                    tasks.append((key, entry.path, str(label) if label.exists() else None,
+                                  str(target / split / 'images'), str(target / split / 'labels'),
+                                  _image_seed(seed, key), stat.st_mtime_ns, stat.st_size))
+
+            results = pool.imap_unordered(_build_one, tasks, chunksize) if pool \
+                else map(_build_one, tasks)
+            start = last = time.perf_counter()
+            done = 0
+            for key, mtime_ns, size, written, entries, failed in results:
+                manifest.update(entries)
+                done += 1
+                counts['written'] += written
+                if failed:
+                    counts['failed'] += 1
+                else:
+                    builds.record(key, mtime_ns, size)
+                now = time.perf_counter()
+                if now - last >= PROGRESS_INTERVAL:
+                    log(f"  [{split}] {done} gambar | {done / (now - start):.1f} img/s")
+                    last = now
+            counts['seconds'] = round(time.perf_counter() - start, 2)
+            summary[split] = counts
+            manifest.save()
+            builds.save()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    removed = _remove_orphans(source, target, splits, seen, variants, manifest)
+    if removed:
+        log(f"🧹 {removed} file output lama (variant/sumber yang sudah tidak ada) dihapus")
+        manifest.save()
+    builds.prune(seen)
+    builds.save()
+    if config.get('data_yaml'):
+        write_data_yaml(config, splits)
+    return summary
+
+
+def _remove_orphans(source, target, splits, seen, variants, manifest):
+    """
+    Hapus file di <target>/<split>/{images,labels} yang tidak lagi
+    dihasilkan oleh sumber + variant saat ini (variant dihapus dari
+    build.yaml, gambar/label sumber dihapus). Split yang folder sumbernya
+    tidak ada tidak disentuh.
+
+    Returns:
+        jumlah file yang dihapus
+    """
+    expected = {split: (set(), set()) for split in splits
+                if (source / split / 'images').exists()}
+    for key in seen:
+        split, name = key.split('/', 1)
+        stem, suffix = os.path.splitext(name)
+        has_label = (source / split / 'labels' / f"{stem}.txt").exists()
+        images, labels = expected[split]
+        for variant in variants:
+            out = _output_stem(stem, variant)
+            images.add(out + suffix)
+            if has_label:
+                labels.add(out + '.txt')
+
+    removed = 0
+    for split, (images, labels) in expected.items():
+        for folder, keep in (('images', images), ('labels', labels)):
+            with os.scandir(target / split / folder) as entries:
+                orphans = [e.path for e in entries if e.is_file() and e.name not in keep]
+            for path in orphans:
+                os.remove(path)
+                manifest.remove(path)
+                removed += 1
+    return removed
+
+
+def write_data_yaml(config, splits):
+    """Tulis data.yaml YOLO yang menunjuk ke dataset hasil build"""
+    data = {'path': Path(config['target']).as_posix()}
+    for split in splits:
+        data['val' if split in ('val', 'valid') else split] = f"{split}/images"
+    names = config.get('names')
+    if not names:
+        with open(ROOT_DIR / 'configs' / 'data.yaml', 'r', encoding='utf-8') as f:
+            names = yaml.safe_load(f)['names']
+    data.update({'nc': len(names), 'names': names})
+    with open(config['data_yaml'], 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True)
@@ -0,0 +1,229 @@
+"""Label store kolumnar: semua label YOLO satu split dalam satu array float32 (satu file .npz)"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from src.core.preprocess import IMAGE_SUFFIXES
+
+STORE_NAME = 'labels.npz'        # Disimpan di <split>/labels.npz (sebelah images/ & labels/)
+COLUMNS = ('image', 'cls', 'x', 'y', 'w', 'h')
+IMAGE, CLS, X, Y, W, H = range(len(COLUMNS))
+
+
+def default_path(labels_dir):
+    return Path(labels_dir).parent / STORE_NAME
+
+
+def _parse(path):
+    """Baris label YOLO valid → list (cls, x, y, w, h); baris rusak diabaikan"""
+    rows = []
+    with open(path, 'rb') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 5:
+                continue
+            try:
+                rows.append((int(parts[0]), float(parts[1]), float(parts[2]),
+                             float(parts[3]), float(parts[4])))
+            except ValueError:
+                continue
+    return rows
+
+
+class LabelStore:
+    """
+    Semua box satu split sebagai array `rows` float32 (N, 6):
+    [image id, class, x center, y center, w, h] (ternormalisasi).
+
+    Baris diurutkan per image id, jadi box satu gambar adalah satu irisan
+    `rows[offsets[i]:offsets[i + 1]]`. `images` berisi nama file gambar
+    (atau stem label jika dibangun tanpa folder gambar); gambar tanpa box
+    tetap tercatat sehingga export menghasilkan file label kosong.
+    """
+
+    def __init__(self, images, rows, mtimes=None, sizes=None):
+        self.images = list(images)
+        self.rows = np.ascontiguousarray(rows, dtype=np.float32).reshape(-1, len(COLUMNS))
+        n = len(self.images)
+        self.mtimes = np.zeros(n, np.int64) if mtimes is None else np.asarray(mtimes, np.int64)
+        self.sizes = np.full(n, -1, np.int64) if sizes is None else np.asarray(sizes, np.int64)
+        ids = self.rows[:, IMAGE].astype(np.int64)
+        self.offsets = np.searchsorted(ids, np.arange(n + 1))
+        self._lookup = None
+
+    def __len__(self):
+        return len(self.images)
+
+    @property
+    def num_boxes(self):
+        return len(self.rows)
+
+    # -----------------------------------------------------
+    # Build / load / save / export
+    # -----------------------------------------------------
+    @classmethod
+    def build(cls, labels_dir, images_dir=None, previous=None):
+        """
+        Baca semua file label sekali.
+
+        Args:
+            labels_dir: Folder .txt YOLO
+            images_dir: Folder gambar (opsional) → gambar tanpa label ikut tercatat
+            previous: LabelStore lama; label dengan mtime/size sama tidak dibaca ulang
+
+        Returns:
+            (LabelStore, jumlah file label yang benar-benar dibaca)
+        """
+        labels = {}
+        if Path(labels_dir).exists():
+            with os.scandir(labels_dir) as entries:
+                labels = {e.name[:-4]: e for e in entries
+                          if e.name.endswith('.txt') and e.name != 'classes.txt'}
+        if images_dir is not None:
+            with os.scandir(images_dir) as entries:
+                images = sorted(e.name for e in entries if e.name.lower().endswith(IMAGE_SUFFIXES))
+        else:
+            images = sorted(labels)
+
+        cached = {}
+        if previous is not None:
+            cached = {name: i for i, name in enumerate(previous.images)}
+
+        blocks, mtimes, sizes = [], [], []
+        read = 0
+        for image_id, name in enumerate(images):
+            entry = labels.get(os.path.splitext(name)[0] if images_dir is not None else name)
+            if entry is None:
+                blocks.append(np.zeros((0, len(COLUMNS)), np.float32))
+                mtimes.append(0)
+                sizes.append(-1)
+                continue
+            stat = entry.stat()
+            old = cached.get(name)
+            if old is not None and previous.mtimes[old] == stat.st_mtime_ns \
+                    and previous.sizes[old] == stat.st_size:
+                block = previous.boxes(old).copy()
+            else:
+                parsed = _parse(entry.path)
+                block = np.empty((len(parsed), len(COLUMNS)), np.float32)
+                if parsed:
+                    block[:, CLS:] = parsed
+                read += 1
+            block[:, IMAGE] = image_id
+            blocks.append(block)
+            mtimes.append(stat.st_mtime_ns)
+            sizes.append(stat.st_size)
+
+        rows = np.concatenate(blocks) if blocks else np.zeros((0, len(COLUMNS)), np.float32)
+        return cls(images, rows, mtimes, sizes), read
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['images'].tolist(), data['rows'], data['mtimes'], data['sizes'])
+
+    @classmethod
+    def load_or_build(cls, labels_dir, images_dir=None, path=None):
+        """
+        Store dari file jika ada, label yang berubah dibaca ulang, lalu disimpan.
+
+        Returns:
+            (LabelStore, jumlah file label yang dibaca)
+        """
+        path = Path(path) if path else default_path(labels_dir)
+        previous = cls.load(path) if path.exists() else None
+        store, read = cls.build(labels_dir, images_dir, previous)
+        if previous is None or read or store.images != previous.images:
+            store.save(path)
+        return store, read
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + '.tmp.npz')
+        np.savez(tmp, rows=self.rows, images=np.array(self.images, dtype=str),
+                 mtimes=self.mtimes, sizes=self.sizes)
+        os.replace(tmp, path)
+        return path
+
+    def export(self, labels_dir):
+        """Tulis kembali satu .txt YOLO per gambar (format 6 desimal)"""
+        labels_dir = Path(labels_dir)
+        labels_dir.mkdir(parents=True, exist_ok=True)
+        for i, name in enumerate(self.images):
+            lines = ''.join(f"{int(r[CLS])} {r[X]:.6f} {r[Y]:.6f} {r[W]:.6f} {r[H]:.6f}\n"
+                            for r in self.boxes(i).tolist())
+            with open(labels_dir / (os.path.splitext(name)[0] + '.txt'), 'w', encoding='utf-8') as f:
+                f.write(lines)
+        return len(self.images)
+
+    # -----------------------------------------------------
+    # Query (vektor)
+    # -----------------------------------------------------
+    def index_of(self, name):
+        if self._lookup is None:
+            self._lookup = {n: i for i, n in enumerate(self.images)}
+        return self._lookup[name]
+
+    def boxes(self, image):
+        """Baris box satu gambar (index atau nama) — view, bukan salinan"""
+        i = image if isinstance(image, (int, np.integer)) else self.index_of(image)
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+    def class_ids(self):
+        return self.rows[:, CLS].astype(np.int64)
+
+    def class_counts(self, num_classes=None):
+        """Jumlah box per kelas"""
+        cls = self.class_ids()
+        return np.bincount(cls[cls >= 0], minlength=num_classes or 0)
+
+    def image_counts(self, num_classes=2):
+        """Histogram kelas per gambar: array (jumlah gambar, num_classes)"""
+        ids = self.rows[:, IMAGE].astype(np.int64)
+        cls = self.class_ids()
+        keep = (cls >= 0) & (cls < num_classes)
+        flat = np.bincount(ids[keep] * num_classes + cls[keep],
+                           minlength=len(self.images) * num_classes)
+        return flat.reshape(len(self.images), num_classes)
+
+    def images_with_class(self, cls, min_count=1):
+        """Nama gambar yang punya minimal `min_count` box kelas `cls`"""
+        counts = self.image_counts(max(int(cls) + 1, 2))[:, cls]
+        return [self.images[i] for i in np.flatnonzero(counts >= min_count)]
+
+    def empty_images(self):
+        """Nama gambar tanpa box sama sekali"""
+        return [self.images[i] for i in np.flatnonzero(np.diff(self.offsets) == 0)]
+
+    def box_size_histogram(self, bins=10, imgsz=None, cls=None, range_=None):
+        """
+        Histogram ukuran box (akar luas). imgsz=None → ternormalisasi (0-1),
+        imgsz=640 → piksel di input model.
+
+        Returns:
+            (counts, edges) seperti np.histogram
+        """
+        rows = self.rows if cls is None else self.rows[self.rows[:, CLS] == cls]
+        size = np.sqrt(rows[:, W] * rows[:, H])
+        if imgsz:
+            size = size * imgsz
+        if range_ is None:
+            range_ = (0.0, float(imgsz or 1.0))
+        return np.histogram(size, bins=bins, range=range_)
+
+    def summary(self, names=None, num_classes=2):
+        """Ringkasan dict untuk dicetak / disimpan"""
+        counts = self.class_counts(num_classes)
+        names = names or {}
+        return {
+            'images': len(self.images),
+            'boxes': self.num_boxes,
+            'empty_images': int((np.diff(self.offsets) == 0).sum()),
+            'per_class': {names.get(c, str(c)): int(n) for c, n in enumerate(counts)},
+            'images_per_class': {names.get(c, str(c)): int(n)
+                                 for c, n in enumerate((self.image_counts(num_classes) > 0).sum(0))},
+            'out_of_range': int(((self.rows[:, X:] < 0) | (self.rows[:, X:] > 1)).any(1).sum()),
+        }
@@ -0,0 +1,100 @@
+"""Motion gate: jalankan YOLO hanya jika frame berubah (atau hasil sudah basi)"""
+
+import time
+
+import cv2
+import numpy as np
+
+GATE_SIZE = (80, 60)        # Resolusi grayscale untuk perbandingan (w, h)
+
+
+class MotionGate:
+    """
+    Detektor perubahan murah berbasis selisih grayscale kecil.
+
+    Frame dibandingkan dengan frame referensi (frame saat inference
+    terakhir), bukan frame sebelumnya, sehingga perubahan pelan (mobil
+    masuk perlahan) tetap terakumulasi sampai melewati threshold.
+
+    Args:
+        threshold: Fraksi piksel berubah (0-1) agar inference dijalankan
+        pixel_delta: Selisih intensitas minimum agar piksel dianggap berubah
+        max_staleness: Detik maksimal hasil lama boleh dipakai ulang
+        regions: List (x0, y0, x1, y1) ternormalisasi 0-1; None = global.
+                 Inference jalan jika salah satu region melewati threshold
+        size: Resolusi perbandingan (w, h)
+    """
+
+    def __init__(self, threshold=0.01, pixel_delta=25, max_staleness=5.0,
+                 regions=None, size=GATE_SIZE):
+        self.threshold = threshold
+        self.pixel_delta = pixel_delta
+        self.max_staleness = max_staleness
+        self.size = size
+
+        w, h = size
+        self._regions = []
+        for x0, y0, x1, y1 in regions or [(0.0, 0.0, 1.0, 1.0)]:
+            self._regions.append((slice(int(y0 * h), max(int(y1 * h), int(y0 * h) + 1)),
+                                  slice(int(x0 * w), max(int(x1 * w), int(x0 * w) + 1))))
+
+        self._gray = np.empty((h, w), np.uint8)
+        self._reference = None
+        self._diff = np.empty((h, w), np.uint8)
+        self._last_infer = 0.0
+
+        self.checked = 0
+        self.skipped = 0
+        self.changed_regions = []   # index region yang berubah di cek terakhir
+
+    @classmethod
+    def from_rects(cls, rects, image_size, **kwargs):
+        """Buat gate per region dari rect piksel (mis. SlotMap.rects)"""
+        w, h = image_size
+        regions = [(x0 / w, y0 / h, x1 / w, y1 / h) for x0, y0, x1, y1 in rects]
+        return cls(regions=regions, **kwargs)
+
+    def _small_gray(self, frame):
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        else:
+            self._gray[...] = small
+        # Blur ringan agar noise sensor / kompresi tidak dihitung gerakan
+        cv2.GaussianBlur(self._gray, (5, 5), 0, dst=self._gray)
+        return self._gray
+
+    def should_infer(self, frame, now=None, force=False):
+        """
+        True jika frame perlu inference; panggil mark_inferred() setelahnya.
+        force=True selalu True, tapi frame tetap diproses agar referensi ikut maju.
+        """
+        now = time.monotonic() if now is None else now
+        gray = self._small_gray(frame)
+        self.checked += 1
+
+        if force or self._reference is None or now - self._last_infer >= self.max_staleness:
+            self.changed_regions = list(range(len(self._regions)))
+            return True
+
+        cv2.absdiff(gray, self._reference, dst=self._diff)
+        changed = self._diff > self.pixel_delta
+        self.changed_regions = [i for i, (rows, cols) in enumerate(self._regions)
+                                if changed[rows, cols].mean() > self.threshold]
+        if self.changed_regions:
+            return True
+
+        self.skipped += 1
+        return False
+
+    def mark_inferred(self, now=None):
+        """Simpan frame terakhir yang dicek sebagai referensi baru"""
+        self._last_infer = time.monotonic() if now is None else now
+        if self._reference is None:
+            self._reference = self._gray.copy()
+        else:
+            self._reference[...] = self._gray
+
+    @property
+    def skip_ratio(self):
+        return self.skipped / self.checked if self.checked else 0.0
@@ -0,0 +1,109 @@
+"""Augmentasi on-the-fly (bayangan, gelap, noise) untuk training Ultralytics"""
+
+import numpy as np
+from ultralytics.models.yolo.detect import DetectionTrainer
+
+from src.core.augment import AUG_TYPES, get_kernel
+
+try:
+    from torch.utils.data import get_worker_info
+except ImportError:   # pragma: no cover - torch selalu ada bersama ultralytics
+    def get_worker_info():
+        return None
+
+
+class OnlineAugment:
+    """
+    Transform Ultralytics: augmentasi gambar training di memori saat load.
+
+    Dipasang tepat sebelum `Format` (setelah mosaic/perspective), jadi tiap
+    epoch mendapat variasi baru tanpa dataset augmentasi di disk.
+
+    Args:
+        p: Peluang satu sampel diaugmentasi (0.75 ≈ 3 variasi + 1 asli)
+        aug_types: Tipe yang boleh dipilih (lihat src.core.augment.AUG_TYPES)
+        seed: Seed policy; None = acak. Tiap worker DataLoader memakai
+              stream sendiri yang diturunkan dari (seed, worker id)
+    """
+
+    def __init__(self, p=0.75, aug_types=AUG_TYPES, seed=None):
+        self.p = p
+        self.aug_types = tuple(aug_types)
+        self.seed = seed
+        self._rng = None
+        self._worker = None
+
+    def _generator(self):
+        info = get_worker_info()
+        worker = info.id if info is not None else 0
+        if self._rng is None or self._worker != worker:
+            key = None if self.seed is None else (self.seed, worker)
+            self._rng = np.random.default_rng(key)
+            self._worker = worker
+        return self._rng
+
+    def __call__(self, labels):
+        rng = self._generator()
+        if rng.random() >= self.p:
+            return labels
+
+        img = labels['img']
+        aug_type = self.aug_types[rng.integers(len(self.aug_types))]
+        # out=None → array baru; gambar cache RAM milik dataset tidak diubah
+        labels['img'] = get_kernel(img.shape).apply(np.ascontiguousarray(img), aug_type, rng)
+        return labels
+
+
+def _insert_before_format(transforms, augment):
+    """Sisipkan augment sebelum transform terakhir (Format)"""
+    items = transforms.transforms
+    if any(t is augment for t in items):
+        return transforms
+    items.insert(max(len(items) - 1, 0), augment)
+    return transforms
+
+
+class _AugmentedBuild:
+    """Pengganti dataset.build_transforms yang tetap bisa di-pickle (worker)"""
+
+    def __init__(self, build, augment):
+        self.build = build
+        self.augment = augment
+
+    def __call__(self, hyp=None):
+        return _insert_before_format(self.build(hyp), self.augment)
+
+
+def attach_online_augment(dataset, augment):
+    """
+    Pasang OnlineAugment ke YOLODataset training.
+
+    build_transforms ikut dibungkus karena Ultralytics membangun ulang
+    transform saat close_mosaic di epoch-epoch terakhir.
+    """
+    dataset.build_transforms = _AugmentedBuild(dataset.build_transforms, augment)
+    _insert_before_format(dataset.transforms, augment)
+    return dataset
+
+
+class OnlineAugmentTrainer(DetectionTrainer):
+    """
+    DetectionTrainer dengan augmentasi parkir on-the-fly di split train.
+
+    Label tetap dibaca sekali dan di-cache oleh Ultralytics (labels.cache);
+    gunakan `cache='ram'` agar JPEG juga cukup di-decode sekali.
+    """
+
+    augment = OnlineAugment()
+
+    def build_dataset(self, img_path, mode='train', batch=None):
+        dataset = super().build_dataset(img_path, mode, batch)
+        if mode == 'train':
+            attach_online_augment(dataset, self.augment)
+        return dataset
+
+
+def online_trainer(p=0.75, aug_types=AUG_TYPES, seed=0):
+    """Buat kelas trainer dengan policy augmentasi tertentu (untuk model.train)"""
+    return type('OnlineAugmentTrainer', (OnlineAugmentTrainer,),
+                {'augment': OnlineAugment(p=p, aug_types=aug_types, seed=seed)})
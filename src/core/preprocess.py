@@ -0,0 +1,123 @@
+"""Preprocessing gambar: CLAHE grayscale + blur + resize, decode langsung di ukuran kecil"""
+
+import struct
+
+import cv2
+
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+JPEG_SUFFIXES = ('.jpg', '.jpeg')
+
+# Faktor skala DCT libjpeg → flag imread (warna, grayscale)
+READ_FLAGS = {
+    1: (cv2.IMREAD_COLOR, cv2.IMREAD_GRAYSCALE),
+    2: (cv2.IMREAD_REDUCED_COLOR_2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+    4: (cv2.IMREAD_REDUCED_COLOR_4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    8: (cv2.IMREAD_REDUCED_COLOR_8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+}
+
+
+# =========================================================
+# 🔹 Ukuran gambar dari header (tanpa decode)
+# =========================================================
+def _jpeg_size(f):
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:             # Byte pengisi sebelum marker
+            f.seek(-1, 1)
+            continue
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        length = struct.unpack('>H', f.read(2))[0]
+        # SOF0..SOF15 kecuali DHT (C4), JPG (C8), DAC (CC)
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            h, w = struct.unpack('>xHH', f.read(5))
+            return w, h
+        f.seek(length - 2, 1)
+
+
+def image_size(path):
+    """(lebar, tinggi) dari header JPEG/PNG, atau None jika tidak dikenali"""
+    with open(path, 'rb') as f:
+        head = f.read(24)
+        if head[:2] == b'\xff\xd8':
+            return _jpeg_size(f)
+        if head[:8] == b'\x89PNG\r\n\x1a\n':
+            return struct.unpack('>II', head[16:24])
+    return None
+
+
+def reduction_factor(size, target):
+    """
+    Faktor 8/4/2 terbesar yang masih menghasilkan gambar ≥ target di kedua sisi.
+
+    Decode JPEG di 1/2, 1/4, 1/8 resolusi memakai skala DCT libjpeg, jauh
+    lebih murah daripada decode penuh lalu resize.
+    """
+    if size is None or target is None:
+        return 1
+    (w, h), (tw, th) = size, target
+    for factor in (8, 4, 2):
+        if w // factor >= tw and h // factor >= th:
+            return factor
+    return 1
+
+
+def read_image(path, target=None, grayscale=False):
+    """
+    cv2.imread, tapi JPEG besar di-decode langsung di resolusi tereduksi
+    jika hasil akhirnya akan di-resize ke `target` (lebar, tinggi).
+    """
+    path = str(path)
+    factor = 1
+    if target is not None and path.lower().endswith(JPEG_SUFFIXES):
+        try:
+            factor = reduction_factor(image_size(path), target)
+        except (OSError, struct.error):
+            factor = 1
+    return cv2.imread(path, READ_FLAGS[factor][1 if grayscale else 0])
+
+
+# =========================================================
+# 🔹 CLAHE
+# =========================================================
+class ClaheProcessor:
+    """
+    Grayscale → CLAHE → Gaussian blur ringan → resize.
+
+    Objek CLAHE OpenCV dibuat sekali per instance (satu per proses worker).
+
+    Args:
+        size: Ukuran output (lebar, tinggi); None = ukuran asli
+        clip_limit, tile_grid: Parameter CLAHE
+        blur_ksize: Kernel Gaussian blur (0 = tanpa blur)
+    """
+
+    def __init__(self, size=(640, 640), clip_limit=2.0, tile_grid=(8, 8), blur_ksize=3):
+        self.size = tuple(size) if size else None
+        self.clip_limit = clip_limit
+        self.tile_grid = tuple(tile_grid)
+        self.blur_ksize = blur_ksize
+        self._clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=self.tile_grid)
+
+    def params(self):
+        """Pengaturan yang memengaruhi output (disimpan di manifest build)"""
+        return {'size': list(self.size) if self.size else None, 'clip_limit': self.clip_limit,
+                'tile_grid': list(self.tile_grid), 'blur_ksize': self.blur_ksize}
+
+    def read(self, path):
+        """Decode grayscale (tereduksi jika bisa) siap untuk __call__"""
+        return read_image(path, self.size, grayscale=True)
+
+    def __call__(self, image):
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        enhanced = self._clahe.apply(gray)
+        if self.blur_ksize:
+            enhanced = cv2.GaussianBlur(enhanced, (self.blur_ksize, self.blur_ksize), 0)
+        if self.size and enhanced.shape[1::-1] != self.size:
+            interpolation = cv2.INTER_AREA if enhanced.shape[1] > self.size[0] else cv2.INTER_LINEAR
+            enhanced = cv2.resize(enhanced, self.size, interpolation=interpolation)
+        return enhanced
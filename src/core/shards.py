@@ -0,0 +1,430 @@
+"""Shard gambar ter-decode (memory-mapped) + index offset: decode JPEG sekali, baca zero-copy"""
+
+import json
+import math
+import os
+import struct
+import time
+from collections import OrderedDict
+from multiprocessing import Pool
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.core.preprocess import IMAGE_SUFFIXES, image_size, read_image
+
+INDEX_NAME = 'index.json'
+SHARD_MODES = ('resize', 'letterbox')
+DECODE_MODES = ('exact', 'fast')
+PAD_VALUE = 114                  # Sama dengan letterbox YOLO
+DEFAULT_SHARD_MB = 512           # Ukuran maksimal satu file shard
+DEFAULT_MAX_BYTES = 2 << 30      # Batas shard yang di-map bersamaan oleh satu reader
+PROGRESS_INTERVAL = 2.0
+
+
+def _shard_path(root, shard):
+    return Path(root) / f"shard_{shard:04d}.bin"
+
+
+# =========================================================
+# 🔹 Index
+# =========================================================
+class ShardIndex:
+    """
+    index.json milik satu folder shard.
+
+    Tiap gambar menempati satu slot berukuran tetap (imgsz × imgsz × 3
+    uint8); slot k ada di shard k // rows_per_shard, offset byte
+    (k % rows_per_shard) × row_bytes. Entri file:
+    nama → [slot, mtime_ns, size, h0, w0, h, w]
+    (ukuran asli lalu ukuran setelah resize).
+    """
+
+    def __init__(self, root, params):
+        self.root = Path(root)
+        self.path = self.root / INDEX_NAME
+        self.params = params
+        imgsz = params['imgsz']
+        self.row_shape = (imgsz, imgsz, 3)
+        self.row_bytes = imgsz * imgsz * 3
+        self.rows_per_shard = max(params['shard_mb'] * (1 << 20) // self.row_bytes, 1)
+        self.files = {}
+        self.free = []          # slot bekas gambar yang dihapus / gagal
+        self.next_slot = 0
+
+    @classmethod
+    def load(cls, root):
+        """Index tersimpan, atau None jika belum ada / rusak"""
+        try:
+            with open(Path(root) / INDEX_NAME, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        index = cls(root, data['params'])
+        index.files = data['files']
+        index.free = data.get('free', [])
+        index.next_slot = data.get('next_slot', 0)
+        return index
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(INDEX_NAME + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'params': self.params,
+                       'rows_per_shard': self.rows_per_shard, 'next_slot': self.next_slot,
+                       'free': sorted(self.free), 'files': self.files}, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    @property
+    def num_shards(self):
+        return math.ceil(self.next_slot / self.rows_per_shard)
+
+    def locate(self, slot):
+        """slot → (shard, row)"""
+        return divmod(slot, self.rows_per_shard)
+
+    def allocate(self):
+        if self.free:
+            return self.free.pop()
+        slot = self.next_slot
+        self.next_slot += 1
+        return slot
+
+    def release(self, name):
+        entry = self.files.pop(name, None)
+        if entry is not None:
+            self.free.append(entry[0])
+
+
+# =========================================================
+# 🔹 Build
+# =========================================================
+def resize_shape(h0, w0, imgsz):
+    """Ukuran (h, w) sisi panjang = imgsz; rumus ukuran sama dengan load_image Ultralytics"""
+    r = imgsz / max(h0, w0)
+    if r == 1:
+        return h0, w0
+    return min(math.ceil(h0 * r), imgsz), min(math.ceil(w0 * r), imgsz)
+
+
+def letterbox_pad(h, w, imgsz):
+    """Offset (kiri, atas) gambar di dalam slot letterbox"""
+    return (imgsz - w) // 2, (imgsz - h) // 2
+
+
+_maps = {}   # shard → memmap tulis, milik proses worker
+
+
+def _writable(path, shape):
+    arr = _maps.get(path)
+    if arr is None:
+        arr = _maps[path] = np.memmap(path, dtype=np.uint8, mode='r+', shape=shape)
+    return arr
+
+
+def _init_worker():
+    _maps.clear()
+    cv2.setNumThreads(1)
+
+
+def _decode_one(task):
+    """
+    Decode satu gambar → resize → tulis langsung ke slot-nya di shard.
+    Proses utama hanya menerima metadata.
+
+    decode 'exact': decode resolusi penuh + INTER_LINEAR, piksel sama
+    dengan load_image Ultralytics saat training. 'fast': JPEG besar
+    di-decode tereduksi (1/2, 1/4, 1/8) lalu INTER_AREA — lebih cepat,
+    tapi piksel sedikit berbeda dari training tanpa shard.
+    """
+    name, src, shard_path, shape, row, imgsz, mode, decode, mtime_ns, size = task
+    image = read_image(src, (imgsz, imgsz) if decode == 'fast' else None)
+    if image is None:
+        return name, mtime_ns, size, None
+    # Ukuran asli dari header (decode tereduksi mengecilkan image.shape)
+    try:
+        w0, h0 = image_size(src) or image.shape[1::-1]
+    except (OSError, struct.error):
+        h0, w0 = image.shape[:2]
+    h, w = resize_shape(h0, w0, imgsz)
+    if image.shape[:2] != (h, w):
+        if decode == 'fast' and image.shape[0] > h:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_LINEAR     # Sama dengan Ultralytics (mode train)
+        image = cv2.resize(image, (w, h), interpolation=interpolation)
+
+    slot = _writable(shard_path, shape)[row]
+    if mode == 'letterbox':
+        left, top = letterbox_pad(h, w, imgsz)
+        slot[:] = PAD_VALUE
+        slot[top:top + h, left:left + w] = image
+    else:
+        slot[:h, :w] = image
+    return name, mtime_ns, size, (h0, w0, h, w)
+
+
+def build_shards(images_dir, root, imgsz=640, mode='resize', shard_mb=DEFAULT_SHARD_MB,
+                 decode='exact', workers=None, chunksize=8, force=False, log=print):
+    """
+    Decode semua gambar satu folder split ke shard memory-mapped.
+
+    Inkremental: gambar yang mtime/size-nya sama dilewati, gambar berubah
+    ditulis ulang di slot yang sama, gambar baru mengisi slot kosong dulu,
+    gambar yang dihapus melepaskan slotnya. Ganti imgsz/mode/shard_mb/decode
+    (atau force=True) → semua shard dibangun ulang.
+
+    Args:
+        images_dir: Folder gambar satu split (mis. parking_lot_final/train/images)
+        root: Folder output shard + index.json
+        imgsz: Sisi slot; gambar di-resize sisi panjang = imgsz
+        mode: 'resize' (kiri-atas slot, tata letak sama dengan load_image Ultralytics)
+              atau 'letterbox' (tengah, sisa diisi abu-abu 114)
+        shard_mb: Ukuran maksimal satu file shard
+        decode: 'exact' (decode penuh + INTER_LINEAR = piksel training
+                Ultralytics tanpa shard) atau 'fast' (decode JPEG tereduksi
+                + INTER_AREA; lebih cepat, piksel berbeda — pilihan eksplisit
+                yang tercatat di params index.json)
+        workers: Jumlah proses decode (None = semua core, 1 = tanpa pool)
+
+    Returns:
+        dict ringkasan (images, decoded, skipped, removed, failed, shards, seconds)
+    """
+    if mode not in SHARD_MODES:
+        raise ValueError(f"mode harus salah satu dari {SHARD_MODES}, bukan {mode!r}")
+    if decode not in DECODE_MODES:
+        raise ValueError(f"decode harus salah satu dari {DECODE_MODES}, bukan {decode!r}")
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    params = {'imgsz': imgsz, 'mode': mode, 'shard_mb': shard_mb, 'decode': decode,
+              'source': str(Path(images_dir).resolve())}
+
+    index = ShardIndex.load(root)
+    if force or index is None or index.params != params:
+        for old in root.glob('shard_*.bin'):
+            old.unlink()
+        index = ShardIndex(root, params)
+
+    summary = {'images': 0, 'decoded': 0, 'skipped': 0, 'removed': 0, 'failed': 0}
+    with os.scandir(images_dir) as entries:
+        sources = sorted((e for e in entries
+                          if e.is_file() and e.name.lower().endswith(IMAGE_SUFFIXES)),
+                         key=lambda e: e.name)
+    names = {e.name for e in sources}
+    for name in [n for n in index.files if n not in names]:
+        index.release(name)
+        summary['removed'] += 1
+
+    pending = []
+    for entry in sources:
+        summary['images'] += 1
+        stat = entry.stat()
+        known = index.files.get(entry.name)
+        if known is not None and known[1] == stat.st_mtime_ns and known[2] == stat.st_size:
+            summary['skipped'] += 1
+            continue
+        slot = known[0] if known is not None else index.allocate()
+        pending.append((entry.name, entry.path, slot, stat.st_mtime_ns, stat.st_size))
+
+    # File shard dialokasikan penuh sekali (sparse; disk terpakai saat ditulis)
+    shard_bytes = index.rows_per_shard * index.row_bytes
+    shape = (index.rows_per_shard,) + index.row_shape
+    for shard in range(index.num_shards):
+        path = _shard_path(root, shard)
+        if not path.exists() or path.stat().st_size != shard_bytes:
+            with open(path, 'ab') as f:
+                f.truncate(shard_bytes)
+
+    tasks = []
+    for name, src, slot, mtime_ns, size in pending:
+        shard, row = index.locate(slot)
+        tasks.append((name, src, str(_shard_path(root, shard)), shape, row,
+                      imgsz, mode, decode, mtime_ns, size))
+
+    workers = workers or os.cpu_count() or 1
+    pool = None
+    if workers > 1 and len(tasks) > chunksize:
+        pool = Pool(processes=workers, initializer=_init_worker)
+        results = pool.imap_unordered(_decode_one, tasks, chunksize)
+    else:
+        _init_worker()
+        results = map(_decode_one, tasks)
+
+    slots = {name: slot for name, _, slot, _, _ in pending}
+    start = last = time.perf_counter()
+    try:
+        for done, (name, mtime_ns, size, shapes) in enumerate(results, start=1):
+            if shapes is None:
+                summary['failed'] += 1
+                log(f"❌ Gagal decode: {name}")
+                index.files.pop(name, None)
+                index.free.append(slots[name])
+            else:
+                summary['decoded'] += 1
+                index.files[name] = [slots[name], mtime_ns, size, *shapes]
+            now = time.perf_counter()
+            if now - last >= PROGRESS_INTERVAL:
+                log(f"  {done}/{len(tasks)} di-decode | {done / (now - start):.1f} img/s")
+                last = now
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        for arr in _maps.values():
+            arr.flush()
+        _maps.clear()
+
+    index.save()
+    summary['shards'] = index.num_shards
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+    return summary
+
+
+# =========================================================
+# 🔹 Reader
+# =========================================================
+class ShardReader:
+    """
+    Baca gambar dari shard tanpa decode dan tanpa copy (view np.memmap read-only).
+
+    Shard di-map saat pertama dipakai; jika total shard ter-map melebihi
+    `max_bytes`, shard yang paling lama tidak dipakai di-unmap (LRU).
+    View yang masih dipegang pemanggil tetap valid sampai dilepas.
+
+    Dengan `source=path` di get(), mtime/size file sumber dicek: jika
+    berubah sejak build, None dikembalikan (pemanggil decode sendiri) dan
+    nama dicatat di `stale` sampai build_shards() dijalankan ulang.
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        index = ShardIndex.load(root)
+        if index is None:
+            raise FileNotFoundError(f"❌ Index shard tidak ada: {self.root / INDEX_NAME} "
+                                    f"(jalankan scripts/build_shards.py)")
+        self.index = index
+        self.imgsz = index.params['imgsz']
+        self.mode = index.params['mode']
+        self.decode = index.params.get('decode', 'fast')   # index lama = decode tereduksi
+        self.max_bytes = max_bytes
+        self.stale = set()
+        self.hits = 0
+        self.misses = 0
+        self._maps = OrderedDict()
+
+    def __len__(self):
+        return len(self.index.files)
+
+    def __contains__(self, name):
+        return name in self.index.files
+
+    def __getstate__(self):
+        # Worker DataLoader membuka map sendiri
+        state = self.__dict__.copy()
+        state['_maps'] = OrderedDict()
+        return state
+
+    def _map(self, shard):
+        arr = self._maps.get(shard)
+        if arr is not None:
+            self._maps.move_to_end(shard)
+            return arr
+        shape = (self.index.rows_per_shard,) + self.index.row_shape
+        arr = np.memmap(_shard_path(self.root, shard), dtype=np.uint8, mode='r', shape=shape)
+        self._maps[shard] = arr
+        shard_bytes = self.index.rows_per_shard * self.index.row_bytes
+        while len(self._maps) > 1 and len(self._maps) * shard_bytes > self.max_bytes:
+            self._maps.popitem(last=False)
+        return arr
+
+    def shapes(self, name):
+        """((h0, w0) asli, (h, w) setelah resize) atau None"""
+        entry = self.index.files.get(name)
+        return None if entry is None else ((entry[3], entry[4]), (entry[5], entry[6]))
+
+    def get(self, name, source=None):
+        """
+        Gambar BGR uint8 read-only (mode 'resize': h × w, mode 'letterbox':
+        imgsz × imgsz), atau None jika tidak ada / sumber berubah.
+        """
+        entry = self.index.files.get(name)
+        if entry is None or name in self.stale:
+            self.misses += 1
+            return None
+        if source is not None:
+            try:
+                stat = os.stat(source)
+            except OSError:
+                stat = None
+            if stat is None or (stat.st_mtime_ns, stat.st_size) != (entry[1], entry[2]):
+                self.stale.add(name)
+                self.misses += 1
+                return None
+        shard, row = self.index.locate(entry[0])
+        image = self._map(shard)[row]
+        self.hits += 1
+        if self.mode == 'resize':
+            return image[:entry[5], :entry[6]]
+        return image
+
+
+# =========================================================
+# 🔹 Integrasi Ultralytics
+# =========================================================
+class _ShardedLoad:
+    """Pengganti dataset.load_image: shard dulu, decode JPEG hanya jika miss"""
+
+    def __init__(self, dataset, reader, load):
+        self.dataset = dataset
+        self.reader = reader
+        self.load = load          # fungsi load_image asli (unbound → aman di-pickle)
+
+    def __call__(self, i, rect_mode=True):
+        if rect_mode:
+            path = self.dataset.im_files[i]
+            name = os.path.basename(path)
+            image = self.reader.get(name, source=path)
+            if image is not None:
+                # Transform Ultralytics (HSV, dll.) menulis in-place → salin dari map read-only
+                return image.copy(), self.reader.shapes(name)[0], image.shape[:2]
+        return self.load(self.dataset, i, rect_mode)
+
+
+def attach_shards(dataset, reader):
+    """
+    Pasang ShardReader ke YOLODataset Ultralytics. Hanya shard mode
+    'resize' dengan imgsz sama yang cocok dengan load_image bawaan;
+    piksel identik hanya untuk decode 'exact'.
+    """
+    if reader.mode != 'resize' or reader.imgsz != dataset.imgsz:
+        print(f"⚠ Shard {reader.root} (mode {reader.mode}, imgsz {reader.imgsz}) tidak cocok "
+              f"dengan dataset imgsz {dataset.imgsz}, decode biasa dipakai")
+        return dataset
+    if reader.decode != 'exact':
+        print(f"ℹ Shard {reader.root} memakai decode '{reader.decode}' — piksel sedikit "
+              f"berbeda dari decode penuh Ultralytics")
+    dataset.load_image = _ShardedLoad(dataset, reader, type(dataset).load_image)
+    return dataset
+
+
+def sharded_trainer(shard_dirs, base=None):
+    """
+    Kelas trainer yang membaca gambar dari shard.
+
+    Args:
+        shard_dirs: {'train': folder shard, 'val': folder shard}
+        base: Trainer dasar (default DetectionTrainer; boleh hasil online_trainer)
+    """
+    if base is None:
+        from ultralytics.models.yolo.detect import DetectionTrainer
+        base = DetectionTrainer
+
+    def build_dataset(self, img_path, mode='train', batch=None):
+        dataset = base.build_dataset(self, img_path, mode, batch)
+        root = shard_dirs.get(mode)
+        if root and (Path(root) / INDEX_NAME).exists():
+            attach_shards(dataset, ShardReader(root))
+        return dataset
+
+    return type('ShardedTrainer', (base,), {'build_dataset': build_dataset})
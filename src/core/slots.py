@@ -0,0 +1,232 @@
+"""Mode slot tetap (ROI): klasifikasi crop slot parkir, bukan deteksi full-frame"""
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Sama dengan configs/data.yaml
+TERISI = 0
+KOSONG = 1
+UNKNOWN = 255
+CLASS_NAMES = {TERISI: 'terisi', KOSONG: 'kosong'}
+
+CROP_SIZE = 96          # Sisi crop slot yang dikirim ke classifier
+MASK_FILL = 114         # Warna area di luar poligon (abu-abu, sama dgn letterbox YOLO)
+
+
+class SlotMap:
+    """
+    Poligon slot parkir untuk satu kamera statis.
+
+    Disimpan sebagai JSON:
+        {"camera": "lot_a", "image_size": [w, h],
+         "slots": [{"id": 0, "polygon": [[x, y], ...]}, ...]}
+    """
+
+    def __init__(self, polygons, image_size, camera=None, ids=None):
+        self.camera = camera
+        self.image_size = tuple(image_size)          # (w, h) saat registrasi
+        self.polygons = [np.asarray(p, dtype=np.int32).reshape(-1, 2) for p in polygons]
+        self.ids = list(ids) if ids is not None else list(range(len(self.polygons)))
+        self._prepare()
+
+    def __len__(self):
+        return len(self.polygons)
+
+    def _prepare(self):
+        """Hitung bounding rect + mask lokal tiap slot sekali di awal"""
+        w, h = self.image_size
+        self.rects = []
+        self.masks = []
+        for poly in self.polygons:
+            x, y, bw, bh = cv2.boundingRect(poly)
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + bw, w), min(y + bh, h)
+            self.rects.append((x0, y0, x1, y1))
+
+            mask = np.zeros((max(y1 - y0, 1), max(x1 - x0, 1)), np.uint8)
+            cv2.fillPoly(mask, [poly - (x0, y0)], 255)
+            self.masks.append(mask)
+
+        self._crop_masks = {}   # size → (N, S, S) bool, True = di luar poligon
+        self._scaled = {}       # (w, h) → SlotMap hasil scaled_to
+
+    # -----------------------------------------------------
+    # Load / save / kalibrasi
+    # -----------------------------------------------------
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        slots = data['slots']
+        return cls([s['polygon'] for s in slots], data['image_size'],
+                   camera=data.get('camera'), ids=[s['id'] for s in slots])
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'camera': self.camera,
+            'image_size': list(self.image_size),
+            'slots': [{'id': sid, 'polygon': poly.tolist()}
+                      for sid, poly in zip(self.ids, self.polygons)],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+
+    @classmethod
+    def from_detections(cls, result, min_conf=0.5, camera=None):
+        """
+        Seed slot dari satu pass deteksi kalibrasi (box terisi & kosong).
+
+        Box diurutkan atas→bawah lalu kiri→kanan agar id slot stabil.
+        """
+        h, w = result.orig_shape
+        boxes = result.boxes
+        keep = boxes.conf.cpu().numpy() >= min_conf
+        xyxy = boxes.xyxy.cpu().numpy()[keep].round().astype(np.int32)
+
+        # Urutkan per baris (toleransi setengah tinggi box rata-rata)
+        if len(xyxy):
+            row_h = max(int(np.median(xyxy[:, 3] - xyxy[:, 1])) // 2, 1)
+            order = np.lexsort((xyxy[:, 0], xyxy[:, 1] // row_h))
+            xyxy = xyxy[order]
+
+        polygons = [[[x0, y0], [x1, y0], [x1, y1], [x0, y1]] for x0, y0, x1, y1 in xyxy]
+        return cls(polygons, (w, h), camera=camera)
+
+    def scaled_to(self, frame_shape):
+        """SlotMap baru jika resolusi frame beda dengan saat registrasi"""
+        h, w = frame_shape[:2]
+        if (w, h) == self.image_size:
+            return self
+        scaled = self._scaled.get((w, h))
+        if scaled is None:
+            sx, sy = w / self.image_size[0], h / self.image_size[1]
+            polygons = [np.round(p * (sx, sy)).astype(np.int32) for p in self.polygons]
+            scaled = SlotMap(polygons, (w, h), camera=self.camera, ids=self.ids)
+            self._scaled[(w, h)] = scaled
+        return scaled
+
+    def _outside(self, size):
+        outside = self._crop_masks.get(size)
+        if outside is None:
+            outside = np.stack([
+                cv2.resize(m, (size, size), interpolation=cv2.INTER_NEAREST) == 0
+                for m in self.masks
+            ]) if self.masks else np.zeros((0, size, size), bool)
+            self._crop_masks[size] = outside
+        return outside
+
+    # -----------------------------------------------------
+    # Crop
+    # -----------------------------------------------------
+    def crops(self, frame, out=None, size=CROP_SIZE):
+        """
+        Crop semua slot (area luar poligon diisi abu-abu) ke array (N, S, S, 3).
+
+        `out` boleh diberikan agar buffer batch dipakai ulang antar frame.
+        """
+        if out is None:
+            out = np.empty((len(self), size, size, 3), np.uint8)
+        for i, (x0, y0, x1, y1) in enumerate(self.rects):
+            crop = frame[y0:y1, x0:x1]
+            if crop.size == 0:
+                out[i] = MASK_FILL
+                continue
+            cv2.resize(crop, (size, size), dst=out[i], interpolation=cv2.INTER_AREA)
+        out[self._outside(size)] = MASK_FILL
+        return out
+
+
+class SlotClassifier:
+    """
+    Klasifikasi banyak slot (bisa dari banyak kamera) dalam satu batch.
+
+    Args:
+        model: YOLO classify (output probs) atau YOLO detect (dipakai ulang
+               di crop; kelas box paling yakin menentukan status slot)
+        imgsz: Ukuran input model untuk crop
+        conf: Threshold box jika memakai detector
+        device: Device predict
+    """
+
+    def __init__(self, model, imgsz=CROP_SIZE, conf=0.25, device=None):
+        self.model = model
+        self.imgsz = imgsz
+        self.conf = conf
+        self.device = device
+        # Map nama kelas model → TERISI/KOSONG
+        names = getattr(model, 'names', CLASS_NAMES)
+        self._class_map = {idx: next((k for k, v in CLASS_NAMES.items() if v == name), UNKNOWN)
+                           for idx, name in names.items()}
+        self._buffers = {}
+
+    def _buffer(self, n):
+        buf = self._buffers.get(n)
+        if buf is None:
+            buf = self._buffers[n] = np.empty((n, self.imgsz, self.imgsz, 3), np.uint8)
+        return buf
+
+    def classify(self, jobs):
+        """
+        Args:
+            jobs: list (SlotMap, frame) — satu per kamera
+
+        Returns:
+            list (state uint8 (N,), confidence float32 (N,)) sesuai urutan jobs
+        """
+        jobs = [(slots.scaled_to(frame.shape), frame) for slots, frame in jobs]
+        counts = [len(slots) for slots, _ in jobs]
+        total = sum(counts)
+        if total == 0:
+            return [(np.empty(0, np.uint8), np.empty(0, np.float32)) for _ in jobs]
+
+        # Semua crop semua kamera dalam satu array → satu predict
+        batch = self._buffer(total)
+        start = 0
+        for (slots, frame), n in zip(jobs, counts):
+            slots.crops(frame, out=batch[start:start + n], size=self.imgsz)
+            start += n
+
+        results = self.model.predict(list(batch), imgsz=self.imgsz, conf=self.conf,
+                                     device=self.device, verbose=False)
+
+        state = np.full(total, UNKNOWN, np.uint8)
+        confidence = np.zeros(total, np.float32)
+        for i, result in enumerate(results):
+            if getattr(result, 'probs', None) is not None:
+                state[i] = self._class_map.get(int(result.probs.top1), UNKNOWN)
+                confidence[i] = float(result.probs.top1conf)
+            elif result.boxes is not None and len(result.boxes):
+                best = int(result.boxes.conf.argmax())
+                state[i] = self._class_map.get(int(result.boxes.cls[best]), UNKNOWN)
+                confidence[i] = float(result.boxes.conf[best])
+
+        out, start = [], 0
+        for n in counts:
+            out.append((state[start:start + n], confidence[start:start + n]))
+            start += n
+        return out
+
+
+def draw_slots(frame, slots, state):
+    """Overlay poligon slot: hijau = kosong, merah = terisi, abu = unknown"""
+    colors = {TERISI: (0, 0, 255), KOSONG: (0, 255, 0)}
+    slots = slots.scaled_to(frame.shape)
+    for sid, poly, s in zip(slots.ids, slots.polygons, state):
+        color = colors.get(int(s), (128, 128, 128))
+        cv2.polylines(frame, [poly], True, color, 2)
+        x, y = poly[0]
+        cv2.putText(frame, str(sid), (int(x) + 3, int(y) + 15),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+    return frame
+
+
+def occupancy_summary(state):
+    """Hitung jumlah terisi/kosong/unknown dari array state"""
+    counts = np.bincount(state, minlength=UNKNOWN + 1)
+    return {'terisi': int(counts[TERISI]), 'kosong': int(counts[KOSONG]),
+            'unknown': int(counts[UNKNOWN])}
@@ -0,0 +1,220 @@
+"""Tracker status slot: matching IoU antar frame + debounce → event perubahan"""
+
+import time
+
+import numpy as np
+
+CLASS_NAMES = {0: 'terisi', 1: 'kosong'}
+
+
+def iou_matrix(a, b):
+    """IoU semua pasangan box xyxy: a (N, 4), b (M, 4) → (N, M)"""
+    a = np.asarray(a, np.float32).reshape(-1, 4)
+    b = np.asarray(b, np.float32).reshape(-1, 4)
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(br - tl, 0, None).prod(axis=2)
+    area_a = (a[:, 2:] - a[:, :2]).prod(axis=1)
+    area_b = (b[:, 2:] - b[:, :2]).prod(axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def greedy_match(iou, threshold):
+    """Pasangkan (baris, kolom) dengan IoU tertinggi lebih dulu"""
+    pairs = []
+    if iou.size == 0:
+        return pairs
+    rows, cols = np.nonzero(iou >= threshold)
+    order = np.argsort(-iou[rows, cols])
+    used_r, used_c = set(), set()
+    for k in order:
+        r, c = int(rows[k]), int(cols[k])
+        if r in used_r or c in used_c:
+            continue
+        used_r.add(r)
+        used_c.add(c)
+        pairs.append((r, c))
+    return pairs
+
+
+class _Slot:
+    __slots__ = ('id', 'box', 'state', 'candidate', 'count', 'since', 'missing', 'conf')
+
+    def __init__(self, slot_id, box):
+        self.id = slot_id
+        self.box = np.asarray(box, np.float32)
+        self.state = None        # status terkonfirmasi (None = belum)
+        self.candidate = None    # status yang sedang "diuji"
+        self.count = 0           # jumlah observasi berturut-turut kandidat
+        self.since = 0.0         # waktu kandidat pertama terlihat
+        self.missing = 0         # frame berturut-turut tanpa deteksi
+        self.conf = 0.0
+
+
+class SlotTracker:
+    """
+    Status terisi/kosong per slot dengan histeresis.
+
+    Perubahan status baru dianggap sah setelah terlihat `confirm_frames`
+    kali berturut-turut selama minimal `min_hold` detik, dan observasi
+    yang bertentangan dengan status sekarang butuh confidence minimal
+    `switch_conf`. Hanya perubahan yang dikembalikan sebagai event.
+
+    Args:
+        camera: Nama kamera (ikut di event)
+        iou_threshold: IoU minimal agar deteksi dianggap slot yang sama
+        confirm_frames: Observasi berturut-turut sebelum status berubah
+        min_hold: Detik minimal kandidat bertahan sebelum dikonfirmasi
+        switch_conf: Confidence minimal untuk observasi yang mengubah status
+        max_missing: Slot yang belum pernah terkonfirmasi dibuang setelah
+                     tidak terlihat sekian frame
+        smoothing: Bobot EMA posisi box slot (0 = box tetap)
+    """
+
+    def __init__(self, camera=None, iou_threshold=0.3, confirm_frames=3,
+                 min_hold=2.0, switch_conf=0.6, max_missing=30, smoothing=0.1):
+        self.camera = camera
+        self.iou_threshold = iou_threshold
+        self.confirm_frames = confirm_frames
+        self.min_hold = min_hold
+        self.switch_conf = switch_conf
+        self.max_missing = max_missing
+        self.smoothing = smoothing
+        self.slots = []
+        self._next_id = 0
+
+    # -----------------------------------------------------
+    # Input
+    # -----------------------------------------------------
+    def update_result(self, result, t=None):
+        """Update dari satu Results Ultralytics; return list event"""
+        boxes = result.boxes
+        return self.update(boxes.xyxy.cpu().numpy(), boxes.cls.cpu().numpy(),
+                           boxes.conf.cpu().numpy(), t)
+
+    def update(self, xyxy, classes, confs, t=None):
+        """
+        Args:
+            xyxy: (N, 4) box deteksi
+            classes: (N,) kelas (0 = terisi, 1 = kosong)
+            confs: (N,) confidence
+            t: Timestamp detik (default time.time())
+
+        Returns:
+            list event dict (hanya slot yang statusnya berubah)
+        """
+        t = time.time() if t is None else t
+        xyxy = np.asarray(xyxy, np.float32).reshape(-1, 4)
+        classes = np.asarray(classes).astype(np.int64).reshape(-1)
+        confs = np.asarray(confs, np.float32).reshape(-1)
+
+        known = np.array([s.box for s in self.slots], np.float32).reshape(-1, 4)
+        pairs = greedy_match(iou_matrix(known, xyxy), self.iou_threshold)
+
+        seen = set()
+        events = []
+        for slot_idx, det in pairs:
+            slot = self.slots[slot_idx]
+            seen.add(slot_idx)
+            slot.missing = 0
+            if self.smoothing:
+                slot.box += self.smoothing * (xyxy[det] - slot.box)
+            event = self._observe(slot, int(classes[det]), float(confs[det]), t)
+            if event:
+                events.append(event)
+
+        # Deteksi tanpa pasangan → kandidat slot baru
+        matched = {det for _, det in pairs}
+        for det in range(len(xyxy)):
+            if det in matched:
+                continue
+            slot = _Slot(self._next_id, xyxy[det])
+            self._next_id += 1
+            self.slots.append(slot)
+            seen.add(len(self.slots) - 1)
+            event = self._observe(slot, int(classes[det]), float(confs[det]), t)
+            if event:
+                events.append(event)
+
+        # Slot yang tidak terlihat: status dipertahankan, kandidat di-reset
+        for idx, slot in enumerate(self.slots):
+            if idx not in seen:
+                slot.missing += 1
+                slot.candidate, slot.count = None, 0
+        self.slots = [s for s in self.slots
+                      if s.state is not None or s.missing <= self.max_missing]
+        return events
+
+    def update_states(self, state, confidence=None, t=None, unknown=255):
+        """
+        Update dari array status slot tetap (mode ROI, src.core.slots).
+
+        Index array = id slot; nilai `unknown` dianggap tidak terlihat.
+        """
+        t = time.time() if t is None else t
+        state = np.asarray(state).reshape(-1)
+        confidence = np.ones(len(state), np.float32) if confidence is None else confidence
+        while len(self.slots) < len(state):
+            self.slots.append(_Slot(len(self.slots), np.zeros(4, np.float32)))
+            self._next_id = len(self.slots)
+
+        events = []
+        for idx, value in enumerate(state):
+            slot = self.slots[idx]
+            if int(value) == unknown:
+                slot.missing += 1
+                slot.candidate, slot.count = None, 0
+                continue
+            slot.missing = 0
+            event = self._observe(slot, int(value), float(confidence[idx]), t)
+            if event:
+                events.append(event)
+        return events
+
+    # -----------------------------------------------------
+    # State machine
+    # -----------------------------------------------------
+    def _observe(self, slot, cls, conf, t):
+        slot.conf = conf
+        if cls == slot.state:
+            slot.candidate, slot.count = None, 0
+            return None
+        if slot.state is not None and conf < self.switch_conf:
+            return None
+
+        if cls != slot.candidate:
+            slot.candidate, slot.count, slot.since = cls, 0, t
+        slot.count += 1
+        if slot.count < self.confirm_frames or t - slot.since < self.min_hold:
+            return None
+
+        previous = slot.state
+        slot.state, slot.candidate, slot.count = cls, None, 0
+        return {
+            'camera': self.camera,
+            'slot': slot.id,
+            'from': CLASS_NAMES.get(previous),
+            'to': CLASS_NAMES.get(cls, str(cls)),
+            't': round(t, 3),
+            'conf': round(conf, 3),
+        }
+
+    # -----------------------------------------------------
+    # Snapshot
+    # -----------------------------------------------------
+    @property
+    def pending(self):
+        """
+        True jika ada slot dengan kandidat status yang belum dikonfirmasi.
+        Selama itu inference perlu jalan terus (mis. lewat force_infer
+        StreamPipeline), karena debounce dihitung per observasi.
+        """
+        return any(s.candidate is not None for s in self.slots)
+
+    def snapshot(self):
+        """Status terkonfirmasi semua slot: {id: 'terisi'/'kosong'}"""
+        return {s.id: CLASS_NAMES.get(s.state) for s in self.slots if s.state is not None}
+
+    def counts(self):
+        values = list(self.snapshot().values())
+        return {name: values.count(name) for name in CLASS_NAMES.values()}
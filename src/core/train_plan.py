@@ -0,0 +1,360 @@
+"""Deteksi hardware + rencana argumen training YOLO (device, workers, batch, cache, AMP) + log img/s"""
+
+import os
+import platform
+import random
+import shutil
+import struct
+import time
+from pathlib import Path
+
+import yaml
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+RESOLVED_DIR = ROOT_DIR / "configs" / ".resolved"   # data.yaml dengan path absolut lokal
+AUTO = 'auto'
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+MAX_WORKERS = 8            # Worker DataLoader per GPU (lebih dari ini jarang menambah img/s)
+RAM_CACHE_FRACTION = 0.5   # Cache RAM hanya jika muat di ≤ 50% RAM tersedia
+DISK_CACHE_FRACTION = 0.5  # Cache disk (.npy) hanya jika muat di ≤ 50% disk kosong
+NPY_HEADER = 128           # Header file .npy (byte)
+SIZE_SAMPLE = 200          # Gambar yang header-nya dibaca untuk perkiraan cache disk
+
+
+# =========================================================
+# 🔹 Deteksi hardware
+# =========================================================
+def _cpu_count():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _memory():
+    """(total, tersedia) byte RAM; psutil jika ada, selain itu /proc/meminfo / sysconf"""
+    try:
+        import psutil
+        vm = psutil.virtual_memory()
+        return vm.total, vm.available
+    except ImportError:
+        pass
+    try:
+        info = {}
+        with open('/proc/meminfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                info[key] = int(value.split()[0]) * 1024
+        return info['MemTotal'], info.get('MemAvailable', info['MemTotal'])
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        total = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+        return total, total // 2
+    except (AttributeError, ValueError, OSError):
+        return 0, 0
+
+
+def _gpus():
+    try:
+        import torch
+    except ImportError:
+        return [], False
+    gpus = []
+    if torch.cuda.is_available():
+        for i in range(torch.cuda.device_count()):
+            props = torch.cuda.get_device_properties(i)
+            gpus.append({'index': i, 'name': props.name,
+                         'memory_gb': round(props.total_memory / 2**30, 1),
+                         'capability': f"{props.major}.{props.minor}"})
+    mps = bool(getattr(torch.backends, 'mps', None) and torch.backends.mps.is_available())
+    return gpus, mps
+
+
+def detect_hardware():
+    """Ringkasan hardware mesin ini (dict, aman di-dump ke YAML/JSON)"""
+    total, available = _memory()
+    gpus, mps = _gpus()
+    return {
+        'os': platform.system(),
+        'python': platform.python_version(),
+        'cpus': _cpu_count(),
+        'memory_gb': round(total / 2**30, 1),
+        'memory_available_gb': round(available / 2**30, 1),
+        'gpus': gpus,
+        'mps': mps,
+    }
+
+
+# =========================================================
+# 🔹 Dataset
+# =========================================================
+def dataset_root(data, data_yaml):
+    """
+    Folder dataset dari `path` di data.yaml: relatif → dari root repo;
+    path mesin lain yang tidak ada (mis. D:/.../parking_lot_final) →
+    Dataset/<nama folder> di repo jika ada. Tanpa `path` → folder yaml.
+    """
+    if not data.get('path'):
+        return Path(data_yaml).parent
+    path = Path(data['path'])
+    if not path.is_absolute():
+        path = ROOT_DIR / path
+    if not path.exists():
+        local = ROOT_DIR / 'Dataset' / path.name
+        if local.exists():
+            return local
+    return path
+
+
+def resolve_data_yaml(data_yaml, out_dir=RESOLVED_DIR):
+    """
+    data.yaml dengan `path` absolut yang valid di mesin ini (lihat
+    dataset_root). Jika `path` sudah benar, file asli dikembalikan; selain
+    itu salinan ditulis ke configs/.resolved/<nama> (Ultralytics membaca
+    `path` relatif dari folder datasets-nya, bukan dari repo).
+    """
+    with open(data_yaml, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f) or {}
+    if not data.get('path'):
+        return Path(data_yaml)
+    root = dataset_root(data, data_yaml)
+    if str(root) == data['path']:
+        return Path(data_yaml)
+    data['path'] = root.as_posix()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / Path(data_yaml).name
+    tmp = out.with_name(out.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True)
+    os.replace(tmp, out)
+    return out
+
+
+def dataset_images(data_yaml):
+    """Path gambar train + val dari data.yaml YOLO (None jika folder tidak ditemukan)"""
+    try:
+        with open(data_yaml, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+    except OSError:
+        return None
+    root = dataset_root(data, data_yaml)
+    paths = []
+    for split in ('train', 'val'):
+        entries = data.get(split)
+        if not entries:
+            continue
+        for entry in entries if isinstance(entries, list) else [entries]:
+            folder = Path(entry) if Path(entry).is_absolute() else root / entry
+            if not folder.is_dir():
+                return None
+            with os.scandir(folder) as it:
+                paths += [e.path for e in it if e.name.lower().endswith(IMAGE_SUFFIXES)]
+    return paths
+
+
+def cache_bytes(num_images, imgsz):
+    """Perkiraan RAM cache Ultralytics: tiap gambar di-resize sisi panjang = imgsz, uint8 BGR"""
+    return num_images * imgsz * imgsz * 3
+
+
+def disk_cache_bytes(paths, sample=SIZE_SAMPLE, seed=0):
+    """
+    Perkiraan cache disk Ultralytics: .npy menyimpan gambar resolusi ASLI
+    (bukan imgsz), jadi ukurannya diambil dari header JPEG/PNG sampel
+    gambar lalu diskalakan ke seluruh dataset. None jika tidak terbaca.
+    """
+    from src.core.preprocess import image_size   # Impor lambat: OpenCV hanya saat perlu
+
+    picked = random.Random(seed).sample(paths, min(sample, len(paths)))
+    pixels = []
+    for path in picked:
+        try:
+            size = image_size(path)
+        except (OSError, struct.error):
+            size = None
+        if size:
+            pixels.append(size[0] * size[1])
+    if not pixels:
+        return None
+    return int(len(paths) * (sum(pixels) / len(pixels) * 3 + NPY_HEADER))
+
+
+# =========================================================
+# 🔹 Rencana training
+# =========================================================
+def load_train_config(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    for key in ('data', 'shard_dir'):
+        if config.get(key):
+            p = Path(config[key])
+            config[key] = str(p if p.is_absolute() else ROOT_DIR / p)
+    if config.get('data') and Path(config['data']).exists():
+        config['data'] = str(resolve_data_yaml(config['data']))
+    return config
+
+
+def normalize_device(device):
+    """'0' → 0, '0,1' / [0, 1] → [0, 1], 'cpu' / 'mps' tetap"""
+    if isinstance(device, str):
+        parts = [p.strip() for p in device.split(',') if p.strip()]
+        if parts and all(p.isdigit() for p in parts):
+            device = [int(p) for p in parts]
+    if isinstance(device, list) and len(device) == 1:
+        device = device[0]
+    return device
+
+
+def _plan_device(hw):
+    if hw['gpus']:
+        indices = [g['index'] for g in hw['gpus']]
+        return indices[0] if len(indices) == 1 else indices
+    return 'mps' if hw['mps'] else 'cpu'
+
+
+def _plan_workers(hw, device):
+    if hw['os'] == 'Windows':
+        return 0   # Worker + spawn di Windows sering error / lambat start
+    per_device = len(device) if isinstance(device, list) else 1
+    return max(min(hw['cpus'] // per_device - 1, MAX_WORKERS), 0)
+
+
+def _plan_batch(hw, device):
+    if isinstance(device, int):
+        return -1                      # AutoBatch Ultralytics (probing memori GPU)
+    if isinstance(device, list):
+        return 16 * len(device)        # DDP tidak mendukung AutoBatch
+    return 16 if hw['memory_gb'] >= 16 else 8
+
+
+def _plan_cache(hw, paths, imgsz, uses_shards, ranks=1):
+    """
+    'ram', 'disk' atau False, dengan alasannya. Cache RAM (ukuran imgsz)
+    terisi per proses DDP; cache disk (.npy resolusi asli, di samping
+    gambar) dipakai bersama dan diperkirakan dari header gambar.
+    """
+    if uses_shards:
+        return False, "shard memmap dipakai"
+    if paths is None:
+        return False, "jumlah gambar tidak diketahui"
+    need = cache_bytes(len(paths), imgsz) * ranks
+    if need <= hw['memory_available_gb'] * 2**30 * RAM_CACHE_FRACTION:
+        return 'ram', f"~{need / 2**30:.1f} GB muat di RAM"
+    disk_need = disk_cache_bytes(paths) if paths else None
+    if disk_need is None:
+        return False, f"~{need / 2**30:.1f} GB > RAM, ukuran asli gambar tidak terbaca"
+    free = shutil.disk_usage(os.path.dirname(paths[0])).free
+    if disk_need <= free * DISK_CACHE_FRACTION:
+        return 'disk', (f"~{need / 2**30:.1f} GB > {RAM_CACHE_FRACTION:.0%} RAM tersedia; "
+                        f".npy ~{disk_need / 2**30:.1f} GB muat di disk")
+    return False, (f"RAM dan disk tidak cukup (RAM ~{need / 2**30:.1f} GB, "
+                   f".npy ~{disk_need / 2**30:.1f} GB)")
+
+
+def uses_custom_trainer(config):
+    """
+    True jika training memakai trainer/callback custom (online_aug,
+    shard_dir, throughput_log). DDP Ultralytics menjalankan ulang trainer
+    dari script sementara (`from module import Class`), sehingga class
+    dinamis, parameternya, dan callback model tidak ikut terbawa.
+    """
+    return bool(config.get('online_aug', True) or config.get('shard_dir')
+                or config.get('throughput_log', True))
+
+
+def plan_training(config, hw=None):
+    """
+    Gabungkan deteksi hardware dengan configs/train.yaml.
+
+    Nilai 'auto' (atau tidak diisi) dipilih dari hardware; nilai lain di
+    config selalu menang. `train_args` di config diteruskan apa adanya.
+    Pengecualian: jika uses_custom_trainer(config), device multi-GPU
+    (auto maupun dari config) dipersempit ke GPU pertama, karena DDP akan
+    membuang trainer custom dan callback-nya.
+
+    Returns:
+        (argumen model.train, catatan {nama: alasan})
+    """
+    hw = hw or detect_hardware()
+    notes = {}
+
+    def pick(key, auto_value, reason):
+        value = config.get(key, AUTO)
+        if value is None or value == AUTO:
+            notes[key] = reason
+            return auto_value
+        notes[key] = "config"
+        return value
+
+    device = normalize_device(pick('device', _plan_device(hw),
+                                   f"{len(hw['gpus'])} GPU" if hw['gpus']
+                                   else ('MPS' if hw['mps'] else 'CPU saja')))
+    if isinstance(device, list) and uses_custom_trainer(config):
+        notes['device'] += (f"; 1 GPU dari {len(device)}: DDP tidak membawa trainer custom "
+                            f"(online_aug/shard_dir/throughput_log)")
+        device = device[0]
+    workers = pick('workers', _plan_workers(hw, device), f"{hw['cpus']} core, OS {hw['os']}")
+    batch = pick('batch', _plan_batch(hw, device),
+                 "AutoBatch" if isinstance(device, int) else "tanpa AutoBatch")
+    on_cuda = isinstance(device, (int, list))
+    amp = pick('amp', on_cuda, "CUDA" if on_cuda else "AMP hanya untuk CUDA")
+
+    imgsz = config.get('imgsz', 640)
+    paths = dataset_images(config['data']) if config.get('data') else None
+    ranks = len(device) if isinstance(device, list) else 1
+    cache_auto, cache_reason = _plan_cache(hw, paths, imgsz, bool(config.get('shard_dir')), ranks)
+    cache = pick('cache', cache_auto, cache_reason)
+
+    args = {
+        'data': config.get('data'),
+        'epochs': config.get('epochs', 100),
+        'imgsz': imgsz,
+        'batch': batch,
+        'device': device,
+        'workers': workers,
+        'cache': cache,
+        'amp': amp,
+        'name': config.get('name', 'parking_detection'),
+        'patience': config.get('patience', 50),
+    }
+    args.update(config.get('train_args') or {})
+    return args, notes
+
+
+# =========================================================
+# 🔹 Throughput per epoch
+# =========================================================
+class ThroughputLogger:
+    """
+    Callback Ultralytics: gambar/detik bagian training tiap epoch (tanpa
+    validasi), dicetak dan ditulis ke <save_dir>/throughput.csv.
+    """
+
+    def __init__(self):
+        self.start = None
+        self.history = []
+
+    def on_train_epoch_start(self, trainer):
+        self.start = time.perf_counter()
+
+    def on_train_epoch_end(self, trainer):
+        if self.start is None:
+            return
+        seconds = time.perf_counter() - self.start
+        images = len(trainer.train_loader.dataset)
+        rate = images / seconds if seconds > 0 else 0.0
+        self.history.append(rate)
+        print(f"⏱ Epoch {trainer.epoch + 1}: {images} gambar dalam {seconds:.1f} s "
+              f"→ {rate:.1f} img/s (batch {trainer.batch_size})")
+        path = Path(trainer.save_dir) / 'throughput.csv'
+        new = not path.exists()
+        with open(path, 'a', encoding='utf-8') as f:
+            if new:
+                f.write("epoch,images,seconds,images_per_sec,batch\n")
+            f.write(f"{trainer.epoch + 1},{images},{seconds:.3f},{rate:.2f},{trainer.batch_size}\n")
+
+    def attach(self, model):
+        model.add_callback('on_train_epoch_start', self.on_train_epoch_start)
+        model.add_callback('on_train_epoch_end', self.on_train_epoch_end)
+        return self
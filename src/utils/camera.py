@@ -0,0 +1,222 @@
+"""Sumber kamera bersama: thread baca, frame terbaru + seq, reconnect otomatis"""
+
+import threading
+import time
+
+import cv2
+
+from src.utils.metrics import Histogram
+
+
+class CameraSource:
+    """
+    Pembaca stream kamera (IP cam / DroidCam / ESP32-CAM / file / index).
+
+    - Thread sendiri memanggil cap.read() terus-menerus (read() blok di
+      driver, jadi tidak perlu sleep polling).
+    - Frame terbaru diserahkan lewat Condition bersama nomor urut (seq);
+      frame yang tidak sempat diambil terhitung `dropped`.
+    - Jika tidak ada frame bagus selama `stall_timeout` detik (read gagal
+      atau menggantung), koneksi dibuka ulang dengan exponential backoff.
+    - Pembaca tidak pernah menerima frame lebih tua dari `max_age` detik.
+
+    Args:
+        url: URL stream atau index kamera
+        name: Nama sumber (untuk log/statistik)
+        width, height: Resolusi yang diminta ke kamera (opsional)
+        max_age: Umur maksimal frame yang boleh dibaca (detik)
+        stall_timeout: Detik tanpa frame bagus sebelum reconnect
+                       (None = max_age); juga dipakai sebagai timeout read
+        backoff_initial, backoff_max: Jeda reconnect awal / maksimum (detik)
+        io_timeout: Timeout open backend FFmpeg (detik)
+        on_frame: Callback tanpa argumen, dipanggil tiap ada frame baru
+    """
+
+    def __init__(self, url, name=None, width=None, height=None, max_age=2.0,
+                 stall_timeout=None, backoff_initial=0.5, backoff_max=30.0,
+                 io_timeout=5.0, on_frame=None):
+        self.url = url
+        self.name = name or str(url)
+        self.width = width
+        self.height = height
+        self.max_age = max_age
+        self.stall_timeout = max_age if stall_timeout is None else stall_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.io_timeout = io_timeout
+        self.on_frame = on_frame
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._stamp = 0.0
+        self._taken = True
+        self._stopped = threading.Event()
+        self._thread = None
+
+        # Statistik
+        self.connected = False
+        self.frames = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self.fps = 0.0
+        self._fps_count = 0
+        self._fps_time = time.monotonic()
+        self.read_time = Histogram()    # Durasi cap.read() sukses (detik)
+        self.frame_age = Histogram()    # Umur frame saat diambil pembaca (detik)
+
+    # -----------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"camera-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def wait_ready(self, timeout=10.0):
+        """Tunggu frame pertama; True jika kamera sudah mengirim frame"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._seq > 0 or self._stopped.is_set(), timeout) \
+                and self._seq > 0
+
+    # -----------------------------------------------------
+    # Thread capture
+    # -----------------------------------------------------
+    def _open(self):
+        # Timeout open/read hanya ada di OpenCV >= 4.6 (backend FFmpeg).
+        # Read dibatasi stall_timeout → stream menggantung cepat terdeteksi
+        params = []
+        timeouts = {'CAP_PROP_OPEN_TIMEOUT_MSEC': self.io_timeout,
+                    'CAP_PROP_READ_TIMEOUT_MSEC': self.stall_timeout}
+        for prop, seconds in timeouts.items():
+            if hasattr(cv2, prop):
+                params += [getattr(cv2, prop), int(seconds * 1000)]
+        if params and isinstance(self.url, str):
+            cap = cv2.VideoCapture(self.url, cv2.CAP_ANY, params)
+        else:
+            cap = cv2.VideoCapture(self.url)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if self.width:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        return cap
+
+    def _run(self):
+        backoff = self.backoff_initial
+        first = True
+        while not self._stopped.is_set():
+            cap = self._open()
+            if cap is None:
+                print(f"⚠ [{self.name}] gagal konek, coba lagi dalam {backoff:.1f}s")
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, self.backoff_max)
+                continue
+
+            if not first:
+                self.reconnects += 1
+                print(f"🔄 [{self.name}] tersambung kembali (reconnect #{self.reconnects})")
+            first = False
+            self.connected = True
+            last_good = time.monotonic()
+            try:
+                while not self._stopped.is_set():
+                    start = time.perf_counter()
+                    ret, frame = cap.read()
+                    if not ret or frame is None:
+                        # Berbasis waktu, bukan jumlah gagal: read() yang blok
+                        # lama tidak memperpanjang waktu sampai reconnect
+                        if time.monotonic() - last_good >= self.stall_timeout:
+                            break
+                        self._stopped.wait(0.01)   # read gagal instan → jangan spin
+                        continue
+                    last_good = time.monotonic()
+                    backoff = self.backoff_initial
+                    self.read_time.observe(time.perf_counter() - start)
+                    self._publish(frame)
+            finally:
+                self.connected = False
+                cap.release()
+
+            if not self._stopped.is_set():
+                print(f"⚠ [{self.name}] stream terputus, reconnect dalam {backoff:.1f}s")
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, self.backoff_max)
+
+    def _publish(self, frame):
+        now = time.monotonic()
+        with self._cond:
+            if not self._taken:
+                self.dropped += 1
+            self._frame = frame
+            self._seq += 1
+            self._stamp = now
+            self._taken = False
+            self._cond.notify_all()
+
+        self.frames += 1
+        self._fps_count += 1
+        if now - self._fps_time >= 1:
+            self.fps = self._fps_count / (now - self._fps_time)
+            self._fps_count = 0
+            self._fps_time = now
+        if self.on_frame is not None:
+            self.on_frame()
+
+    # -----------------------------------------------------
+    # Pembaca
+    # -----------------------------------------------------
+    def _fresh(self, last_seq):
+        return self._seq > last_seq and time.monotonic() - self._stamp <= self.max_age
+
+    def read(self, last_seq=0, timeout=None):
+        """
+        Tunggu frame yang lebih baru dari `last_seq` (dan belum basi).
+
+        Returns:
+            (seq, frame) — frame None jika timeout / kamera sedang putus
+        """
+        with self._cond:
+            ok = self._cond.wait_for(
+                lambda: self._fresh(last_seq) or self._stopped.is_set(), timeout)
+            if not ok or not self._fresh(last_seq):
+                return last_seq, None
+            self._taken = True
+            self.frame_age.observe(time.monotonic() - self._stamp)
+            return self._seq, self._frame
+
+    def latest(self):
+        """(seq, frame, umur detik) tanpa menunggu; frame boleh basi"""
+        with self._cond:
+            age = time.monotonic() - self._stamp if self._seq else float('inf')
+            return self._seq, self._frame, age
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def stats(self):
+        _, _, age = self.latest()
+        return {
+            'name': self.name,
+            'connected': self.connected,
+            'fps': round(self.fps, 1),
+            'frames': self.frames,
+            'dropped': self.dropped,
+            'reconnects': self.reconnects,
+            'frame_age': round(age, 3) if age != float('inf') else None,
+        }
@@ -0,0 +1,362 @@
+"""Salin/link file dataset + manifest content-hash (deduplikasi) + manifest build inkremental"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+LINK_MODES = ('copy', 'hardlink', 'reflink', 'symlink', 'auto')
+MANIFEST_NAME = 'manifest.json'
+BUILD_MANIFEST_NAME = '.build_manifest.json'
+HASH_CHUNK = 1 << 20           # Baca file per 1 MB saat hashing
+FICLONE = 0x40049409           # ioctl reflink (Linux: btrfs, xfs, ...)
+
+
+# =========================================================
+# 🔹 Hashing
+# =========================================================
+def file_digest(path):
+    """SHA-256 isi file (hex)"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def bytes_digest(data):
+    """SHA-256 dari bytes (hex)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+# =========================================================
+# 🔹 Link / reflink / copy
+# =========================================================
+def _reflink(src, dst):
+    """Clone file copy-on-write; raise OSError jika FS tidak mendukung"""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflink tidak didukung di platform ini")
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except OSError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        raise
+    shutil.copystat(src, dst)
+
+
+def _same_file(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def link_file(src, dst, mode='auto'):
+    """
+    Taruh isi `src` di `dst` tanpa menyalin byte jika memungkinkan.
+
+    Args:
+        src: File sumber
+        dst: File tujuan (ditimpa jika sudah ada)
+        mode: 'copy', 'hardlink', 'reflink', 'symlink', atau 'auto'
+              (hardlink → reflink → copy)
+
+    Returns:
+        Metode yang benar-benar dipakai ('hardlink', 'reflink', 'symlink',
+        'copy', atau 'exists' jika dst sudah file yang sama)
+
+    Catatan: hardlink berbagi inode, jadi edit in-place di satu path ikut
+    mengubah path lain. Editor/skrip yang menulis file baru aman.
+    """
+    if mode not in LINK_MODES:
+        raise ValueError(f"mode harus salah satu dari {LINK_MODES}, bukan {mode!r}")
+
+    src, dst = str(src), str(dst)
+    if _same_file(src, dst):
+        return 'exists'
+
+    # Tulis ke file sementara lalu replace → dst tidak pernah setengah jadi
+    tmp = dst + '.tmp-link'
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+
+    attempts = {
+        'copy': ('copy',),
+        'hardlink': ('hardlink', 'copy'),
+        'reflink': ('reflink', 'copy'),
+        'symlink': ('symlink', 'copy'),
+        'auto': ('hardlink', 'reflink', 'copy'),
+    }[mode]
+
+    for method in attempts:
+        try:
+            if method == 'hardlink':
+                os.link(src, tmp)
+            elif method == 'reflink':
+                _reflink(src, tmp)
+            elif method == 'symlink':
+                os.symlink(os.path.abspath(src), tmp)
+            else:
+                shutil.copy2(src, tmp)
+        except OSError:
+            if method == 'copy':
+                raise
+            continue
+        os.replace(tmp, dst)
+        return method
+
+
+# =========================================================
+# 🔹 Manifest content-hash
+# =========================================================
+class DedupManifest:
+    """
+    Manifest dataset: path relatif → sha256, plus sha256 → path kanonik.
+
+    File dengan isi yang sama hanya disimpan sekali; path lain di-link ke
+    path kanonik lewat link_file().
+    """
+
+    def __init__(self, root, mode='auto', name=MANIFEST_NAME):
+        self.root = Path(root)
+        self.mode = mode
+        self.path = self.root / name
+        self.files = {}     # relpath → digest
+        self.objects = {}   # digest → relpath kanonik
+        self.sizes = {}     # digest → ukuran byte (verifikasi salinan kanonik)
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.files = data.get('files', {})
+        self.sizes = data.get('sizes', {})
+        for rel, digest in self.files.items():
+            self.objects.setdefault(digest, rel)
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        live = set(self.files.values())
+        sizes = {d: n for d, n in self.sizes.items() if d in live}
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'files': self.files, 'sizes': sizes},
+                      f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _rel(self, path):
+        return Path(path).resolve().relative_to(self.root.resolve()).as_posix()
+
+    def canonical(self, digest):
+        """
+        Path kanonik untuk digest, atau None jika belum ada, sudah hilang,
+        atau isinya tidak lagi cocok (ukuran beda / ditimpa di luar manifest).
+        """
+        rel = self.objects.get(digest)
+        if rel is None:
+            return None
+        path = self.root / rel
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = None
+        if size is None or self.files.get(rel) != digest:
+            del self.objects[digest]
+            return None
+        expected = self.sizes.get(digest)
+        if expected is None:
+            # Manifest lama tanpa ukuran → pastikan sekali dengan hash
+            if file_digest(path) != digest:
+                del self.objects[digest]
+                return None
+            self.sizes[digest] = size
+        elif size != expected:
+            del self.objects[digest]
+            return None
+        return path
+
+    def _assign(self, rel, digest, size=None):
+        """Catat rel → digest; objek digest lama yang menunjuk ke rel dipindah/dibuang"""
+        old = self.files.get(rel)
+        self.files[rel] = digest
+        if size is not None:
+            self.sizes[digest] = size
+        if old is not None and old != digest and self.objects.get(old) == rel:
+            other = next((r for r, d in self.files.items() if d == old), None)
+            if other is None:
+                del self.objects[old]
+            else:
+                self.objects[old] = other
+        if self.canonical(digest) is None:
+            self.objects[digest] = rel
+
+    def add(self, path, digest, size=None):
+        self._assign(self._rel(path), digest, size)
+
+    def update(self, entries):
+        """Gabungkan [(path relatif, digest, ukuran), ...] dari worker lain"""
+        for entry in entries:
+            self._assign(*entry)
+
+    def remove(self, path):
+        """Lupakan satu path (file sudah dihapus dari disk)"""
+        rel = self._rel(path)
+        digest = self.files.pop(rel, None)
+        if digest is not None and self.objects.get(digest) == rel:
+            other = next((r for r, d in self.files.items() if d == digest), None)
+            if other is None:
+                del self.objects[digest]
+            else:
+                self.objects[digest] = other
+
+    def put_file(self, src, dst, digest=None):
+        """Simpan file ke dst; jika isinya sudah ada, link ke salinan kanonik"""
+        digest = digest or file_digest(src)
+        source = self.canonical(digest) or src
+        link_file(source, dst, self.mode)
+        self.add(dst, digest, os.path.getsize(dst))
+        return digest
+
+    def put_bytes(self, data, dst):
+        """
+        Tulis bytes ke dst; jika isinya sudah ada, link ke salinan kanonik.
+
+        Ditulis ke file sementara lalu os.replace: jika dst sebelumnya
+        hardlink, inode lama (mis. file di dataset sumber) tidak ikut berubah.
+        """
+        digest = bytes_digest(data)
+        source = self.canonical(digest)
+        if source is not None:
+            link_file(source, dst, self.mode)
+        else:
+            tmp = str(dst) + '.tmp-write'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, dst)
+        self.add(dst, digest, len(data))
+        return digest
+
+    def entry(self, path):
+        """(path relatif, digest, ukuran) untuk dikirim balik dari worker"""
+        rel = self._rel(path)
+        digest = self.files[rel]
+        return rel, digest, self.sizes.get(digest)
+
+    def stats(self):
+        return {'files': len(self.files), 'unique': len(set(self.files.values()))}
+
+
+# =========================================================
+# 🔹 Manifest build inkremental (mtime/size/hash input)
+# =========================================================
+class BuildManifest:
+    """
+    Catatan input yang sudah diproses: nama → [mtime_ns, size, sha256].
+
+    Dipakai pipeline preprocessing agar run ulang hanya memproses file
+    yang berubah. Jika `params` (pengaturan build) berbeda dari yang
+    tersimpan, semua entri dianggap basi.
+    """
+
+    def __init__(self, root, params=None, name=BUILD_MANIFEST_NAME):
+        self.root = Path(root)
+        self.path = self.root / name
+        self.params = params or {}
+        self.files = {}     # nama → [mtime_ns, size, digest atau None]
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('params') == self.params:
+            self.files = data.get('files', {})
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'params': self.params, 'files': self.files},
+                      f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def status(self, name, stat):
+        """
+        'fresh' jika mtime+size sama, 'check' jika hanya hash yang bisa
+        memastikan (mtime berubah, ukuran sama), selain itu 'stale'.
+        """
+        entry = self.files.get(name)
+        if entry is None:
+            return 'stale'
+        mtime_ns, size, digest = entry
+        if size != stat.st_size:
+            return 'stale'
+        if mtime_ns == stat.st_mtime_ns:
+            return 'fresh'
+        return 'check' if digest else 'stale'
+
+    def digest(self, name):
+        entry = self.files.get(name)
+        return entry[2] if entry else None
+
+    def record(self, name, mtime_ns, size, digest=None):
+        self.files[name] = [mtime_ns, size, digest]
+
+    def prune(self, names):
+        """Buang entri input yang sudah tidak ada"""
+        for name in set(self.files) - set(names):
+            del self.files[name]
+
+
+# =========================================================
+# 🔹 Deduplikasi tree yang sudah ada
+# =========================================================
+def dedup_tree(root, mode='hardlink', extensions=None, dry_run=False):
+    """
+    Ganti file duplikat di bawah `root` dengan link ke satu salinan.
+
+    Args:
+        root: Folder dataset (mis. Dataset/)
+        mode: Mode link (lihat link_file)
+        extensions: Filter suffix (mis. {'.jpg', '.txt'}), None = semua
+        dry_run: Hanya hitung, jangan ubah file
+
+    Returns:
+        dict ringkasan: files, unique, linked, bytes_saved
+    """
+    manifest = DedupManifest(root, mode=mode)
+    seen = {}   # digest → path kanonik
+    linked = bytes_saved = 0
+
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            if path == manifest.path or name.endswith(('.tmp', '.tmp-link', '.tmp-write')):
+                continue
+            if extensions and path.suffix.lower() not in extensions:
+                continue
+
+            digest = file_digest(path)
+            canon = seen.get(digest)
+            if canon is None:
+                seen[digest] = path
+            elif not _same_file(canon, path):
+                linked += 1
+                bytes_saved += path.stat().st_size
+                if not dry_run:
+                    link_file(canon, path, mode)
+            manifest.add(path, digest, path.stat().st_size)
+
+    if not dry_run:
+        manifest.save()
+    summary = manifest.stats()
+    summary.update(linked=linked, bytes_saved=bytes_saved)
+    return summary
@@ -0,0 +1,164 @@
+"""Konversi LabelMe JSON → label YOLO (paralel, polygon → bounding box, validasi koordinat)"""
+
+import json
+import os
+from collections import Counter
+from multiprocessing import Pool
+
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+except ImportError:   # orjson opsional; json stdlib tetap jalan
+    orjson = None
+
+    def _loads(data):
+        return json.loads(data)
+
+MAX_ERRORS = 20          # Contoh error yang disimpan di ringkasan
+MIN_SIZE = 1e-6          # Lebar/tinggi ternormalisasi minimum
+
+
+def shape_box(shape):
+    """
+    Bounding box (x1, y1, x2, y2) piksel dari shape LabelMe apa pun.
+
+    rectangle (2 titik, urutan bebas), polygon / linestrip (N titik) →
+    min/max semua titik; circle → pusat + titik di tepi.
+    """
+    points = shape.get('points') or []
+    if not points:
+        raise ValueError("shape tanpa titik")
+    if shape.get('shape_type') == 'circle' and len(points) >= 2:
+        (cx, cy), (px, py) = points[0], points[1]
+        r = ((px - cx) ** 2 + (py - cy) ** 2) ** 0.5
+        return cx - r, cy - r, cx + r, cy + r
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def to_yolo(box, width, height):
+    """
+    Box piksel → (xc, yc, w, h) ternormalisasi, dipotong ke batas gambar.
+
+    Returns:
+        (koordinat atau None jika degenerate, True jika box dipotong)
+    """
+    x1, y1, x2, y2 = box
+    cx1, cy1 = min(max(x1, 0.0), width), min(max(y1, 0.0), height)
+    cx2, cy2 = min(max(x2, 0.0), width), min(max(y2, 0.0), height)
+    clipped = (cx1, cy1, cx2, cy2) != (x1, y1, x2, y2)
+    w = (cx2 - cx1) / width
+    h = (cy2 - cy1) / height
+    if w < MIN_SIZE or h < MIN_SIZE:
+        return None, clipped
+    return ((cx1 + cx2) / 2 / width, (cy1 + cy2) / 2 / height, w, h), clipped
+
+
+def convert_file(json_path, output_dir, class_mapping):
+    """
+    Konversi satu file; semua baris ditulis dengan satu write.
+
+    Returns:
+        (nama file, error atau None, Counter statistik)
+    """
+    stats = Counter()
+    name = os.path.basename(json_path)
+    try:
+        with open(json_path, 'rb') as f:
+            data = _loads(f.read())
+        width = float(data['imageWidth'])
+        height = float(data['imageHeight'])
+        if width <= 0 or height <= 0:
+            raise ValueError(f"ukuran gambar tidak valid {width}x{height}")
+
+        lines = []
+        for shape in data.get('shapes', ()):
+            label = shape.get('label')
+            if label not in class_mapping:
+                stats[f"unknown:{label}"] += 1
+                continue
+            if shape.get('shape_type', 'rectangle') != 'rectangle' or len(shape.get('points', ())) > 2:
+                stats['polygons'] += 1
+            coords, clipped = to_yolo(shape_box(shape), width, height)
+            stats['clipped'] += clipped
+            if coords is None:
+                stats['degenerate'] += 1
+                continue
+            class_id = class_mapping[label]
+            stats[f"class:{label}"] += 1
+            stats['boxes'] += 1
+            lines.append(f"{class_id} {coords[0]:.6f} {coords[1]:.6f} {coords[2]:.6f} {coords[3]:.6f}\n")
+
+        stem = os.path.splitext(name)[0]
+        with open(os.path.join(output_dir, stem + '.txt'), 'w', encoding='utf-8') as f:
+            f.write(''.join(lines))
+        if not lines:
+            stats['empty'] += 1
+        return name, None, stats
+    except (OSError, ValueError, KeyError, TypeError, IndexError) as e:
+        return name, f"{type(e).__name__}: {e}", stats
+
+
+def _convert_task(task):
+    return convert_file(*task)
+
+
+def batch_convert(json_dir, output_dir, class_mapping, workers=None, chunksize=64):
+    """
+    Konversi semua .json di folder secara paralel.
+
+    Args:
+        json_dir: Folder berisi file .json LabelMe
+        output_dir: Folder output .txt YOLO
+        class_mapping: {'terisi': 0, 'kosong': 1}
+        workers: Jumlah proses (None = semua core, 1 = tanpa pool)
+        chunksize: File per task yang dikirim ke worker
+
+    Returns:
+        dict ringkasan: files, converted, failed, boxes, per_class,
+        polygons, clipped, degenerate, empty, unknown_labels, errors
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with os.scandir(json_dir) as entries:
+        files = sorted(e.path for e in entries if e.is_file() and e.name.endswith('.json'))
+
+    workers = workers or os.cpu_count() or 1
+    tasks = ((path, output_dir, class_mapping) for path in files)
+    if workers > 1 and len(files) > chunksize:
+        with Pool(processes=workers) as pool:
+            results = list(pool.imap_unordered(_convert_task, tasks, chunksize))
+    else:
+        results = [_convert_task(task) for task in tasks]
+
+    total = Counter()
+    errors = []
+    for name, error, stats in results:
+        total.update(stats)
+        if error is not None:
+            errors.append(f"{name}: {error}")
+
+    return {
+        'files': len(files),
+        'converted': len(files) - len(errors),
+        'failed': len(errors),
+        'boxes': total['boxes'],
+        'per_class': {k[6:]: v for k, v in sorted(total.items()) if k.startswith('class:')},
+        'polygons': total['polygons'],
+        'clipped': total['clipped'],
+        'degenerate': total['degenerate'],
+        'empty': total['empty'],
+        'unknown_labels': {k[8:]: v for k, v in sorted(total.items()) if k.startswith('unknown:')},
+        'errors': sorted(errors)[:MAX_ERRORS],
+        'parser': 'orjson' if orjson is not None else 'json',
+    }
+
+
+def create_classes_file(output_dir, class_mapping):
+    """Tulis classes.txt (urut class ID)"""
+    path = os.path.join(output_dir, 'classes.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(f"{name}\n" for name, _ in sorted(class_mapping.items(), key=lambda x: x[1])))
+    return path
@@ -0,0 +1,146 @@
+"""Metrik ringan (histogram, counter, gauge) + format teks Prometheus untuk /metrics"""
+
+import bisect
+import threading
+import time
+
+# Detik: 0.5 ms ... 2.5 s, cukup untuk capture/inference/encode per frame
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(labels, extra=None):
+    items = list((labels or {}).items()) + list((extra or {}).items())
+    if not items:
+        return ''
+    body = ','.join(f'{k}="{str(v)}"' for k, v in items)
+    return '{' + body + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, bool):
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Histogram bucket tetap (kumulatif saat di-render, seperti Prometheus).
+
+    observe() hanya bisect + increment di bawah lock, jadi aman dipanggil
+    dari thread hot-path per frame. Juga menyimpan nilai terakhir.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+        self.last = 0.0
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+            self._count += 1
+            self.last = value
+
+    def time(self):
+        """Context manager: `with hist.time(): ...` → observe(durasi detik)"""
+        return _Timer(self)
+
+    def snapshot(self):
+        """(bucket kumulatif [(le, count)], sum, count)"""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative, running = [], 0
+        for le, c in zip(self.buckets + (float('inf'),), counts):
+            running += c
+            cumulative.append((le, running))
+        return cumulative, total, count
+
+    @property
+    def mean(self):
+        return self._sum / self._count if self._count else 0.0
+
+
+class _Timer:
+    __slots__ = ('_hist', '_start')
+
+    def __init__(self, hist):
+        self._hist = hist
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._hist.observe(time.perf_counter() - self._start)
+
+
+class Registry:
+    """
+    Kumpulan metrik bernama, di-render ke format teks Prometheus 0.0.4.
+
+    Counter/gauge berupa callback yang dibaca saat scrape, jadi atribut
+    yang sudah ada (camera.dropped, pipeline.clients, ...) tidak perlu
+    diduplikasi di hot-path.
+    """
+
+    def __init__(self, namespace='easypark'):
+        self.namespace = namespace
+        self._families = {}      # name → (type, help, [(labels, source)])
+        self._lock = threading.Lock()
+
+    def _add(self, kind, name, help_text, labels, source):
+        full = f"{self.namespace}_{name}" if self.namespace else name
+        with self._lock:
+            family = self._families.setdefault(full, (kind, help_text, []))
+            if family[0] != kind:
+                raise ValueError(f"Metrik {full} sudah terdaftar sebagai {family[0]}")
+            family[2].append((labels or {}, source))
+        return source
+
+    def histogram(self, name, help_text, labels=None, buckets=DEFAULT_BUCKETS, hist=None):
+        """Daftarkan (atau buat) Histogram; return objek Histogram"""
+        return self._add('histogram', name, help_text, labels, hist or Histogram(buckets))
+
+    def counter(self, name, help_text, fn, labels=None):
+        """Counter monotonic, nilai dibaca dari fn() saat scrape"""
+        return self._add('counter', name, help_text, labels, fn)
+
+    def gauge(self, name, help_text, fn, labels=None):
+        """Gauge, nilai dibaca dari fn() saat scrape"""
+        return self._add('gauge', name, help_text, labels, fn)
+
+    def render(self):
+        with self._lock:
+            families = [(name, *family) for name, family in self._families.items()]
+
+        lines = []
+        for name, kind, help_text, members in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, source in members:
+                if kind == 'histogram':
+                    buckets, total, count = source.snapshot()
+                    for le, c in buckets:
+                        lines.append(f"{name}_bucket{_format_labels(labels, {'le': _format_value(le)})} {c}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+                else:
+                    try:
+                        value = source()
+                    except Exception:   # metrik tidak boleh menjatuhkan /metrics
+                        continue
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
@@ -0,0 +1,261 @@
+"""Index histogram kelas per gambar + split/subset terstratifikasi (seeded) berbasis link"""
+
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from src.utils.fileops import link_file
+
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+INDEX_NAME = '.label_index.json'
+INDEX_VERSION = 2              # Naikkan jika cara menghitung label berubah (cache lama dibuang)
+SUBSET_MANIFEST = 'subset.json'
+
+
+# =========================================================
+# 🔹 Index label
+# =========================================================
+def _count_classes(path, num_classes):
+    """
+    Histogram class ID dari satu file label YOLO. Baris rusak (kurang dari
+    5 kolom / bukan angka) diabaikan, sama dengan LabelStore.
+    """
+    counts = [0] * num_classes
+    with open(path, 'rb') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 5:
+                continue
+            try:
+                cls = int(parts[0])
+                [float(v) for v in parts[1:5]]
+            except ValueError:
+                continue
+            if 0 <= cls < num_classes:
+                counts[cls] += 1
+    return counts
+
+
+class LabelIndex:
+    """
+    Histogram kelas per gambar: nama gambar → [jumlah box kelas 0, 1, ...].
+
+    File label dibaca sekali lalu di-cache di `<labels>/.label_index.json`
+    (dengan mtime/size); build berikutnya hanya membaca label yang berubah.
+    Gambar tanpa file label dianggap tanpa objek.
+    """
+
+    def __init__(self, images_dir, labels_dir, num_classes=2):
+        self.images_dir = Path(images_dir)
+        self.labels_dir = Path(labels_dir)
+        self.num_classes = num_classes
+        self.images = []     # nama file gambar (urut)
+        self.counts = []     # list histogram, sejajar dengan images
+        self.read = 0        # file label yang benar-benar dibaca di build terakhir
+
+    @property
+    def cache_path(self):
+        return self.labels_dir / INDEX_NAME
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != INDEX_VERSION or data.get('num_classes') != self.num_classes:
+            return {}
+        return data.get('files', {})
+
+    def build(self):
+        cached = self._load_cache()
+        files = {}
+        labels = {}
+        if self.labels_dir.exists():
+            with os.scandir(self.labels_dir) as entries:
+                labels = {e.name[:-4]: e for e in entries if e.name.endswith('.txt')}
+        with os.scandir(self.images_dir) as entries:
+            images = sorted(e.name for e in entries if e.name.lower().endswith(IMAGE_SUFFIXES))
+
+        self.images, self.counts, self.read = [], [], 0
+        for name in images:
+            stem = os.path.splitext(name)[0]
+            entry = labels.get(stem)
+            if entry is None:
+                counts = [0] * self.num_classes
+            else:
+                stat = entry.stat()
+                hit = cached.get(stem)
+                if hit and hit[0] == stat.st_mtime_ns and hit[1] == stat.st_size:
+                    counts = hit[2]
+                else:
+                    counts = _count_classes(entry.path, self.num_classes)
+                    self.read += 1
+                files[stem] = [stat.st_mtime_ns, stat.st_size, counts]
+            self.images.append(name)
+            self.counts.append(counts)
+
+        if self.labels_dir.exists() and (self.read or len(files) != len(cached)):
+            tmp = self.cache_path.with_name(INDEX_NAME + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'num_classes': self.num_classes, 'files': files},
+                          f, separators=(',', ':'))
+            os.replace(tmp, self.cache_path)
+        return self
+
+    @classmethod
+    def from_store(cls, store, images_dir, labels_dir, num_classes=2):
+        """
+        Index dari LabelStore (src.core.label_store) yang dibangun dengan
+        folder gambar: satu file .npz, tanpa membuka file .txt satu per satu.
+        """
+        index = cls(images_dir, labels_dir, num_classes)
+        index.images = list(store.images)
+        index.counts = store.image_counts(num_classes).tolist()
+        return index
+
+    def __len__(self):
+        return len(self.images)
+
+    def totals(self, indices=None):
+        """Jumlah box per kelas (semua gambar atau subset index)"""
+        rows = self.counts if indices is None else (self.counts[i] for i in indices)
+        totals = [0] * self.num_classes
+        for row in rows:
+            for c, n in enumerate(row):
+                totals[c] += n
+        return totals
+
+
+# =========================================================
+# 🔹 Stratifikasi
+# =========================================================
+def stratum(counts, bins=4):
+    """
+    Kunci strata satu gambar: ('empty',) atau fraksi tiap kelas dibulatkan
+    ke `bins` tingkat, mis. (3, 1) = ~75% terisi / ~25% kosong.
+    """
+    total = sum(counts)
+    if total == 0:
+        return ('empty',)
+    return tuple(round(n / total * bins) for n in counts)
+
+
+def _largest_remainder(total, weights):
+    """Bagi `total` bulat sesuai bobot; jumlah hasil selalu tepat `total`"""
+    weight_sum = sum(weights)
+    if weight_sum == 0:
+        return [0] * len(weights)
+    raw = [total * w / weight_sum for w in weights]
+    out = [int(r) for r in raw]
+    order = sorted(range(len(raw)), key=lambda i: (out[i] - raw[i], i))
+    for i in order[:total - sum(out)]:
+        out[i] += 1
+    return out
+
+
+def _split_targets(splits, available, size=None):
+    """
+    splits: {'train': 0.7, ...} (rasio) atau {'train': 50, ...} (jumlah).
+    size: total subset (int), fraksi (float ≤ 1), atau None (semua / jumlah split).
+    """
+    values = list(splits.values())
+    if all(isinstance(v, int) for v in values) and size is None:
+        total = sum(values)
+        if total > available:
+            raise ValueError(f"Split meminta {total} gambar, hanya ada {available}")
+        return dict(zip(splits, values))
+    if size is None:
+        total = available
+    elif isinstance(size, float) and size <= 1:
+        total = int(round(available * size))
+    else:
+        total = min(int(size), available)
+    return dict(zip(splits, _largest_remainder(total, values)))
+
+
+def stratified_split(index, splits, size=None, seed=0, bins=4):
+    """
+    Pilih subset terstratifikasi lalu bagi ke split.
+
+    Jumlah gambar tiap strata dialokasikan proporsional (largest
+    remainder), anggota strata diacak dengan `random.Random(seed)`, lalu
+    gambar terpilih dibagikan ke split secara berselang sesuai rasio,
+    sehingga tiap split mendapat komposisi strata yang sama.
+
+    Returns:
+        {split: [index gambar, ...]}
+    """
+    rng = random.Random(seed)
+    targets = _split_targets(splits, len(index), size)
+    total = sum(targets.values())
+
+    groups = defaultdict(list)
+    for i, counts in enumerate(index.counts):
+        groups[stratum(counts, bins)].append(i)
+    keys = sorted(groups, key=str)
+    quotas = _largest_remainder(total, [len(groups[k]) for k in keys])
+
+    chosen = []
+    for key, quota in zip(keys, quotas):
+        members = groups[key][:]
+        rng.shuffle(members)
+        chosen.extend(members[:quota])
+
+    # Bagikan berselang: split dengan "kekurangan" terbesar dapat giliran
+    names = list(targets)
+    assigned = {name: [] for name in names}
+    for position, image in enumerate(chosen, start=1):
+        deficit = [targets[n] * position / total - len(assigned[n]) for n in names]
+        best = max(range(len(names)), key=lambda j: (deficit[j], -j))
+        assigned[names[best]].append(image)
+    return assigned
+
+
+# =========================================================
+# 🔹 Materialisasi
+# =========================================================
+def materialize(index, assignment, target_dir, mode='symlink', params=None):
+    """
+    Buat folder <target>/<split>/{images,labels} berisi link ke sumber,
+    lalu tulis subset.json (daftar gambar per split + histogram kelas).
+
+    File lama di folder split yang tidak termasuk subset baru dihapus,
+    jadi menjalankan ulang dengan seed/ukuran lain selalu konsisten.
+    """
+    target_dir = Path(target_dir)
+    manifest = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'source': {'images': str(index.images_dir), 'labels': str(index.labels_dir)},
+                'mode': mode, 'params': params or {}, 'splits': {}}
+    for split, indices in assignment.items():
+        img_dir = target_dir / split / 'images'
+        lbl_dir = target_dir / split / 'labels'
+        img_dir.mkdir(parents=True, exist_ok=True)
+        lbl_dir.mkdir(parents=True, exist_ok=True)
+
+        names = [index.images[i] for i in indices]
+        keep_img = set(names)
+        keep_lbl = {os.path.splitext(n)[0] + '.txt' for n in names}
+        for folder, keep in ((img_dir, keep_img), (lbl_dir, keep_lbl)):
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name not in keep:
+                        os.remove(entry.path)
+
+        for name in names:
+            link_file(index.images_dir / name, img_dir / name, mode)
+            label = index.labels_dir / (os.path.splitext(name)[0] + '.txt')
+            if label.exists():
+                link_file(label, lbl_dir / label.name, mode)
+
+        manifest['splits'][split] = {
+            'images': sorted(names),
+            'class_counts': index.totals(indices),
+        }
+
+    with open(target_dir / SUBSET_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Root repo → agar package `src` bisa di-import dari folder tests/
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
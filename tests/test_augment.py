@@ -0,0 +1,140 @@
+"""Kernel src/core/augment.py vs fungsi lama Augmentasi.py (HSV / float per langkah)"""
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+
+from src.core.augment import (  # noqa: E402
+    AUG_TYPES, SHADOW_RANGE, AugmentKernel, adjust_brightness, apply_shadow)
+
+SHAPE = (96, 128, 3)
+
+
+# =========================================================
+# 🔹 Referensi: implementasi lama (tanpa random global)
+# =========================================================
+def legacy_brightness(image, factor):
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    hsv[:, :, 2] = np.clip(hsv[:, :, 2] * factor, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+
+def legacy_noise(image, sigma, rng):
+    noise = rng.normal(0, sigma, image.shape)
+    return np.clip(image + noise, 0, 255).astype(np.uint8)
+
+
+def diff(a, b):
+    return np.abs(a.astype(np.int16) - b.astype(np.int16))
+
+
+@pytest.fixture
+def image():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, SHAPE, dtype=np.uint8)
+
+
+@pytest.fixture
+def kernel():
+    return AugmentKernel(SHAPE)
+
+
+# =========================================================
+# 🔹 Brightness
+# =========================================================
+@pytest.mark.parametrize('factor', [0.4, 0.6, 0.8, 1.0, 1.2, 1.5])
+def test_brightness_matches_hsv(image, factor):
+    # Toleransi = error round-trip BGR → HSV → BGR versi lama itu sendiri
+    round_trip = diff(legacy_brightness(image, 1.0), image).max()
+    d = diff(adjust_brightness(image, factor), legacy_brightness(image, factor))
+    assert d.max() <= round_trip
+    assert d.mean() < 1.0
+
+
+@pytest.mark.parametrize('factor', [0.4, 0.8])
+def test_brightness_lut_matches_float_path(image, kernel, factor):
+    lut = cv2.LUT(image, kernel.brightness_lut(factor))
+    expected = np.clip(image.astype(np.float32) * factor, 0, 255).astype(np.uint8)
+    np.testing.assert_array_equal(lut, expected)
+
+
+def test_brightness_keeps_hue_when_saturating(kernel):
+    image = np.zeros(SHAPE, np.uint8)
+    image[...] = (40, 120, 200)                         # max channel × 1.5 > 255
+    out = kernel.compose(image, None, factor=1.5)
+    assert out[..., 2].min() == 255
+    np.testing.assert_allclose(out[0, 0] / 255, np.array([40, 120, 200]) / 200, atol=1 / 255)
+
+
+# =========================================================
+# 🔹 Bayangan
+# =========================================================
+def test_shadow_only_darkens_within_range(kernel):
+    gray = np.full(SHAPE, 200, np.uint8)
+    out = kernel.compose(gray, np.random.default_rng(1), shadow=True)
+    assert (out <= gray).all()
+    # Area tergelap = faktor bayangan (blur hanya melunakkan tepi)
+    assert out.min() >= int(200 * SHADOW_RANGE[0]) - 1
+    assert out.min() < 200
+
+
+def test_shadow_is_seeded(image):
+    a = apply_shadow(image, np.random.default_rng(3))
+    b = apply_shadow(image, np.random.default_rng(3))
+    np.testing.assert_array_equal(a, b)
+
+
+# =========================================================
+# 🔹 Noise
+# =========================================================
+def test_noise_seeded_and_in_sigma_range(kernel):
+    gray = np.full(SHAPE, 128, np.uint8)
+    a = kernel.compose(gray, np.random.default_rng(5), noise_range=(10, 25))
+    b = kernel.compose(gray, np.random.default_rng(5), noise_range=(10, 25))
+    np.testing.assert_array_equal(a, b)
+    sigma = np.random.default_rng(5).integers(10, 26)
+    noise = a.astype(np.float32) - 128
+    assert abs(noise.mean()) < 1.0
+    assert abs(noise.std() - sigma) < 0.05 * sigma
+
+
+def test_noise_matches_legacy_distribution(kernel):
+    gray = np.full(SHAPE, 128, np.uint8)
+    out = kernel.compose(gray, np.random.default_rng(7), noise_range=(15, 15))
+    ref = legacy_noise(gray, 15, np.random.default_rng(7))
+    assert abs(out.astype(np.float32).std() - ref.astype(np.float32).std()) < 1.0
+    assert abs(out.astype(np.float32).mean() - ref.astype(np.float32).mean()) < 1.0
+
+
+# =========================================================
+# 🔹 compose() satu pass vs langkah berurutan
+# =========================================================
+@pytest.mark.parametrize('factor', [0.5, 1.3])
+def test_compose_matches_sequential(image, kernel, factor):
+    fused = kernel.compose(image, np.random.default_rng(11), shadow=True,
+                           factor=factor, noise_range=(10, 25))
+
+    # Urutan lama: bayangan → brightness → noise, uint8 di tiap langkah
+    rng = np.random.default_rng(11)
+    step = kernel.compose(image, rng, shadow=True)
+    step = adjust_brightness(step, factor)
+    step = kernel.compose(step, rng, noise_range=(10, 25))
+
+    # Selisih hanya dari pembulatan uint8 di antara langkah (noise di-clip)
+    d = diff(fused, step)
+    assert d.mean() < 1.0
+    assert np.percentile(d, 99) <= 3
+
+
+# =========================================================
+# 🔹 apply_each
+# =========================================================
+def test_apply_each_matches_apply_loop(kernel):
+    rng = np.random.default_rng(0)
+    images = rng.integers(0, 256, (len(AUG_TYPES),) + SHAPE, dtype=np.uint8)
+
+    stacked = kernel.apply_each(images, AUG_TYPES, np.random.default_rng(9))
+    rng = np.random.default_rng(9)
+    looped = np.stack([kernel.apply(img, t, rng) for img, t in zip(images, AUG_TYPES)])
+    np.testing.assert_array_equal(stacked, looped)
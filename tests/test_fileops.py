@@ -0,0 +1,151 @@
+"""DedupManifest: simpan sekali, re-point kanonik, tidak menulis lewat hardlink"""
+
+import os
+
+import pytest
+
+from src.utils.fileops import DedupManifest, bytes_digest, dedup_tree, link_file
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def hardlinks_supported(tmp_path):
+    a = write(tmp_path / '.probe_a', b'x')
+    try:
+        os.link(a, tmp_path / '.probe_b')
+    except OSError:
+        return False
+    finally:
+        for name in ('.probe_a', '.probe_b'):
+            if (tmp_path / name).exists():
+                os.remove(tmp_path / name)
+    return True
+
+
+@pytest.fixture
+def store(tmp_path):
+    if not hardlinks_supported(tmp_path):
+        pytest.skip("filesystem tidak mendukung hardlink")
+    (tmp_path / 'dataset').mkdir()
+    return DedupManifest(tmp_path / 'dataset', mode='hardlink')
+
+
+# =========================================================
+# 🔹 Deduplikasi
+# =========================================================
+def test_identical_content_stored_once(store):
+    a = store.root / 'a' / 'x.txt'
+    b = store.root / 'b' / 'y.txt'
+    a.parent.mkdir(parents=True)
+    b.parent.mkdir(parents=True)
+    store.put_bytes(b'0 0.5 0.5 0.1 0.1\n', a)
+    store.put_bytes(b'0 0.5 0.5 0.1 0.1\n', b)
+    assert os.path.samefile(a, b)
+    assert store.stats() == {'files': 2, 'unique': 1}
+
+    store.save()
+    reloaded = DedupManifest(store.root, mode='hardlink')
+    assert reloaded.files == store.files
+    assert reloaded.canonical(bytes_digest(b'0 0.5 0.5 0.1 0.1\n')) is not None
+
+
+def test_overwriting_canonical_repoints_objects(store):
+    a = store.root / 'a.txt'
+    b = store.root / 'b.txt'
+    old = b'lama\n'
+    store.put_bytes(old, a)
+    store.put_bytes(old, b)
+    assert store.objects[bytes_digest(old)] == 'a.txt'
+
+    # a.txt ditimpa isi baru → objek lama harus pindah ke b.txt
+    store.put_bytes(b'baru\n', a)
+    assert store.objects[bytes_digest(old)] == 'b.txt'
+    assert store.canonical(bytes_digest(old)) == store.root / 'b.txt'
+    assert b.read_bytes() == old
+
+    c = store.root / 'c.txt'
+    store.put_bytes(old, c)
+    assert os.path.samefile(b, c)
+    assert c.read_bytes() == old
+
+
+def test_canonical_rejects_file_changed_outside_manifest(store):
+    a = store.root / 'a.txt'
+    store.put_bytes(b'isi asli\n', a)
+    digest = bytes_digest(b'isi asli\n')
+
+    os.remove(a)
+    write(a, b'ditimpa editor lain, ukuran beda\n')
+    assert store.canonical(digest) is None
+
+    b = store.root / 'b.txt'
+    store.put_bytes(b'isi asli\n', b)
+    assert not os.path.samefile(a, b)
+    assert b.read_bytes() == b'isi asli\n'
+
+
+def test_put_bytes_over_hardlink_keeps_source(store, tmp_path):
+    source = write(tmp_path / 'source' / 'img.jpg', b'gambar sumber')
+    inode = source.stat().st_ino
+    dst = store.root / 'img.jpg'
+    store.put_file(source, dst)
+    assert os.path.samefile(source, dst)
+
+    store.put_bytes(b'hasil encode ulang', dst)
+    assert source.read_bytes() == b'gambar sumber'
+    assert source.stat().st_ino == inode
+    assert dst.read_bytes() == b'hasil encode ulang'
+    assert not os.path.samefile(source, dst)
+
+
+def test_remove_promotes_another_path(store):
+    a = store.root / 'a.txt'
+    b = store.root / 'b.txt'
+    store.put_bytes(b'sama\n', a)
+    store.put_bytes(b'sama\n', b)
+    digest = bytes_digest(b'sama\n')
+
+    os.remove(a)
+    store.remove(a)
+    assert 'a.txt' not in store.files
+    assert store.objects[digest] == 'b.txt'
+
+    os.remove(b)
+    store.remove(b)
+    assert digest not in store.objects
+    assert store.stats() == {'files': 0, 'unique': 0}
+
+
+# =========================================================
+# 🔹 link_file / dedup_tree
+# =========================================================
+def test_link_file_copy_is_independent(tmp_path):
+    src = write(tmp_path / 'a.txt', b'abc')
+    dst = tmp_path / 'b.txt'
+    assert link_file(src, dst, 'copy') == 'copy'
+    assert dst.read_bytes() == b'abc'
+    assert not os.path.samefile(src, dst)
+    assert link_file(src, src, 'hardlink') == 'exists'
+    with pytest.raises(ValueError):
+        link_file(src, dst, 'move')
+
+
+def test_dedup_tree_links_duplicates(tmp_path):
+    if not hardlinks_supported(tmp_path):
+        pytest.skip("filesystem tidak mendukung hardlink")
+    root = tmp_path / 'dataset'
+    write(root / 'train' / 'labels' / 'a.txt', b'0 0.5 0.5 0.1 0.1\n')
+    write(root / 'train' / 'labels' / 'b.txt', b'0 0.5 0.5 0.1 0.1\n')
+    write(root / 'val' / 'labels' / 'c.txt', b'1 0.5 0.5 0.1 0.1\n')
+
+    assert dedup_tree(root, dry_run=True)['linked'] == 1
+    assert not os.path.samefile(root / 'train' / 'labels' / 'a.txt',
+                                root / 'train' / 'labels' / 'b.txt')
+    summary = dedup_tree(root, mode='hardlink')
+    assert summary['linked'] == 1 and summary['unique'] == 2
+    assert os.path.samefile(root / 'train' / 'labels' / 'a.txt',
+                            root / 'train' / 'labels' / 'b.txt')
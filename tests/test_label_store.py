@@ -0,0 +1,91 @@
+"""LabelStore: build dari .txt → save/load → export, rebuild inkremental, query"""
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('cv2')   # src.core.preprocess (IMAGE_SUFFIXES) meng-import OpenCV
+
+from src.core.label_store import CLS, LabelStore, _parse, default_path  # noqa: E402
+from src.utils.subset import LabelIndex  # noqa: E402
+
+LABELS = {
+    'a': "0 0.500000 0.500000 0.200000 0.300000\n1 0.100000 0.200000 0.050000 0.050000\n",
+    'b': "rusak\n1 0.7 0.8 0.1 0.1\n0 0.1 0.1\n",          # baris 1 & 3 rusak
+    'd': "",                                                # label kosong
+    'e': "1 0.3 0.3 0.1 0.1\n1 0.6 0.6 0.1 0.1\n0 0.9 0.9 0.05 0.05\n",
+}
+IMAGES = ['a.jpg', 'b.jpg', 'c.jpg', 'd.jpg', 'e.png']       # c tanpa file label
+
+
+@pytest.fixture
+def split(tmp_path):
+    images = tmp_path / 'train' / 'images'
+    labels = tmp_path / 'train' / 'labels'
+    images.mkdir(parents=True)
+    labels.mkdir(parents=True)
+    for name in IMAGES:
+        (images / name).write_bytes(b'')
+    for stem, text in LABELS.items():
+        (labels / f"{stem}.txt").write_text(text, encoding='utf-8')
+    (labels / 'classes.txt').write_text("terisi\nkosong\n", encoding='utf-8')
+    return images, labels
+
+
+def test_build_save_load_export_roundtrip(split, tmp_path):
+    images, labels = split
+    store, read = LabelStore.build(labels, images)
+    assert read == len(LABELS)
+    assert store.images == IMAGES
+    assert store.num_boxes == 2 + 1 + 0 + 3
+    assert len(store.boxes('c.jpg')) == 0
+    np.testing.assert_allclose(store.boxes('b.jpg')[:, CLS:], [[1, 0.7, 0.8, 0.1, 0.1]])
+    assert store.empty_images() == ['c.jpg', 'd.jpg']
+
+    path = store.save(default_path(labels))
+    loaded = LabelStore.load(path)
+    assert loaded.images == store.images
+    np.testing.assert_array_equal(loaded.rows, store.rows)
+    np.testing.assert_array_equal(loaded.offsets, store.offsets)
+
+    out = tmp_path / 'export'
+    assert loaded.export(out) == len(IMAGES)
+    for name in IMAGES:
+        stem = os.path.splitext(name)[0]
+        original = _parse(labels / f"{stem}.txt") if stem in LABELS else []
+        exported = _parse(out / f"{stem}.txt")
+        assert len(exported) == len(original)
+        np.testing.assert_allclose(np.array(exported).reshape(-1, 5),
+                                   np.array(original).reshape(-1, 5), atol=1e-6)
+
+
+def test_incremental_rebuild_reads_only_changed_file(split):
+    images, labels = split
+    store, read = LabelStore.load_or_build(labels, images)
+    assert read == len(LABELS)
+    store, read = LabelStore.load_or_build(labels, images)
+    assert read == 0
+
+    changed = labels / 'a.txt'
+    changed.write_text("1 0.5 0.5 0.2 0.2\n", encoding='utf-8')
+    stat = changed.stat()
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    store, read = LabelStore.load_or_build(labels, images)
+    assert read == 1
+    np.testing.assert_allclose(store.boxes('a.jpg')[:, CLS:], [[1, 0.5, 0.5, 0.2, 0.2]])
+    np.testing.assert_allclose(store.boxes('e.png')[:, CLS], [1, 1, 0])
+
+
+def test_image_counts_match_label_index(split):
+    images, labels = split
+    store, _ = LabelStore.build(labels, images)
+    counts = store.image_counts(2)
+    assert counts.tolist() == [[1, 1], [0, 1], [0, 0], [0, 0], [1, 2]]
+    np.testing.assert_array_equal(store.class_counts(2), counts.sum(axis=0))
+    assert store.images_with_class(1, min_count=2) == ['e.png']
+
+    built = LabelIndex(images, labels, num_classes=2).build()
+    from_store = LabelIndex.from_store(store, images, labels, num_classes=2)
+    assert from_store.images == built.images
+    assert from_store.counts == built.counts
@@ -0,0 +1,94 @@
+"""Split/subset terstratifikasi (src/utils/subset.py)"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from src.utils.subset import (
+    LabelIndex, _largest_remainder, _split_targets, stratified_split, stratum)
+
+
+def make_index(n=200, seed=0):
+    """LabelIndex sintetis: campuran gambar kosong, dominan terisi, dominan kosong"""
+    rng = random.Random(seed)
+    index = LabelIndex('images', 'labels', num_classes=2)
+    for i in range(n):
+        kind = rng.random()
+        if kind < 0.15:
+            counts = [0, 0]
+        elif kind < 0.7:
+            counts = [rng.randint(6, 12), rng.randint(0, 2)]
+        else:
+            counts = [rng.randint(0, 2), rng.randint(6, 12)]
+        index.images.append(f"img_{i:04d}.jpg")
+        index.counts.append(counts)
+    return index
+
+
+# =========================================================
+# 🔹 Pembagian bulat
+# =========================================================
+@pytest.mark.parametrize('total,weights', [(10, [0.7, 0.2, 0.1]), (7, [1, 1, 1]),
+                                           (101, [3, 5, 0, 2]), (0, [1, 2])])
+def test_largest_remainder_sums_exactly(total, weights):
+    out = _largest_remainder(total, weights)
+    assert sum(out) == total
+    weight_sum = sum(weights)
+    for n, w in zip(out, weights):
+        assert abs(n - total * w / weight_sum) < 1
+
+
+def test_split_targets_ratio_and_size():
+    assert sum(_split_targets({'train': 0.7, 'val': 0.2, 'test': 0.1}, 97).values()) == 97
+    assert sum(_split_targets({'train': 0.8, 'val': 0.2}, 200, size=0.25).values()) == 50
+    assert sum(_split_targets({'train': 0.8, 'val': 0.2}, 200, size=500).values()) == 200
+    assert _split_targets({'train': 30, 'val': 10}, 200) == {'train': 30, 'val': 10}
+
+
+def test_int_splits_larger_than_pool_raise():
+    with pytest.raises(ValueError):
+        _split_targets({'train': 150, 'val': 60}, 200)
+    with pytest.raises(ValueError):
+        stratified_split(make_index(200), {'train': 150, 'val': 60})
+
+
+# =========================================================
+# 🔹 stratified_split
+# =========================================================
+def test_same_seed_same_assignment():
+    index = make_index()
+    splits = {'train': 0.7, 'val': 0.2, 'test': 0.1}
+    a = stratified_split(index, splits, size=120, seed=42)
+    b = stratified_split(index, splits, size=120, seed=42)
+    assert a == b
+    assert stratified_split(index, splits, size=120, seed=43) != a
+
+
+@pytest.mark.parametrize('splits,size,expected', [
+    ({'train': 0.7, 'val': 0.2, 'test': 0.1}, None, 200),
+    ({'train': 0.8, 'val': 0.2}, 73, 73),
+    ({'train': 0.8, 'val': 0.2}, 0.5, 100),
+    ({'train': 40, 'val': 15}, None, 55),
+])
+def test_split_sizes_sum_to_target(splits, size, expected):
+    index = make_index()
+    assignment = stratified_split(index, splits, size=size, seed=0)
+    chosen = [i for indices in assignment.values() for i in indices]
+    assert len(chosen) == expected
+    assert len(set(chosen)) == expected            # tidak ada gambar ganda
+    targets = _split_targets(splits, len(index), size)
+    assert {k: len(v) for k, v in assignment.items()} == targets
+
+
+def test_every_stratum_spread_proportionally():
+    index = make_index(400)
+    splits = {'train': 0.6, 'val': 0.25, 'test': 0.15}
+    assignment = stratified_split(index, splits, seed=1)
+
+    per_stratum = Counter(stratum(c) for c in index.counts)
+    for name, indices in assignment.items():
+        ratio = splits[name] / sum(splits.values())
+        got = Counter(stratum(index.counts[i]) for i in indices)
+        for key, size in per_stratum.items():
+            assert abs(got[key] - size * ratio) <= 1.5, (name, key)
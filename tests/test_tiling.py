@@ -0,0 +1,112 @@
+"""Grid tile, pemilihan tile per slot, dan NMS lintas tile (src/backend/tiling.py)"""
+
+import types
+
+import numpy as np
+import pytest
+
+from src.backend.tiling import TiledDetector, merge_boxes, slot_tiles, tile_grid
+
+
+# =========================================================
+# 🔹 Grid tile
+# =========================================================
+@pytest.mark.parametrize('width,height', [(1920, 1080), (1280, 720), (2592, 1944), (700, 641)])
+def test_tile_grid_covers_frame_with_full_tiles(width, height):
+    tile, overlap = 640, 0.2
+    tiles = tile_grid(width, height, tile, overlap)
+    covered = np.zeros((height, width), bool)
+    for x0, y0, x1, y1 in tiles:
+        assert x1 - x0 == min(tile, width) and y1 - y0 == min(tile, height)
+        covered[y0:y1, x0:x1] = True
+    assert covered.all()
+
+    # Overlap antar tile bertetangga minimal `overlap` × tile
+    xs = sorted({t[0] for t in tiles})
+    assert all(b - a <= tile * (1 - overlap) for a, b in zip(xs, xs[1:]))
+
+
+def test_tile_grid_small_frame_is_single_tile():
+    assert tile_grid(320, 240, 640) == [(0, 0, 320, 240)]
+
+
+def test_tile_grid_rejects_bad_overlap():
+    with pytest.raises(ValueError):
+        tile_grid(1920, 1080, 640, overlap=1.0)
+
+
+def test_slot_tiles_keeps_only_intersecting_tiles():
+    tiles = tile_grid(1280, 640, 640, overlap=0.0)        # dua tile: kiri, kanan
+    assert slot_tiles(tiles, [(100, 100, 200, 200)]) == [(0, 0, 640, 640)]
+    assert slot_tiles(tiles, [(5000, 5000, 5100, 5100)]) == []
+    # Margin memperluas rect slot sampai menyentuh tile kanan
+    assert len(slot_tiles(tiles, [(600, 100, 630, 200)], margin=16)) == 2
+
+
+# =========================================================
+# 🔹 NMS lintas tile
+# =========================================================
+def test_box_split_across_seam_merges_into_union():
+    # Mobil di x 600-700 terpotong seam tile di x=640, plus box utuh dari tile sebelah
+    boxes = [[600, 100, 640, 180], [610, 100, 700, 180]]
+    out, scores, classes = merge_boxes(boxes, [0.8, 0.9], [0, 0], metric='ios', threshold=0.6)
+    assert len(out) == 1
+    np.testing.assert_allclose(out[0], [600, 100, 700, 180])
+    assert scores[0] == pytest.approx(0.9)
+
+
+def test_iou_metric_keeps_truncated_box():
+    boxes = [[600, 100, 640, 180], [610, 100, 700, 180]]
+    out, _, _ = merge_boxes(boxes, [0.8, 0.9], [0, 0], metric='iou', threshold=0.6)
+    assert len(out) == 2
+
+
+def test_different_classes_never_suppressed():
+    boxes = [[0, 0, 100, 100], [0, 0, 100, 100], [5, 5, 95, 95]]
+    out, scores, classes = merge_boxes(boxes, [0.9, 0.8, 0.7], [0, 1, 0])
+    assert sorted(classes.tolist()) == [0, 1]
+    np.testing.assert_allclose(scores, [0.9, 0.8])
+
+
+def test_merge_boxes_empty_and_max_det():
+    out, scores, classes = merge_boxes(np.zeros((0, 4)), [], [])
+    assert out.shape == (0, 4) and scores.size == 0
+    boxes = [[i * 20, 0, i * 20 + 10, 10] for i in range(5)]
+    out, _, _ = merge_boxes(boxes, np.linspace(0.9, 0.5, 5), [0] * 5, max_det=3)
+    assert len(out) == 3
+
+
+# =========================================================
+# 🔹 Detector: fallback full-frame
+# =========================================================
+class _FakeModel:
+    name = 'fake'
+    names = {0: 'terisi', 1: 'kosong'}
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, source, **kwargs):
+        self.calls.append(source)
+        return ['full-frame']
+
+
+class _NoTileSlots:
+    def __len__(self):
+        return 1
+
+    def scaled_to(self, shape):
+        return types.SimpleNamespace(rects=[(5000, 5000, 5100, 5100)])
+
+
+def test_slot_map_without_tiles_falls_back_to_full_frame():
+    pytest.importorskip('torch')
+    pytest.importorskip('ultralytics')
+    model = _FakeModel()
+    detector = TiledDetector(model, tile=640, full_frame=False, slots=_NoTileSlots())
+    frame = np.zeros((1080, 1920, 3), np.uint8)
+
+    assert detector.tiles_for(frame.shape) == []
+    assert detector.predict(frame) == ['full-frame']
+    assert len(model.calls) == 1 and model.calls[0] is frame
+    assert detector.last_tiles == 1
@@ -0,0 +1,111 @@
+"""SlotTracker: matching IoU + debounce (confirm_frames, min_hold, switch_conf)"""
+
+import numpy as np
+import pytest
+
+from src.core.tracker import SlotTracker, greedy_match, iou_matrix
+
+BOX = [100, 100, 200, 200]
+TERISI, KOSONG = 0, 1
+
+
+def feed(tracker, sequence, box=BOX, start=0.0, step=1.0):
+    """Satu deteksi per frame: sequence = [(kelas, conf), ...] → semua event"""
+    events = []
+    for i, (cls, conf) in enumerate(sequence):
+        events += tracker.update([box], [cls], [conf], t=start + i * step)
+    return events
+
+
+@pytest.fixture
+def tracker():
+    return SlotTracker(camera='cam', confirm_frames=3, min_hold=2.0, switch_conf=0.6,
+                       smoothing=0.0)
+
+
+# =========================================================
+# 🔹 Matching
+# =========================================================
+def test_iou_matrix():
+    iou = iou_matrix([[0, 0, 10, 10]], [[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]])
+    np.testing.assert_allclose(iou, [[1.0, 50 / 150, 0.0]], atol=1e-6)
+    assert iou_matrix(np.zeros((0, 4)), [BOX]).shape == (0, 1)
+
+
+def test_greedy_match_prefers_highest_iou():
+    iou = np.array([[0.9, 0.5],
+                    [0.8, 0.4]])
+    assert greedy_match(iou, 0.3) == [(0, 0), (1, 1)]
+    assert greedy_match(iou, 0.6) == [(0, 0)]
+    assert greedy_match(np.zeros((0, 2)), 0.3) == []
+
+
+# =========================================================
+# 🔹 Debounce
+# =========================================================
+def test_confirm_after_confirm_frames(tracker):
+    assert feed(tracker, [(TERISI, 0.9)] * 2) == []
+    events = tracker.update([BOX], [TERISI], [0.9], t=2.0)
+    assert len(events) == 1
+    assert events[0]['from'] is None and events[0]['to'] == 'terisi'
+    assert tracker.snapshot() == {0: 'terisi'}
+
+
+def test_no_flip_inside_min_hold(tracker):
+    feed(tracker, [(TERISI, 0.9)] * 3)
+    # 5 observasi "kosong" dalam 1 detik: confirm_frames tercapai, min_hold belum
+    assert feed(tracker, [(KOSONG, 0.9)] * 5, start=10.0, step=0.2) == []
+    assert tracker.snapshot() == {0: 'terisi'}
+    events = tracker.update([BOX], [KOSONG], [0.9], t=12.0)
+    assert [e['to'] for e in events] == ['kosong']
+
+
+def test_interrupted_candidate_restarts(tracker):
+    feed(tracker, [(TERISI, 0.9)] * 3)
+    seq = [(KOSONG, 0.9), (KOSONG, 0.9), (TERISI, 0.9), (KOSONG, 0.9), (KOSONG, 0.9)]
+    assert feed(tracker, seq, start=10.0) == []
+    assert tracker.snapshot() == {0: 'terisi'}
+
+
+def test_low_confidence_switch_rejected(tracker):
+    feed(tracker, [(TERISI, 0.9)] * 3)
+    assert feed(tracker, [(KOSONG, 0.5)] * 10, start=10.0) == []
+    assert tracker.snapshot() == {0: 'terisi'}
+
+
+def test_event_emitted_exactly_once(tracker):
+    events = feed(tracker, [(TERISI, 0.9)] * 3 + [(KOSONG, 0.9)] * 10)
+    assert [(e['from'], e['to']) for e in events] == [(None, 'terisi'), ('terisi', 'kosong')]
+
+
+def test_missing_slot_keeps_state(tracker):
+    feed(tracker, [(TERISI, 0.9)] * 3)
+    for i in range(5):
+        assert tracker.update(np.zeros((0, 4)), [], [], t=10.0 + i) == []
+    assert tracker.snapshot() == {0: 'terisi'}
+
+
+def test_pending_until_candidate_confirmed(tracker):
+    assert not tracker.pending
+    feed(tracker, [(TERISI, 0.9)] * 2)
+    assert tracker.pending
+    feed(tracker, [(TERISI, 0.9)], start=2.0)
+    assert not tracker.pending and tracker.snapshot() == {0: 'terisi'}
+
+    # Observasi switch dengan confidence rendah tidak membuka kandidat
+    feed(tracker, [(KOSONG, 0.3)], start=3.0)
+    assert not tracker.pending
+    feed(tracker, [(KOSONG, 0.9)], start=4.0)
+    assert tracker.pending
+
+
+# =========================================================
+# 🔹 Mode ROI (array status)
+# =========================================================
+def test_update_states_unknown_is_ignored():
+    tracker = SlotTracker(confirm_frames=2, min_hold=0.0)
+    events = []
+    for t, state in enumerate([[0, 1], [0, 255], [0, 1], [0, 1]]):
+        events += tracker.update_states(np.array(state, np.uint8), t=float(t))
+    assert [(e['slot'], e['to']) for e in events] == [(0, 'terisi'), (1, 'kosong')]
+    assert tracker.counts() == {'terisi': 1, 'kosong': 1}